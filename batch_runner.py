@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Run a file of commands through handle_input.
+
+    python batch_runner.py commands.jsonl -o results.jsonl --workers 8 [--trace trace.json]
+
+Input is either plain text (one command per line, '#' comments skipped) or
+JSONL with a "command" field per line. JSONL records may carry a "group"
+key: commands in the same group run in file order, everything else runs
+concurrently. Results are written as JSONL in input order.
+"""
+
+import sys
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import tracing
+from command_result import CommandResult, STATUS_ERROR
+
+COMMAND_FIELDS = ("command", "text", "input")
+
+
+def read_commands(path):
+    """Yield (line_number, command, group) from a text or JSONL file"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                command = next((record[k] for k in COMMAND_FIELDS if k in record), None)
+                if command is None:
+                    raise ValueError(f"Line {line_number}: no command field ({', '.join(COMMAND_FIELDS)})")
+                yield line_number, str(command), record.get("group")
+            else:
+                yield line_number, line, None
+
+
+def _run_one(handle, line_number, command, mode, previous):
+    if previous is not None:
+        # Same group: wait for the earlier command (its failure does not block us)
+        try:
+            previous.result()
+        except Exception:
+            pass
+    start = time.perf_counter()
+    try:
+        reply = handle(command, mode=mode)
+        result = reply if isinstance(reply, CommandResult) else CommandResult(reply)
+    except Exception as e:
+        result = CommandResult(f"Error: {e}", status=STATUS_ERROR, error=str(e))
+    record = {"line": line_number, "command": command}
+    record.update(result.to_dict())
+    record["wall_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return record
+
+
+def run_batch(commands, handle, workers=4, mode="text"):
+    """Run (line_number, command, group) tuples and yield result dicts in input order.
+
+    At most workers * 4 commands are in flight, so arbitrarily large files
+    are streamed rather than loaded.
+    """
+    window = max(1, workers) * 4
+    pending = deque()
+    last_in_group = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="batch") as executor:
+        for line_number, command, group in commands:
+            previous = last_in_group.get(group) if group is not None else None
+            future = executor.submit(_run_one, handle, line_number, command, mode, previous)
+            if group is not None:
+                last_in_group[group] = future
+            pending.append(future)
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def summarize(records, elapsed) -> str:
+    """One line summary: count, errors, throughput and latency percentiles"""
+    if not records:
+        return "No commands run."
+    latencies = sorted(r["wall_ms"] for r in records)
+    errors = sum(1 for r in records if r["status"] == STATUS_ERROR)
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+    return (f"{len(records)} commands, {errors} errors in {elapsed:.2f}s "
+            f"({len(records) / elapsed if elapsed else 0:.1f}/s), "
+            f"p50 {percentile(0.5):.1f}ms, p95 {percentile(0.95):.1f}ms")
+
+
+def run_file(path, handle, output=None, workers=4, mode="text"):
+    """Run every command in path, writing JSONL results to output (a file object)"""
+    output = output or sys.stdout
+    records = []
+    start = time.perf_counter()
+    for record in run_batch(read_commands(path), handle, workers=workers, mode=mode):
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+        records.append({"wall_ms": record["wall_ms"], "status": record["status"]})
+    return summarize(records, time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a file of Buddy AI commands")
+    parser.add_argument("input", help="text file (one command per line) or JSONL with a 'command' field")
+    parser.add_argument("-o", "--output", help="write JSONL results here instead of stdout")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="commands run concurrently (default 4)")
+    parser.add_argument("--trace", help="record spans and write a Chrome trace JSON file here")
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        tracing.enable()
+
+    from main import handle_input
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            summary = run_file(args.input, handle_input, out, workers=args.workers)
+    else:
+        summary = run_file(args.input, handle_input, workers=args.workers)
+    print(summary, file=sys.stderr)
+    if args.trace:
+        count = tracing.export_chrome_trace(args.trace)
+        print(f"Wrote {count} trace events to {args.trace}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark WebAPIManager against the recorded-fixture server.
+
+    python benchmark_api.py --ops 2000 --workers 8 --latency 0.08
+
+Runs a mixed workload (weather with varied spellings, news, exchange rates,
+place lookups and DuckDuckGo searches) three times: from a cold cache, again
+in the same process, and in a fresh manager that only has the on-disk cache.
+Reports latency percentiles per operation and how many calls reached the
+network.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixture_server import FixtureServer
+import http_session
+
+# (weight, operation, argument choices with zipf-like weights)
+WORKLOAD = [
+    (45, "weather", [("London", 8), ("london", 4), ("Karachi", 6), ("New York", 4), ("New York, NY", 2),
+                     ("NYC", 1), ("Paris", 3), ("Lahore", 3), ("Tokyo", 1), ("Dubai", 1), ("Berlin", 1)]),
+    (20, "news", [("general", 6), ("technology", 4), ("business", 2), ("sports", 2), ("science", 1)]),
+    (20, "currency", [(("USD", "PKR"), 6), (("USD", "EUR"), 4), (("EUR", "GBP"), 2), (("GBP", "PKR"), 2),
+                      (("AED", "PKR"), 1), (("JPY", "INR"), 1)]),
+    (10, "location", [("new york", 3), ("London, UK", 2), ("karachi", 2), ("Paris", 1), ("tokyo", 1)]),
+    (5, "search", [("python", 3), ("spotify download", 1), ("weather radar", 1)]),
+]
+
+
+def build_operations(count, seed=7):
+    rng = random.Random(seed)
+    kinds = [w[1] for w in WORKLOAD]
+    kind_weights = [w[0] for w in WORKLOAD]
+    choices = {kind: ([a for a, _ in args], [w for _, w in args]) for _, kind, args in WORKLOAD}
+    operations = []
+    for _ in range(count):
+        kind = rng.choices(kinds, kind_weights)[0]
+        values, weights = choices[kind]
+        operations.append((kind, rng.choices(values, weights)[0]))
+    return operations
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))] if values else 0.0
+
+
+def run_phase(main, api, operations, workers):
+    calls = {
+        "weather": api.get_weather,
+        "news": api.get_news,
+        "currency": lambda pair: api.get_currency_rate(*pair),
+        "location": api.search_location,
+        "search": main.search_duckduckgo,
+    }
+
+    def run(operation):
+        kind, argument = operation
+        start = time.perf_counter()
+        reply = calls[kind](argument)
+        return kind, (time.perf_counter() - start) * 1000, reply
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run, operations))
+    elapsed = time.perf_counter() - start
+    errors = [r for r in results if str(r[2]).startswith(("Error", "Could not", "Daily", "Too many"))]
+    return results, elapsed, errors
+
+
+def report(name, results, elapsed, network_calls):
+    latencies = [ms for _, ms, _ in results]
+    lines = [f"\n== {name}: {len(results)} ops in {elapsed:.2f}s ({len(results) / elapsed:.0f} ops/s), "
+             f"{network_calls} network calls, hit rate {1 - network_calls / len(results):.1%}"]
+    lines.append(f"   {'operation':<10}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for kind in [w[1] for w in WORKLOAD] + ["all"]:
+        values = latencies if kind == "all" else [ms for k, ms, _ in results if k == kind]
+        if values:
+            lines.append(f"   {kind:<10}{len(values):>7}{percentile(values, 0.5):>10.3f}"
+                         f"{percentile(values, 0.95):>10.3f}{percentile(values, 0.99):>10.3f}")
+    print("\n".join(lines))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark WebAPIManager against recorded fixtures")
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.08, help="simulated API latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    workspace = tempfile.mkdtemp(prefix="buddy-bench-")
+    os.chdir(workspace)
+    with open("api_keys.json", "w") as f:
+        json.dump({"openweathermap": "fixture", "news_api": "fixture", "google_maps": "fixture"}, f)
+    with open("app_config.json", "w") as f:
+        # Quotas sized for the benchmark rather than free-tier keys
+        quotas = {name: {"rate": 10000, "burst": 10000, "daily": 10 ** 9} for name in
+                  ("openweathermap", "news_api", "currency_api", "google_maps")}
+        json.dump({"custom_apps": {}, "aliases": {}, "quotas": quotas}, f)
+
+    with FixtureServer(latency=args.latency, jitter=args.jitter) as server:
+        os.environ[http_session.BASE_URL_ENV] = server.url
+        import main as buddy
+
+        operations = build_operations(args.ops)
+        print(f"Workspace {workspace}, fixture server {server.url}, latency {args.latency * 1000:.0f}ms")
+
+        api = buddy.WebAPIManager()
+        for phase in ("cold cache", "warm cache"):
+            before = server.total_requests()
+            results, elapsed, errors = run_phase(buddy, api, operations, args.workers)
+            report(phase, results, elapsed, server.total_requests() - before)
+            if errors:
+                print(f"   {len(errors)} errors, e.g. {errors[0][2]!r}")
+        print(f"   cache: {api.cache.stats()}, geocodes: {api.geocodes.stats()}")
+
+        restarted = buddy.WebAPIManager()
+        before = server.total_requests()
+        results, elapsed, errors = run_phase(buddy, restarted, operations, args.workers)
+        report("restart (disk cache only)", results, elapsed, server.total_requests() - before)
+        print(f"\nNetwork calls by provider: {server.requests}")
+        print(f"Connection pools: {http_session.pool_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from tracing import span, propagate
+
+DEFAULT_BRIEFING = {
+    "location": "London",
+    "news_categories": ["general", "technology", "business"],
+    "currencies": [["USD", "EUR"], ["USD", "PKR"]],
+    "deadline": 5.0
+}
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="briefing")
+
+
+class FanOutResult:
+    """Outcome of fan_out: finished results, failures and calls still running at the deadline"""
+
+    def __init__(self, results, failed, timed_out, elapsed):
+        self.results = results
+        self.failed = failed
+        self.timed_out = timed_out
+        self.elapsed = elapsed
+
+
+def fan_out(calls, deadline, executor=None) -> FanOutResult:
+    """Run {label: (func, *args)} concurrently and wait at most deadline seconds.
+
+    Calls still running at the deadline are left to finish in the
+    background (their results land in the API caches for next time); the
+    caller gets whatever completed.
+    """
+    executor = executor or _executor
+    start = time.perf_counter()
+    futures = {}
+    for label, (func, *args) in calls.items():
+        futures[executor.submit(propagate(func), *args)] = label
+    done, not_done = wait(futures, timeout=deadline)
+
+    results, failed = {}, {}
+    for future in done:
+        label = futures[future]
+        try:
+            results[label] = future.result()
+        except Exception as e:
+            failed[label] = str(e)
+    timed_out = [futures[f] for f in not_done]
+    return FanOutResult(results, failed, timed_out, time.perf_counter() - start)
+
+
+def daily_briefing(api, settings=None, location=None) -> str:
+    """Weather, headlines and exchange rates fetched concurrently into one reply"""
+    settings = dict(DEFAULT_BRIEFING, **(settings or {}))
+    location = location or settings["location"]
+
+    calls = {"weather": (api.get_weather, location)}
+    for category in settings["news_categories"]:
+        calls[f"news:{category}"] = (api.get_news, category)
+    for from_currency, to_currency in settings["currencies"]:
+        calls[f"rate:{from_currency}/{to_currency}"] = (api.get_currency_rate, from_currency, to_currency)
+
+    with span("briefing", calls=len(calls)) as current:
+        outcome = fan_out(calls, settings["deadline"])
+        current.set(timed_out=len(outcome.timed_out), failed=len(outcome.failed))
+
+    sections = []
+    # Keep the configured order regardless of completion order
+    weather = [outcome.results[label] for label in calls if label == "weather" and label in outcome.results]
+    news = [outcome.results[label].strip() for label in calls if label.startswith("news:") and label in outcome.results]
+    rates = [outcome.results[label] for label in calls if label.startswith("rate:") and label in outcome.results]
+    if weather:
+        sections.append("🌤 " + weather[0])
+    if news:
+        sections.append("📰 " + "\n\n📰 ".join(news))
+    if rates:
+        sections.append("💱 " + "\n💱 ".join(rates))
+
+    missing = outcome.timed_out + list(outcome.failed)
+    if missing:
+        names = ", ".join(label.replace(":", " ") for label in calls if label in missing)
+        sections.append(f"⏳ Not ready in {settings['deadline']:g}s: {names}. Ask again shortly.")
+
+    if not sections:
+        return "Could not build your briefing right now."
+    return "Here's your daily briefing:\n\n" + "\n\n".join(sections)
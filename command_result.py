@@ -0,0 +1,87 @@
+import time
+from contextlib import contextmanager
+
+from tracing import span
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+# Replies from existing handlers that report a failure in plain text; LLM
+# answers are free text ("Error handling in Python...") and never checked
+FAILURE_PREFIXES = ("Error", "Failed", "Could not")
+
+STAGES = ("detect", "translate", "route", "handler", "llm")
+
+
+class CommandResult(str):
+    """The reply to a command plus how it was produced.
+
+    It is a str subclass, so callers that treat handle_input's return value
+    as plain text keep working, while newer callers can read the handler
+    that ran, the status and a per-stage timing breakdown in milliseconds.
+    """
+
+    def __new__(cls, text, handler=None, status=None, timings=None, error=None):
+        text = "" if text is None else str(text)
+        obj = super().__new__(cls, text)
+        obj.handler = handler
+        obj.status = status or (STATUS_ERROR if text.startswith(FAILURE_PREFIXES) else STATUS_OK)
+        obj.timings = dict(timings or {})
+        obj.error = error
+        return obj
+
+    @property
+    def text(self) -> str:
+        return str.__str__(self)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.timings.values())
+
+    def timing_summary(self) -> str:
+        """Human readable breakdown, e.g. 'detect 0.1ms, route 0.0ms, llm 812.4ms'"""
+        ordered = [s for s in STAGES if s in self.timings] + [s for s in self.timings if s not in STAGES]
+        return ", ".join(f"{stage} {self.timings[stage]:.1f}ms" for stage in ordered)
+
+    def to_dict(self) -> dict:
+        return {
+            "reply": self.text,
+            "handler": self.handler,
+            "status": self.status,
+            "error": self.error,
+            "timings_ms": {k: round(v, 3) for k, v in self.timings.items()},
+            "total_ms": round(self.total_ms, 3)
+        }
+
+
+class StageTimer:
+    """Accumulate wall time per stage in milliseconds"""
+
+    def __init__(self, timings=None):
+        self.timings = dict(timings or {})
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            with span(name):
+                yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def run(self, handler, stage, func, *args, **kwargs) -> CommandResult:
+        """Run func as the given stage and wrap its reply in a CommandResult"""
+        try:
+            with self.stage(stage):
+                reply = func(*args, **kwargs)
+        except Exception as e:
+            return CommandResult(f"Error: {e}", handler=handler, status=STATUS_ERROR, timings=self.timings, error=str(e))
+        if isinstance(reply, CommandResult):
+            return CommandResult(reply.text, handler=reply.handler or handler, status=reply.status,
+                                 timings=dict(self.timings, **reply.timings), error=reply.error)
+        status = STATUS_OK if stage == "llm" else None
+        return CommandResult(reply, handler=handler, status=status, timings=self.timings)
@@ -0,0 +1,190 @@
+import re
+import threading
+from typing import Optional
+
+_END = "\0"
+
+
+class Rule:
+    """A registered command pattern"""
+
+    def __init__(self, name, handler, kind, pattern, priority, order):
+        self.name = name
+        self.handler = handler
+        self.kind = kind  # "prefix", "contains" or "regex"
+        self.pattern = pattern
+        self.priority = priority
+        self.order = order
+
+    def sort_key(self):
+        return (-self.priority, self.order)
+
+    def __repr__(self):
+        return f"Rule({self.name!r}, {self.kind}={self.pattern!r}, priority={self.priority})"
+
+
+class RouteMatch:
+    """The rule chosen for an input, with the text that follows the trigger"""
+
+    def __init__(self, rule, argument="", groups=None):
+        self.rule = rule
+        self.argument = argument
+        self.groups = groups or {}
+
+    @property
+    def name(self):
+        return self.rule.name
+
+    @property
+    def handler(self):
+        return self.rule.handler
+
+    def __repr__(self):
+        return f"RouteMatch({self.rule.name!r}, argument={self.argument!r})"
+
+
+def _trie_pattern(words):
+    """Build a regex matching any of words, factored by common prefixes"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[_END] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char != _END]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy optional tail: the longest literal on the path is matched
+        return f"(?:{body})?" if _END in node else body
+
+    return build(trie)
+
+
+class CommandRouter:
+    """Route commands to handlers through one compiled dispatch structure.
+
+    Prefix triggers live in a character trie. Substring triggers are folded
+    into one prefix-factored regex, and regex triggers are appended to the
+    same alternation, so routing is one trie walk plus one regex scan no
+    matter how many commands are registered. The structure is rebuilt lazily
+    after registrations.
+    """
+
+    def __init__(self):
+        self.rules = []
+        self.lock = threading.Lock()
+        self._trie = None
+        self._regex = None
+        self._literals = {}
+        self._regex_rules = []
+
+    def register(self, name, handler, prefixes=(), contains=(), patterns=(), priority=0):
+        """Register a handler for prefix, substring or regex triggers"""
+        with self.lock:
+            for kind, triggers in (("prefix", prefixes), ("contains", contains), ("regex", patterns)):
+                if isinstance(triggers, str):
+                    triggers = (triggers,)
+                for trigger in triggers:
+                    self.rules.append(Rule(name, handler, kind, trigger, priority, len(self.rules)))
+            self._trie = None
+
+    def unregister(self, name):
+        """Remove every rule registered under name"""
+        with self.lock:
+            self.rules = [rule for rule in self.rules if rule.name != name]
+            self._trie = None
+
+    def compile(self):
+        """Build the prefix trie and the combined regex"""
+        with self.lock:
+            trie = {}
+            literals = {}
+            for rule in self.rules:
+                if rule.kind == "prefix":
+                    node = trie
+                    for char in rule.pattern:
+                        node = node.setdefault(char, {})
+                    best = node.get(_END)
+                    if best is None or rule.sort_key() < best.sort_key():
+                        node[_END] = rule
+                elif rule.kind == "contains":
+                    best = literals.get(rule.pattern)
+                    if best is None or rule.sort_key() < best.sort_key():
+                        literals[rule.pattern] = rule
+
+            # The regex reports the longest literal at a position; every shorter
+            # literal that also matches there is a prefix of it, so resolve the
+            # best rule along each path once here.
+            resolved = {}
+            for literal, rule in literals.items():
+                best = rule
+                for other, other_rule in literals.items():
+                    if other_rule.sort_key() < best.sort_key() and literal.startswith(other):
+                        best = other_rule
+                resolved[literal] = best
+
+            regex_rules = sorted((r for r in self.rules if r.kind == "regex"), key=Rule.sort_key)
+            alternatives = []
+            if literals:
+                alternatives.append(f"(?P<lit>{_trie_pattern(literals)})")
+            for index, rule in enumerate(regex_rules):
+                # Namespace the rule's own named groups so they cannot clash
+                body = re.sub(r"\(\?P<(\w+)>", lambda m: f"(?P<r{index}_{m.group(1)}>", rule.pattern)
+                alternatives.append(f"(?P<r{index}>{body})")
+
+            # A zero-width lookahead lets finditer report overlapping triggers
+            self._regex = re.compile("(?=" + "|".join(alternatives) + ")", re.DOTALL) if alternatives else None
+            self._literals = resolved
+            self._regex_rules = regex_rules
+            self._trie = trie
+
+    def route(self, text) -> Optional[RouteMatch]:
+        """Return the highest-priority match for text, or None"""
+        if self._trie is None:
+            self.compile()
+        trie, regex, literals, regex_rules = self._trie, self._regex, self._literals, self._regex_rules
+
+        best, argument, groups = None, "", {}
+        node = trie
+        for i, char in enumerate(text):
+            node = node.get(char)
+            if node is None:
+                break
+            rule = node.get(_END)
+            if rule is not None and (best is None or rule.sort_key() < best.sort_key()):
+                best, argument = rule, text[i + 1:]
+
+        if regex is not None:
+            for m in regex.finditer(text):
+                literal = m.group("lit") if literals else None
+                if literal is not None:
+                    rule = literals[literal]
+                    if best is None or rule.sort_key() < best.sort_key():
+                        best, argument, groups = rule, text[m.end("lit"):], {}
+                    # A literal hides regex rules starting at the same position
+                    candidates = [(i, r) for i, r in enumerate(regex_rules) if r.sort_key() < best.sort_key()]
+                    for index, rule in candidates:
+                        sub = re.match(rule.pattern, text[m.start():], re.DOTALL)
+                        if sub is not None:
+                            best, argument, groups = rule, text[m.start() + sub.end():], sub.groupdict()
+                            break
+                    continue
+                group = m.lastgroup
+                index = int(group[1:])
+                rule = regex_rules[index]
+                if best is None or rule.sort_key() < best.sort_key():
+                    prefix = f"r{index}_"
+                    best, argument = rule, text[m.end(group):]
+                    groups = {k[len(prefix):]: v for k, v in m.groupdict().items()
+                              if k.startswith(prefix) and v is not None}
+
+        if best is None:
+            return None
+        return RouteMatch(best, argument.strip(), groups)
+
+    def list_rules(self) -> list:
+        """Registered rules in dispatch order"""
+        return sorted(self.rules, key=Rule.sort_key)
@@ -1,4 +1,8 @@
-import requests
+import threading
+import http_session
+from resilience import guarded, dependency_timeout
+from tracing import traced
+from command_result import CommandResult, STATUS_ERROR
 
 API_KEY = "YOUR_API_KEY_HERE"
 API_URL = "https://api.deepseek.com/v1/chat/completions"
@@ -8,13 +12,74 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
-def ask_deepseek(prompt):
+# Token accounting for provider-side prefix caching
+usage_stats = {
+    "requests": 0,
+    "prompt_tokens": 0,
+    "cache_hit_tokens": 0,
+    "cache_miss_tokens": 0,
+    "completion_tokens": 0
+}
+last_usage = {}
+# Calls come from the batch runner and workflow steps at once
+usage_lock = threading.Lock()
+
+def record_usage(usage):
+    """Record token usage (including prefix-cache hits) from a response"""
+    global last_usage
+    usage = usage or {}
+    prompt_tokens = usage.get("prompt_tokens", 0) or 0
+    hit = usage.get("prompt_cache_hit_tokens")
+    if hit is None:
+        # OpenAI-compatible responses report cached tokens under prompt_tokens_details
+        hit = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+    hit = hit or 0
+    miss = usage.get("prompt_cache_miss_tokens")
+    if miss is None:
+        miss = max(prompt_tokens - hit, 0)
+
+    recorded = {
+        "prompt_tokens": prompt_tokens,
+        "cache_hit_tokens": hit,
+        "cache_miss_tokens": miss,
+        "completion_tokens": usage.get("completion_tokens", 0) or 0
+    }
+    with usage_lock:
+        last_usage = recorded
+        usage_stats["requests"] += 1
+        for key, value in recorded.items():
+            usage_stats[key] += value
+    return recorded
+
+def get_cache_stats():
+    """Return cumulative usage with the prefix-cache hit ratio"""
+    with usage_lock:
+        stats = dict(usage_stats)
+    total = stats["cache_hit_tokens"] + stats["cache_miss_tokens"]
+    stats["cache_hit_ratio"] = stats["cache_hit_tokens"] / total if total else 0.0
+    return stats
+
+FALLBACK_REPLY = "Sorry, I can't reach the AI service right now. Please try again in a moment."
+
+def fallback_reply(*args, **kwargs):
+    """The reply used when the AI service is down, marked as an error"""
+    return CommandResult(FALLBACK_REPLY, handler="llm", status=STATUS_ERROR, error="AI service unavailable")
+
+@traced("ask_deepseek")
+@guarded("deepseek", fallback=fallback_reply)
+def ask_deepseek(prompt, system_prompt=None):
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
     data = {
         "model": "deepseek-chat",
-        "messages": [{"role": "user", "content": prompt}],
+        "messages": messages,
         "temperature": 0.7
     }
 
-    response = requests.post(API_URL, headers=HEADERS, json=data)
+    response = http_session.post(API_URL, headers=HEADERS, json=data, timeout=dependency_timeout("deepseek"))
     response.raise_for_status()
-    return response.json()["choices"][0]["message"]["content"]
+    payload = response.json()
+    record_usage(payload.get("usage"))
+    return payload["choices"][0]["message"]["content"]
@@ -0,0 +1,40 @@
+PIVOT_CURRENCY = "USD"
+
+
+class RateTable:
+    """Exchange rates against one pivot currency.
+
+    Any pair is derived locally as rates[to] / rates[from], so one download
+    of the pivot table answers every conversion with two dictionary lookups
+    and a multiply.
+    """
+
+    def __init__(self, pivot, rates):
+        self.pivot = pivot.upper()
+        self.rates = {code.upper(): float(value) for code, value in rates.items() if value}
+        self.rates[self.pivot] = 1.0
+
+    def __contains__(self, currency):
+        return currency.upper() in self.rates
+
+    def rate(self, from_currency, to_currency) -> float:
+        """Units of to_currency per one from_currency; KeyError if either is unknown"""
+        return self.rates[to_currency.upper()] / self.rates[from_currency.upper()]
+
+    def convert(self, amount, from_currency, to_currency) -> float:
+        return amount * self.rate(from_currency, to_currency)
+
+    def convert_many(self, conversions) -> list:
+        """Convert (amount, from, to) tuples; unknown currencies give None"""
+        rates = self.rates
+        results = []
+        for amount, from_currency, to_currency in conversions:
+            source = rates.get(from_currency.upper())
+            target = rates.get(to_currency.upper())
+            results.append(amount * target / source if source and target else None)
+        return results
+
+
+def format_amount(value) -> str:
+    """Two decimals for large amounts, six significant digits otherwise"""
+    return f"{value:,.2f}" if abs(value) >= 100 else f"{value:.6g}"
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the web APIs WebAPIManager and the search helpers use.
+
+Replays the recorded responses in fixtures/api_responses.json for
+OpenWeatherMap, NewsAPI, exchangerate-api, Google geocoding and DuckDuckGo,
+with a configurable delay per provider. Point Buddy at it with
+
+    python fixture_server.py --port 8800 --latency 0.08
+    BUDDY_API_BASE_URL=http://127.0.0.1:8800 python main.py
+"""
+
+import os
+import re
+import json
+import hashlib
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+FIXTURES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "api_responses.json")
+
+
+def _normalize(text) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", (text or "").lower()).split())
+
+
+class FixtureServer:
+    """Threaded HTTP server replaying recorded API responses.
+
+    latency is seconds per response, either one number or a dict by
+    provider; jitter adds up to that fraction of random extra delay.
+    requests counts the calls each provider received. Responses carry an
+    ETag and a matching If-None-Match gets an empty 304.
+    """
+
+    def __init__(self, fixtures_file=FIXTURES_FILE, latency=0.0, jitter=0.0, host="127.0.0.1", port=0):
+        with open(fixtures_file, "r", encoding="utf-8") as f:
+            self.fixtures = json.load(f)
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = {}
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="fixture-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def delay(self, provider) -> float:
+        base = self.latency.get(provider, 0.0) if isinstance(self.latency, dict) else self.latency
+        return base * (1 + random.random() * self.jitter) if base else 0.0
+
+    def total_requests(self) -> int:
+        with self.lock:
+            return sum(self.requests.values())
+
+    def respond(self, path, query):
+        """Return (provider, status, payload) for a request"""
+        param = lambda name: query.get(name, [""])[0]
+        if path == "/data/2.5/weather":
+            return ("openweathermap",) + self._weather(param("q"), param("lat"), param("lon"))
+        if path == "/v2/top-headlines":
+            payload = self.fixtures["news_api"].get(param("category") or "general")
+            if payload is None:
+                return "news_api", 400, {"status": "error", "message": "Unknown category"}
+            return "news_api", 200, payload
+        match = re.fullmatch(r"/v4/latest/(\w+)", path)
+        if match:
+            return ("exchangerate_api",) + self._rates(match.group(1).upper())
+        if path == "/maps/api/geocode/json":
+            key = self._find(self.fixtures["google_maps"], param("address"))
+            if key is None:
+                return "google_maps", 200, {"results": [], "status": "ZERO_RESULTS"}
+            return "google_maps", 200, self.fixtures["google_maps"][key]
+        if path == "/":
+            results = self.fixtures["duckduckgo"]
+            key = self._find(results, param("q"))
+            return "duckduckgo", 200, results[key] if key else results["default"]
+        return "unknown", 404, {"error": f"no fixture for {path}"}
+
+    @staticmethod
+    def _find(table, text):
+        """Fixture key contained in the normalized text, longest first"""
+        text = _normalize(text)
+        for key in sorted(table, key=len, reverse=True):
+            if key != "default" and re.search(rf"\b{re.escape(key)}\b", text):
+                return key
+        return None
+
+    def _weather(self, q, lat, lon):
+        table = self.fixtures["openweathermap"]
+        key = self._find(table, q) if q else None
+        if key is None and lat and lon:
+            lat, lon = float(lat), float(lon)
+            nearest = min(table, key=lambda k: (table[k]["coord"]["lat"] - lat) ** 2 + (table[k]["coord"]["lon"] - lon) ** 2)
+            coord = table[nearest]["coord"]
+            if abs(coord["lat"] - lat) < 0.5 and abs(coord["lon"] - lon) < 0.5:
+                key = nearest
+        if key is None:
+            return 404, {"cod": "404", "message": "city not found"}
+        return 200, table[key]
+
+    def _rates(self, base):
+        table = self.fixtures["exchangerate_api"]
+        if base in table:
+            return 200, table[base]
+        # Derive other bases from the recorded USD table
+        usd = table["USD"]["rates"]
+        if base not in usd:
+            return 404, {"result": "error", "error-type": "unsupported-code"}
+        rates = {code: round(value / usd[base], 6) for code, value in usd.items()}
+        return 200, dict(table["USD"], base=base, rates=rates)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                provider, status, payload = server.respond(parts.path, parse_qs(parts.query))
+                with server.lock:
+                    server.requests[provider] = server.requests.get(provider, 0) + 1
+                delay = server.delay(provider)
+                if delay:
+                    time.sleep(delay)
+                body = json.dumps(payload).encode()
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    status, body = 304, b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if status in (200, 304):
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve recorded API responses for offline runs")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra delay, as a fraction of latency")
+    args = parser.parse_args(argv)
+    server = FixtureServer(latency=args.latency, jitter=args.jitter, port=args.port)
+    print(f"Serving fixtures on {server.url} (set BUDDY_API_BASE_URL={server.url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
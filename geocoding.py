@@ -0,0 +1,157 @@
+import re
+import json
+import os
+import time
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+CACHE_FILE = "geocode_cache.json"
+
+# Expanded before matching so "St. Louis" and "saint louis" share an entry
+ABBREVIATIONS = {
+    "st": "saint",
+    "ste": "sainte",
+    "ft": "fort",
+    "mt": "mount",
+    "nyc": "new york",
+}
+
+
+class Geocode:
+    """A resolved place"""
+
+    __slots__ = ("address", "lat", "lng", "fetched_at")
+
+    def __init__(self, address, lat, lng, fetched_at):
+        self.address = address
+        self.lat = float(lat)
+        self.lng = float(lng)
+        self.fetched_at = fetched_at
+
+    @property
+    def coords_key(self) -> str:
+        """Place id used by other caches, e.g. '@40.7128,-74.0060' (about 11m precision)"""
+        return f"@{self.lat:.4f},{self.lng:.4f}"
+
+    def to_dict(self) -> dict:
+        return {"address": self.address, "lat": self.lat, "lng": self.lng, "fetched_at": self.fetched_at}
+
+    def __repr__(self):
+        return f"Geocode({self.address!r}, {self.lat}, {self.lng})"
+
+
+class GeocodeCache:
+    """Geocodes keyed by normalized place names, persisted to a JSON file.
+
+    Every query that resolved to a place becomes an alias of it, as do the
+    leading components of the place's formatted address that name a region
+    or country ("New York, NY" and "New York, NY, USA"), so later spellings
+    of the same place are answered without an API call. The bare city name
+    is only an alias when it was the query itself: "Paris, TX" must not
+    answer a later "paris". Places are kept for ttl seconds and at most
+    max_entries places are stored (least recently used evicted).
+    """
+
+    def __init__(self, cache_file=CACHE_FILE, max_entries=1000, ttl=90 * 86400, clock=time.time):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.places = OrderedDict()  # coords_key -> Geocode
+        self.aliases = {}            # normalized name -> coords_key
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    @staticmethod
+    def normalize(query) -> str:
+        """'St. Louis,  MO' -> 'saint louis mo'"""
+        text = unicodedata.normalize("NFKD", query or "")
+        text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+        words = re.sub(r"[^\w\s-]", " ", text).split()
+        return " ".join(ABBREVIATIONS.get(word, word) for word in words)
+
+    @classmethod
+    def address_aliases(cls, address) -> list:
+        """Normalized leading components of an address with at least a region or country, shortest first"""
+        parts = [p for p in (address or "").split(",") if p.strip()]
+        return [cls.normalize(",".join(parts[:i])) for i in range(2, len(parts) + 1)]
+
+    def lookup(self, query) -> Optional[Geocode]:
+        """Return the cached place for query, or None"""
+        key = self.normalize(query)
+        with self.lock:
+            place_key = self.aliases.get(key)
+            place = self.places.get(place_key) if place_key else None
+            if place is None or self.clock() - place.fetched_at >= self.ttl:
+                self.misses += 1
+                return None
+            self.places.move_to_end(place_key)
+            self.hits += 1
+            return place
+
+    def add(self, query, address, lat, lng) -> Geocode:
+        """Store a resolved place under query and its address components"""
+        place = Geocode(address, lat, lng, self.clock())
+        with self.lock:
+            self.places[place.coords_key] = place
+            self.places.move_to_end(place.coords_key)
+            self.aliases[self.normalize(query)] = place.coords_key
+            for alias in self.address_aliases(address):
+                owner = self.aliases.get(alias)
+                if owner is None or owner not in self.places:
+                    self.aliases[alias] = place.coords_key
+            self._evict()
+        self.save()
+        return place
+
+    def resolve(self, query, fetch) -> Geocode:
+        """Return the cached place, or call fetch() -> {'address', 'lat', 'lng'} and cache it"""
+        place = self.lookup(query)
+        if place is not None:
+            return place
+        info = fetch()
+        return self.add(query, info["address"], info["lat"], info["lng"])
+
+    def _evict(self):
+        if len(self.places) <= self.max_entries:
+            return
+        while len(self.places) > self.max_entries:
+            self.places.popitem(last=False)
+        self.aliases = {alias: key for alias, key in self.aliases.items() if key in self.places}
+
+    def load(self):
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for key, info in data.get("places", {}).items():
+                    self.places[key] = Geocode(info["address"], info["lat"], info["lng"], info["fetched_at"])
+                self.aliases = dict(data.get("aliases", {}))
+        except Exception as e:
+            print(f"Error loading geocode cache: {e}")
+
+    def save(self):
+        # One writer at a time, each writing the latest snapshot
+        with self.save_lock:
+            with self.lock:
+                data = {
+                    "places": {key: place.to_dict() for key, place in self.places.items()},
+                    "aliases": dict(self.aliases)
+                }
+            try:
+                # Replace the file in one step so readers never see it half written
+                temp_file = f"{self.cache_file}.tmp"
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(temp_file, self.cache_file)
+            except Exception as e:
+                print(f"Error saving geocode cache: {e}")
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"places": len(self.places), "aliases": len(self.aliases), "hits": self.hits, "misses": self.misses}
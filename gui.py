@@ -39,12 +39,15 @@ except ImportError:
 # Import the new authentication system
 from auth_dialog import AuthDialog
 from simple_auth import SimpleAuthManager
+from slot_parser import format_email_command, format_whatsapp_command
+import tracing
 
 # Try to import handle_input from main.py
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 try:
     import main
     handle_input = main.handle_input
+    main.start_workflow_scheduler()
 except Exception as e:
     handle_input = None
     print(f"Could not import handle_input from main.py: {e}")
@@ -446,8 +449,14 @@ class BuddyAIGUI(ctk.CTk):
 
     def display_ai_response(self, response):
         self.hide_loading()
-        self.insert_message(response, user="Buddy AI", markdown=True)
-        self.status_var.set("Ready")
+        self.insert_message(str(response), user="Buddy AI", markdown=True)
+        if hasattr(response, "timing_summary"):
+            # Show which handler answered and where the time went
+            self.status_var.set(f"Ready ({response.handler}, {response.status}: {response.timing_summary()})")
+            if tracing.is_enabled():
+                print(f"[{response.handler}] {response.timing_summary()}")
+        else:
+            self.status_var.set("Ready")
         if getattr(self, 'last_input_was_voice', False):
             self.speak(response)
             self.last_input_was_voice = False
@@ -659,7 +668,7 @@ class BuddyAIGUI(ctk.CTk):
             body = text_body.get("1.0", tk.END).strip()
             if recipient and subject and body:
                 self.input_entry.delete(0, tk.END)
-                self.input_entry.insert(0, f"send email to {recipient} subject: {subject} body: {body}")
+                self.input_entry.insert(0, format_email_command(recipient, subject, body))
                 self.on_send()
             dialog.destroy()
         dialog = ctk.CTkToplevel(self)
@@ -691,7 +700,7 @@ class BuddyAIGUI(ctk.CTk):
             recipient = entry.get().strip()
             if recipient:
                 self.input_entry.delete(0, tk.END)
-                self.input_entry.insert(0, f"send whatsapp hello to {recipient}")
+                self.input_entry.insert(0, format_whatsapp_command("hello", recipient))
                 self.on_send()
             dialog.destroy()
         
@@ -0,0 +1,106 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 10
+POOL_CONNECTIONS = 16  # hosts with a cached pool
+POOL_MAXSIZE = 8       # keep-alive connections kept per host
+
+# Root URL of each external API. BUDDY_API_BASE_URL points all of them at
+# one server, e.g. fixture_server.py for offline tests and benchmarks.
+API_BASE_URLS = {
+    "openweathermap": "http://api.openweathermap.org",
+    "news_api": "https://newsapi.org",
+    "exchangerate_api": "https://api.exchangerate-api.com",
+    "currency_api": "https://api.currencyapi.com",
+    "google_maps": "https://maps.googleapis.com",
+    "duckduckgo": "https://api.duckduckgo.com"
+}
+BASE_URL_ENV = "BUDDY_API_BASE_URL"
+
+DEFAULT_HEADERS = {
+    "User-Agent": "BuddyAI/1.0",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive"
+}
+
+
+class HTTPClient:
+    """One pooled requests.Session shared by every outgoing API call.
+
+    Connections are kept alive in a pool per host, so repeated calls to the
+    same API skip the TCP and TLS handshakes. Every request gets a default
+    timeout, and gzip responses are decoded transparently.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+
+    def request(self, method, url, timeout=None, **kwargs) -> requests.Response:
+        return self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+
+    def get(self, url, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def pool_stats(self) -> dict:
+        """Per host: requests sent and connections opened (the rest reused a warm one)"""
+        stats = {}
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.host}:{pool.port}" if pool.port else pool.host
+            stats[host] = {
+                "scheme": pool.scheme,
+                "requests": pool.num_requests,
+                "connections_opened": pool.num_connections,
+                "reused": max(0, pool.num_requests - pool.num_connections),
+                "idle": pool.pool.qsize() if pool.pool is not None else 0
+            }
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HTTPClient:
+    """The process-wide HTTP client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HTTPClient()
+    return _client
+
+
+def get(url, **kwargs) -> requests.Response:
+    return get_client().get(url, **kwargs)
+
+
+def post(url, **kwargs) -> requests.Response:
+    return get_client().post(url, **kwargs)
+
+
+def pool_stats() -> dict:
+    return get_client().pool_stats()
+
+
+def base_url(provider, overrides=None) -> str:
+    """Root URL for provider: BUDDY_API_BASE_URL, then overrides, then the real API"""
+    url = os.environ.get(BASE_URL_ENV) or (overrides or {}).get(provider) or API_BASE_URLS[provider]
+    return url.rstrip("/")
@@ -0,0 +1,117 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tracing import span, propagate
+
+
+class PreprocessResult:
+    """Outcome of the pre-processing stage for one command"""
+
+    def __init__(self, original, language, text, intent=None, memory_match=None, path="", timings=None):
+        self.original = original
+        self.language = language
+        self.text = text
+        self.intent = intent
+        self.memory_match = memory_match
+        self.path = path
+        self.timings = timings or {}
+
+    def __repr__(self):
+        return f"PreprocessResult(language={self.language!r}, intent={self.intent!r}, path={self.path!r})"
+
+
+class InputPreprocessor:
+    """Run language detection, translation, intent scoring and memory lookup.
+
+    The local detector answers most inputs instantly. When it is unsure, the
+    remote detector, a speculative translation and English routing of the raw
+    text are started together and the results merged, so the stage costs
+    roughly the slowest dependency instead of the sum of all of them.
+    Speculative work that turns out to be unnecessary is cancelled (or, if
+    already running, its result is discarded).
+
+    Each stage's wall time is recorded in milliseconds on the result under
+    "detect", "translate" and "route" (memory lookup counts as routing).
+    """
+
+    def __init__(self, detector, remote_detect, translate, classify, match_memory, max_workers=4):
+        self.detector = detector
+        self.remote_detect = remote_detect
+        self.translate = translate
+        self.classify = classify
+        self.match_memory = match_memory
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="preprocess")
+
+    @staticmethod
+    def _timed(timings, stage, func, *args):
+        start = time.perf_counter()
+        try:
+            with span(stage):
+                return func(*args)
+        finally:
+            timings[stage] = timings.get(stage, 0.0) + (time.perf_counter() - start) * 1000
+
+    def run(self, user_input) -> PreprocessResult:
+        """Pre-process a raw command"""
+        timings = {}
+        local = self._timed(timings, "detect", self.detector.detect, user_input)
+        confident = self.detector.is_confident(local)
+
+        if confident and local.language == "en":
+            result = self._english(timings, user_input, "local-en")
+        elif confident:
+            translated = self._timed(timings, "translate", self.translate, user_input, "en", local.language)
+            result = self._translated(timings, user_input, local.language, translated, "local-translate")
+        else:
+            result = self._speculate(timings, user_input, local.language)
+        result.timings = timings
+        return result
+
+    def _score(self, timings, text):
+        intent = self._timed(timings, "route", self.classify, text)
+        memory_match = self._timed(timings, "route", self.match_memory, text)
+        return intent, memory_match
+
+    def _english(self, timings, user_input, path, scored=None):
+        intent, memory_match = scored if scored is not None else self._score(timings, user_input)
+        return PreprocessResult(user_input, "en", user_input, intent, memory_match, path)
+
+    def _translated(self, timings, user_input, language, translated, path):
+        intent, memory_match = self._score(timings, translated)
+        return PreprocessResult(user_input, language, translated, intent, memory_match, path)
+
+    def _speculate(self, timings, user_input, fallback_language):
+        remote_timings = {}
+        # propagate() keeps the remote calls' spans under the current command
+        detect_future = self.executor.submit(propagate(self._timed), remote_timings, "detect", self.remote_detect, user_input)
+        translate_future = self.executor.submit(propagate(self._timed), remote_timings, "translate", self.translate, user_input, "en", "auto")
+
+        # Local scoring of the raw text runs while the network calls are in flight
+        scored = self._score(timings, user_input)
+
+        if any(scored):
+            # The raw text already reads as a known English command
+            detect_future.cancel()
+            translate_future.cancel()
+            return self._english(timings, user_input, "speculative-en", scored)
+
+        try:
+            language = detect_future.result() or fallback_language
+        except Exception:
+            language = fallback_language
+        timings["detect"] += remote_timings.get("detect", 0.0)
+
+        if language == "en":
+            translate_future.cancel()
+            return self._english(timings, user_input, "remote-en", scored)
+
+        try:
+            translated = translate_future.result()
+        except Exception:
+            translated = user_input
+        # Translation overlapped detection; record its own wall time
+        timings["translate"] = remote_timings.get("translate", 0.0)
+        return self._translated(timings, user_input, language, translated, "remote-translate")
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,221 @@
+import re
+import math
+import unicodedata
+from collections import Counter, namedtuple
+
+Detection = namedtuple("Detection", ["language", "confidence", "method"])
+
+CONFIDENCE_THRESHOLD = 0.75
+
+# Trigram similarity to the English profile that marks stopword-free ASCII
+# text ("youtube", "play music") as English
+MIN_ENGLISH_TRIGRAMS = 0.05
+
+# Scripts that (for our users) map to a single language
+SCRIPT_LANGUAGES = {
+    "DEVANAGARI": "hi",
+    "BENGALI": "bn",
+    "GURMUKHI": "pa",
+    "GUJARATI": "gu",
+    "TAMIL": "ta",
+    "TELUGU": "te",
+    "KANNADA": "kn",
+    "MALAYALAM": "ml",
+    "THAI": "th",
+    "HANGUL": "ko",
+    "HIRAGANA": "ja",
+    "KATAKANA": "ja",
+    "CJK": "zh",
+    "CYRILLIC": "ru",
+    "GREEK": "el",
+    "HEBREW": "he",
+    "ARMENIAN": "hy",
+    "GEORGIAN": "ka",
+}
+
+# Letters that only Urdu (not Arabic or Persian) writes
+URDU_MARKERS = set("ٹڈڑںےۓھ")
+ARABIC_MARKERS = set("ةيى")
+PERSIAN_MARKERS = set("پچژگک")
+
+# Short text samples used to build character trigram profiles for
+# Latin-script languages. Assistant-style phrasing keeps them close to
+# what users actually type.
+LATIN_SAMPLES = {
+    "en": "open the browser and search for the weather in london. what is the news today? "
+          "send an email to my friend with the subject meeting. remember that i have a call "
+          "tomorrow. please tell me how are you and what can you do for me. play some music "
+          "and show me the latest headlines from the world.",
+    "es": "abre el navegador y busca el tiempo en madrid. cuales son las noticias de hoy? "
+          "envia un correo a mi amigo con el asunto reunion. recuerda que tengo una llamada "
+          "manana. por favor dime como estas y que puedes hacer por mi. pon musica y "
+          "muestrame los titulares mas recientes del mundo.",
+    "fr": "ouvre le navigateur et cherche la meteo a paris. quelles sont les nouvelles "
+          "aujourd'hui? envoie un courriel a mon ami avec le sujet reunion. souviens-toi que "
+          "j'ai un appel demain. dis-moi comment tu vas et ce que tu peux faire pour moi. "
+          "mets de la musique et montre-moi les derniers titres du monde.",
+    "de": "offne den browser und suche das wetter in berlin. was sind die nachrichten heute? "
+          "schick eine e-mail an meinen freund mit dem betreff treffen. denk daran dass ich "
+          "morgen einen anruf habe. sag mir bitte wie es dir geht und was du fur mich tun "
+          "kannst. spiel musik und zeig mir die neuesten schlagzeilen der welt.",
+    "it": "apri il browser e cerca il meteo a roma. quali sono le notizie di oggi? manda una "
+          "email al mio amico con oggetto riunione. ricorda che ho una chiamata domani. per "
+          "favore dimmi come stai e cosa puoi fare per me. metti della musica e mostrami gli "
+          "ultimi titoli dal mondo.",
+    "pt": "abra o navegador e pesquise o tempo em lisboa. quais sao as noticias de hoje? "
+          "envie um email para o meu amigo com o assunto reuniao. lembre que eu tenho uma "
+          "chamada amanha. por favor diga como voce esta e o que pode fazer por mim. toque "
+          "musica e mostre as ultimas manchetes do mundo.",
+}
+
+STOPWORDS = {
+    "en": {"the", "and", "is", "are", "what", "how", "to", "of", "in", "on", "for", "my", "me",
+           "you", "it", "open", "send", "search", "weather", "news", "please", "can", "show",
+           "tell", "remember", "this", "that", "with", "a", "an", "i", "do", "hello", "hi"},
+    "es": {"el", "la", "los", "las", "que", "de", "y", "en", "un", "una", "por", "para", "con",
+           "es", "mi", "como", "abre", "busca", "hola", "dime", "del", "al", "esta", "estas"},
+    "fr": {"le", "la", "les", "des", "et", "est", "un", "une", "pour", "avec", "que", "qui",
+           "je", "tu", "mon", "ouvre", "bonjour", "du", "au", "pas", "moi", "comment"},
+    "de": {"der", "die", "das", "und", "ist", "ein", "eine", "mit", "fur", "ich", "du", "mein",
+           "nicht", "was", "wie", "bitte", "offne", "suche", "hallo", "den", "dem", "zu"},
+    "it": {"il", "lo", "gli", "che", "di", "e", "un", "una", "per", "con", "sono", "mio",
+           "come", "apri", "cerca", "ciao", "del", "della", "non", "mi"},
+    "pt": {"o", "os", "as", "que", "de", "e", "um", "uma", "para", "com", "meu", "como",
+           "abra", "pesquise", "ola", "do", "da", "nao", "voce", "em"},
+}
+
+WORD_RE = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?", re.UNICODE)
+
+
+def _strip_accents(text):
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def _trigrams(text):
+    counts = Counter()
+    for word in WORD_RE.findall(text):
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            counts[padded[i:i + 3]] += 1
+    return counts
+
+
+def _build_profile(sample):
+    counts = _trigrams(sample)
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {gram: v / norm for gram, v in counts.items()}
+
+
+def _script_of(char):
+    """Return the Unicode script family name of a letter, or None"""
+    if char.isascii():
+        return "LATIN" if char.isalpha() else None
+    try:
+        name = unicodedata.name(char)
+    except ValueError:
+        return None
+    if name.startswith("CJK"):
+        return "CJK"
+    first = name.split(" ", 1)[0]
+    if first in ("LATIN", "ARABIC", "HANGUL", "HIRAGANA", "KATAKANA") or first in SCRIPT_LANGUAGES:
+        return first
+    return None
+
+
+class LanguageDetector:
+    """Offline language identification for short assistant commands.
+
+    Non-Latin scripts are identified from Unicode character names; Latin
+    text is scored against character trigram profiles and stopword lists.
+    Anything below the confidence threshold should be escalated to a remote
+    detector by the caller.
+    """
+
+    def __init__(self, threshold=CONFIDENCE_THRESHOLD):
+        self.threshold = threshold
+        self.profiles = {lang: _build_profile(sample) for lang, sample in LATIN_SAMPLES.items()}
+
+    def is_confident(self, detection) -> bool:
+        """True if a detection can be used without asking the remote service"""
+        return detection.confidence >= self.threshold
+
+    def detect(self, text) -> Detection:
+        """Detect the language of text, returning (language, confidence, method)"""
+        text = (text or "").strip()
+        if not text:
+            return Detection("en", 1.0, "empty")
+
+        scripts = Counter()
+        for char in text:
+            script = _script_of(char)
+            if script:
+                scripts[script] += 1
+        if not scripts:
+            # Only digits, punctuation or emoji: nothing to translate
+            return Detection("en", 1.0, "no-letters")
+
+        script, count = scripts.most_common(1)[0]
+        share = count / sum(scripts.values())
+        if script == "LATIN":
+            return self._detect_latin(text, share)
+        if script == "ARABIC":
+            return self._detect_arabic(text, share)
+        if script in ("HIRAGANA", "KATAKANA") or (script == "CJK" and (scripts["HIRAGANA"] or scripts["KATAKANA"])):
+            # Japanese mixes kana with kanji, so both count towards the share
+            japanese = scripts["HIRAGANA"] + scripts["KATAKANA"] + scripts["CJK"]
+            return Detection("ja", 0.95 * japanese / sum(scripts.values()), "script")
+        return Detection(SCRIPT_LANGUAGES.get(script, "en"), 0.95 * share, "script")
+
+    def _detect_arabic(self, text, share):
+        letters = set(text)
+        if letters & URDU_MARKERS:
+            return Detection("ur", 0.9 * share, "script")
+        if letters & ARABIC_MARKERS:
+            return Detection("ar", 0.85 * share, "script")
+        if letters & PERSIAN_MARKERS:
+            # Shared between Persian and Urdu; let the remote service decide
+            return Detection("fa", 0.6 * share, "script")
+        return Detection("ar", 0.6 * share, "script")
+
+    def _detect_latin(self, text, share):
+        lowered = text.lower()
+        plain = _strip_accents(lowered)
+        words = WORD_RE.findall(plain)
+        has_accents = plain != lowered
+
+        stop_hits = {lang: sum(1 for w in words if w in stops) for lang, stops in STOPWORDS.items()}
+        foreign_hits = sum(v for lang, v in stop_hits.items() if lang != "en")
+
+        grams = _trigrams(plain)
+        norm = math.sqrt(sum(v * v for v in grams.values())) or 1.0
+        cosines = {lang: sum(v * profile.get(g, 0.0) for g, v in grams.items()) / norm
+                   for lang, profile in self.profiles.items()}
+
+        # Plain ASCII with no foreign function words is the usual English
+        # command, but only when English words or trigrams back it up:
+        # "gracias amigo" or Roman Urdu "aaj mausam kaisa hai" are ASCII too
+        unsupported = False
+        if text.isascii() and foreign_hits == 0:
+            if stop_hits["en"]:
+                return Detection("en", 0.9, "ascii")
+            if cosines["en"] >= MIN_ENGLISH_TRIGRAMS and cosines["en"] == max(cosines.values()):
+                return Detection("en", 0.8, "ascii")
+            unsupported = True
+
+        scores = {}
+        for lang, cosine in cosines.items():
+            stop_share = stop_hits[lang] / len(words) if words else 0.0
+            scores[lang] = 0.6 * cosine + 0.4 * stop_share
+        if has_accents:
+            # English practically never carries diacritics
+            scores["en"] *= 0.5
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        best_lang, best = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        margin = (best - runner_up) / best if best else 0.0
+        confidence = min(1.0, 0.5 + margin) * share if best >= 0.15 else 0.3 * share
+        if unsupported:
+            # No function words in any language: let the remote service decide
+            confidence = min(confidence, 0.5)
+        return Detection(best_lang, round(confidence, 3), "ngram")
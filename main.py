@@ -1,26 +1,47 @@
-import requests
-import pyttsx3
-import speech_recognition as sr
-import whisper
 import subprocess
 import json
 import os
+import sys
 import threading
+import time
 import platform
 import webbrowser
+import urllib.parse
 import shutil
 from pathlib import Path
-from deepseek_api import ask_deepseek
+from deepseek_api import ask_deepseek, get_cache_stats
+from prompt_builder import PromptBuilder, SHORT_ANSWER_HINT
+from language_detector import LanguageDetector
+from translation_cache import TranslationCache
+from input_pipeline import InputPreprocessor
+from resilience import guarded, dependency_timeout
+from command_router import CommandRouter
+from slot_parser import parse_email_command, parse_whatsapp_command
+from command_result import CommandResult, StageTimer
+from plugin_registry import register_plugins
+from tracing import span, traced
+from ttl_cache import TTLCache
+from response_store import ResponseStore
+from exchange_rates import RateTable, PIVOT_CURRENCY, format_amount
+from prefetch import Prefetcher
+from geocoding import GeocodeCache
+from quota import QuotaTracker, QuotaExceeded
+from news_store import HeadlineStore, content_hash
+from web_search import SearchClient
+from workflow_scheduler import WorkflowScheduler, parse_schedule, SCHEDULES_FILE
+from workflow_dag import parse_steps, run_steps, is_linear, DEFAULT_MAX_PARALLEL
+from workflow_journal import RunJournal
+import http_session
 import hashlib
 import pickle
 from datetime import datetime
-import numpy as np
 from collections import defaultdict
 import re
 
 # Voice Recognition Enhancements
 class VoiceRecognitionManager:
     def __init__(self):
+        import speech_recognition as sr
         self.voice_profiles = {}
         self.language_detector = sr.Recognizer()
         self.current_language = 'en'
@@ -43,6 +64,7 @@ class VoiceRecognitionManager:
     
     def create_voice_profile(self, user_name, audio_samples=3):
         """Create a voice profile for a user"""
+        import speech_recognition as sr
         print(f"Creating voice profile for {user_name}. Please speak clearly {audio_samples} times.")
         
         recognizer = sr.Recognizer()
@@ -112,11 +134,45 @@ class VoiceRecognitionManager:
         return f"Switched to {language_code}"
 
 # Web & API Integration Manager
+class APIUnavailable(Exception):
+    """A web API answered without usable data"""
+
 class WebAPIManager:
-    def __init__(self):
+    # Seconds an answer is fresh, then how long it may still be served while refreshing
+    CACHE_TTLS = {
+        "weather": (300, 900),
+        "news": (600, 1800),
+        "currency": (3600, 86400)
+    }
+    # Provider whose key and quota each kind uses
+    PROVIDERS = {
+        "weather": "openweathermap",
+        "news": "news_api",
+        "currency": "currency_api"
+    }
+    # Method fetching each kind; cache keys are its arguments
+    FETCHERS = {
+        "weather": "_fetch_weather",
+        "news": "_fetch_news",
+        "currency": "_fetch_rates"
+    }
+
+    def __init__(self, base_urls=None):
         self.api_keys = self.load_api_keys()
-        self.weather_cache = {}
-        self.cache_duration = 300  # 5 minutes
+        # Per-provider root URLs, e.g. {"openweathermap": "http://127.0.0.1:8800"}
+        self.base_urls = dict(self.api_keys.get("base_urls", {}), **(base_urls or {}))
+        self.cache = TTLCache(max_entries=512)
+        self.rate_tables = {}
+        # Place names -> coordinates; weather for a known place is fetched by coordinates
+        self.geocodes = GeocodeCache()
+        self.quota = QuotaTracker(limits=load_app_config().get("quotas"))
+        # Every headline seen per feed, plus validators for conditional requests
+        self.headlines = HeadlineStore()
+        # Survives restarts and is shared with other Buddy processes
+        self.store = ResponseStore("api_cache.db")
+        # Learns the hot queries and keeps them warm in the background
+        self.prefetcher = Prefetcher(self)
+        self.prefetcher.start()
         
     def load_api_keys(self):
         """Load API keys from configuration"""
@@ -130,151 +186,308 @@ class WebAPIManager:
         else:
             # Create default API keys file
             default_keys = {
-                "openweathermap"
+                "openweathermap": "YOUR_API_KEY_HERE",
                 "google_maps": "YOUR_API_KEY_HERE",
-                "news_api": 
-                "currency_api 
+                "news_api": "YOUR_API_KEY_HERE",
+                "currency_api": "YOUR_API_KEY_HERE"
             }
             with open(api_file, 'w') as f:
                 json.dump(default_keys, f, indent=2)
             return default_keys
-    
+
+    def endpoint(self, provider, path):
+        return http_session.base_url(provider, self.base_urls) + path
+
+    def has_key(self, name):
+        api_key = self.api_keys.get(name)
+        return bool(api_key) and api_key != "YOUR_API_KEY_HERE"
+
+    def cached(self, kind, key, loader):
+        """Serve kind/key from the shared cache, loading it with loader() when missing"""
+        self.prefetcher.stats.record(kind, key)
+        ttl, stale_ttl = self.CACHE_TTLS[kind]
+        cache_key = (kind,) + key
+        store_key = ResponseStore.make_key(kind, key)
+        cached_value = self.cache.get(cache_key)
+        if cached_value is None:
+            # Cold in this process: start from what an earlier run stored
+            stored = self._seed_from_store(kind, key)
+            if stored is not None:
+                cached_value = stored.payload
+        if cached_value is not None and self.quota.near_exhaustion(self.PROVIDERS[kind]):
+            # Save the remaining quota: any usable answer beats a refresh
+            return cached_value
+
+        def load():
+            value = loader()
+            self.store.put(store_key, kind, value, ttl, stale_ttl)
+            return value
+
+        return self.cache.get_or_load(cache_key, load, ttl, stale_ttl)
+
+    def usage_status(self):
+        """API quota usage and cache effectiveness"""
+        cache = self.cache.stats()
+        geocodes = self.geocodes.stats()
+        return (self.quota.status_report() +
+                f"\nCache: {cache['entries']} entries, {cache['hits']} hits, {cache['stale_hits']} stale hits, {cache['misses']} misses" +
+                f"\nGeocodes: {geocodes['places']} places, {geocodes['hits']} hits")
+
+    def _seed_from_store(self, kind, key):
+        """Load a stored answer into memory; returns it, or None if the store has none"""
+        stored = self.store.get(ResponseStore.make_key(kind, key))
+        if stored is not None:
+            ttl, stale_ttl = self.CACHE_TTLS[kind]
+            self.cache.put((kind,) + key, stored.payload, ttl, stale_ttl, age=stored.age(self.store.clock()))
+        return stored
+
+    def cache_remaining(self, kind, key):
+        """Seconds of freshness left for a query in memory or on disk, or None if neither has it"""
+        remaining = self.cache.remaining((kind,) + key)
+        if remaining is None:
+            # Cold in this process, e.g. after a restart: the store may still have it
+            stored = self._seed_from_store(kind, key)
+            if stored is not None:
+                remaining = stored.expires_at - self.store.clock()
+        return remaining
+
+    def refresh(self, kind, key):
+        """Fetch a query again and store it, e.g. ahead of expiry"""
+        ttl, stale_ttl = self.CACHE_TTLS[kind]
+        # Another process may have refreshed it already
+        stored = self.store.get(ResponseStore.make_key(kind, key))
+        if stored is not None and stored.expires_at - self.store.clock() > ttl * self.prefetcher.lead:
+            self.cache.put((kind,) + key, stored.payload, ttl, stale_ttl, age=stored.age(self.store.clock()))
+            return stored.payload
+        if self.quota.near_exhaustion(self.PROVIDERS[kind]):
+            raise QuotaExceeded(f"Not prefetching {kind}: {self.PROVIDERS[kind]} quota is nearly used up")
+        value = getattr(self, self.FETCHERS[kind])(*key)
+        self.cache.put((kind,) + key, value, ttl, stale_ttl)
+        self.store.put(ResponseStore.make_key(kind, key), kind, value, ttl, stale_ttl)
+        return value
+    
+    @traced()
     def get_weather(self, location):
         """Get weather information for a location"""
         try:
-            # Check cache first
-            cache_key = f"weather_{location.lower()}"
-            if cache_key in self.weather_cache:
-                cache_time, data = self.weather_cache[cache_key]
-                if (datetime.now() - cache_time).seconds < self.cache_duration:
-                    return data
-            
             # Use OpenWeatherMap API
-            api_key = self.api_keys.get("openweathermap")
-            if api_key == "YOUR_API_KEY_HERE" or not api_key:
+            if not self.has_key("openweathermap"):
                 return "Please set up your OpenWeatherMap API key in api_keys.json"
             
-            url = f"http://api.openweathermap.org/data/2.5/weather"
-            params = {
-                "q": location,
-                "appid": api_key,
-                "units": "metric"
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                weather_info = {
-                    "location": data["name"],
-                    "temperature": f"{data['main']['temp']}°C",
-                    "description": data["weather"][0]["description"],
-                    "humidity": f"{data['main']['humidity']}%",
-                    "wind_speed": f"{data['wind']['speed']} m/s"
-                }
-                
-                # Cache the result
-                self.weather_cache[cache_key] = (datetime.now(), weather_info)
-                
-                return f"Weather in {weather_info['location']}: {weather_info['temperature']}, {weather_info['description']}, Humidity: {weather_info['humidity']}, Wind: {weather_info['wind_speed']}"
-            else:
-                return f"Could not get weather for {location}"
-                
+            # Different spellings of a geocoded place share one weather entry
+            place = self.geocodes.lookup(location)
+            if place is None and self.has_key("google_maps"):
+                # Geocode first so "New York" and "new york, ny" land on one place;
+                # without a geocode the weather API resolves the name itself
+                try:
+                    place = self.geocodes.resolve(location, lambda: self._fetch_location(location))
+                except (APIUnavailable, QuotaExceeded):
+                    place = None
+            place_key = place.coords_key if place else GeocodeCache.normalize(location)
+            weather_info = self.cached("weather", (place_key,), lambda: self._fetch_weather(place_key))
+            return f"Weather in {weather_info['location']}: {weather_info['temperature']}, {weather_info['description']}, Humidity: {weather_info['humidity']}, Wind: {weather_info['wind_speed']}"
+        except (APIUnavailable, QuotaExceeded) as e:
+            return str(e)
         except Exception as e:
             return f"Error getting weather: {str(e)}"
-    
+
+    def _fetch_weather(self, location):
+        """location is a place name or '@lat,lng'"""
+        self.quota.acquire("openweathermap")
+        url = self.endpoint("openweathermap", "/data/2.5/weather")
+        params = {
+            "appid": self.api_keys.get("openweathermap"),
+            "units": "metric"
+        }
+        if location.startswith("@"):
+            params["lat"], params["lon"] = location[1:].split(",")
+        else:
+            params["q"] = location
+        
+        response = http_session.get(url, params=params, timeout=10)
+        if response.status_code != 200:
+            raise APIUnavailable(f"Could not get weather for {location}")
+        data = response.json()
+        weather_info = {
+            "location": data["name"],
+            "temperature": f"{data['main']['temp']}°C",
+            "description": data["weather"][0]["description"],
+            "humidity": f"{data['main']['humidity']}%",
+            "wind_speed": f"{data['wind']['speed']} m/s"
+        }
+        if not location.startswith("@") and "coord" in data:
+            # The weather API geocoded the name for us: remember the place and
+            # file this answer under its coordinates for the next spelling
+            country = data.get("sys", {}).get("country")
+            address = f"{data['name']}, {country}" if country else data["name"]
+            place = self.geocodes.add(location, address, data["coord"]["lat"], data["coord"]["lon"])
+            ttl, stale_ttl = self.CACHE_TTLS["weather"]
+            self.cache.put(("weather", place.coords_key), weather_info, ttl, stale_ttl)
+            self.store.put(ResponseStore.make_key("weather", (place.coords_key,)), "weather", weather_info, ttl, stale_ttl)
+        return weather_info
+    
+    @traced()
     def get_news(self, category="general", country="us"):
         """Get latest news"""
         try:
-            api_key = self.api_keys.get("news_api")
-            if api_key == "YOUR_API_KEY_HERE" or not api_key:
+            if not self.has_key("news_api"):
                 return "Please set up your News API key in api_keys.json"
             
-            url = "https://newsapi.org/v2/top-headlines"
-            params = {
-                "country": country,
-                "category": category,
-                "apiKey": api_key
-            }
+            articles = self.cached("news", (category, country), lambda: self._fetch_news(category, country))
+            news_summary = f"Top {category} news:\n"
+            for i, article in enumerate(articles[:5], 1):
+                title = article.get("title", "No title")
+                news_summary += f"{i}. {title}\n"
             
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                articles = data.get("articles", [])[:5]  # Get top 5 articles
-                
-                news_summary = f"Top {category} news:\n"
-                for i, article in enumerate(articles, 1):
-                    title = article.get("title", "No title")
-                    news_summary += f"{i}. {title}\n"
-                
-                return news_summary
-            else:
-                return "Could not fetch news"
-                
+            return news_summary
+        except (APIUnavailable, QuotaExceeded) as e:
+            return str(e)
         except Exception as e:
             return f"Error getting news: {str(e)}"
+
+    @traced()
+    def get_news_updates(self, category="general", country="us"):
+        """Get only the headlines not shown by the previous call"""
+        try:
+            if not self.has_key("news_api"):
+                return "Please set up your News API key in api_keys.json"
+
+            self.cached("news", (category, country), lambda: self._fetch_news(category, country))
+            fresh, seen_at = self.headlines.unseen(HeadlineStore.feed_key(category, country))
+            since = f" since {datetime.fromtimestamp(seen_at).strftime('%H:%M')}" if seen_at else ""
+            if not fresh:
+                return f"No new {category} headlines{since}."
+            news_summary = f"New {category} headlines{since}:\n"
+            for i, headline in enumerate(fresh[:10], 1):
+                news_summary += f"{i}. {headline['title']}\n"
+            return news_summary
+        except (APIUnavailable, QuotaExceeded) as e:
+            return str(e)
+        except Exception as e:
+            return f"Error getting news: {str(e)}"
+
+    def _fetch_news(self, category, country):
+        """Conditional fetch; only changed feeds are parsed and merged into the headline store"""
+        feed = HeadlineStore.feed_key(category, country)
+        self.quota.acquire("news_api")
+        url = self.endpoint("news_api", "/v2/top-headlines")
+        params = {
+            "country": country,
+            "category": category,
+            "apiKey": self.api_keys.get("news_api")
+        }
+        
+        response = http_session.get(url, params=params, headers=self.headlines.request_headers(feed), timeout=10)
+        if response.status_code == 304:
+            self.headlines.touch(feed)
+            return self.headlines.current(feed)
+        if response.status_code != 200:
+            raise APIUnavailable("Could not fetch news")
+        # NewsAPI sends no validators; an identical body means nothing changed either
+        body_hash = content_hash(response.content)
+        if self.headlines.unchanged(feed, body_hash):
+            self.headlines.touch(feed)
+        else:
+            self.headlines.update(feed, response.json().get("articles", []), etag=response.headers.get("ETag"),
+                                  last_modified=response.headers.get("Last-Modified"), body_hash=body_hash)
+        return self.headlines.current(feed)
     
+    @traced()
     def get_currency_rate(self, from_currency, to_currency):
         """Get currency exchange rate"""
         try:
-            api_key = self.api_keys.get("currency_api")
-            if api_key == "YOUR_API_KEY_HERE" or not api_key:
-                # Use free API as fallback
-                url = f"https://api.exchangerate-api.com/v4/latest/{from_currency.upper()}"
-            else:
-                url = f"https://api.currencyapi.com/v3/latest"
-                params = {"apikey": api_key, "base_currency": from_currency.upper()}
-            
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if api_key == "YOUR_API_KEY_HERE" or not api_key:
-                    rate = data["rates"].get(to_currency.upper(), "Not available")
-                else:
-                    rate = data["data"].get(to_currency.upper(), {}).get("value", "Not available")
-                
-                return f"1 {from_currency.upper()} = {rate} {to_currency.upper()}"
-            else:
-                return f"Could not get exchange rate for {from_currency} to {to_currency}"
-                
+            rate = self.rate_table(from_currency).rate(from_currency, to_currency)
+            return f"1 {from_currency.upper()} = {format_amount(rate)} {to_currency.upper()}"
+        except KeyError:
+            return f"1 {from_currency.upper()} = Not available {to_currency.upper()}"
+        except (APIUnavailable, QuotaExceeded) as e:
+            return str(e)
         except Exception as e:
             return f"Error getting exchange rate: {str(e)}"
+
+    def rate_table(self, currency=PIVOT_CURRENCY):
+        """The cached pivot table, or currency's own table if the pivot does not list it"""
+        table = self._rate_table(PIVOT_CURRENCY)
+        if currency.upper() in table:
+            return table
+        return self._rate_table(currency.upper())
+
+    def _rate_table(self, base):
+        rates = self.cached("currency", (base,), lambda: self._fetch_rates(base))
+        built = self.rate_tables.get(base)
+        # Rebuild only when the cache hands back a refreshed rates dict
+        if built is None or built[0] is not rates:
+            built = self.rate_tables[base] = (rates, RateTable(base, rates))
+        return built[1]
+
+    def convert_currency(self, amount, from_currency, to_currency):
+        """Convert amount, e.g. convert_currency(100, 'usd', 'eur') -> 92.0"""
+        return self.rate_table(from_currency).convert(amount, from_currency, to_currency)
+
+    def convert_many(self, conversions):
+        """Convert many (amount, from, to) tuples against one rate table; unknown pairs give None"""
+        return self.rate_table().convert_many(conversions)
+
+    def _fetch_rates(self, base):
+        """The full rate table for base, as {currency: rate}"""
+        if not self.has_key("currency_api"):
+            # Use free API as fallback; it needs no key and counts against no quota
+            response = http_session.get(self.endpoint("exchangerate_api", f"/v4/latest/{base}"), timeout=10)
+        else:
+            self.quota.acquire("currency_api")
+            params = {"apikey": self.api_keys.get("currency_api"), "base_currency": base}
+            response = http_session.get(self.endpoint("currency_api", "/v3/latest"), params=params, timeout=10)
+        if response.status_code != 200:
+            raise APIUnavailable(f"Could not get exchange rates for {base}")
+        data = response.json()
+        if "rates" in data:
+            return data["rates"]
+        return {code: info.get("value") for code, info in data["data"].items()}
     
+    @traced()
     def search_location(self, query):
         """Search for location information"""
         try:
-            # Use Google Maps Geocoding API (free tier)
-            url = "https://maps.googleapis.com/maps/api/geocode/json"
-            params = {
-                "address": query,
-                "key": self.api_keys.get("google_maps", "YOUR_API_KEY_HERE")
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data["results"]:
-                    result = data["results"][0]
-                    location_info = {
-                        "address": result["formatted_address"],
-                        "lat": result["geometry"]["location"]["lat"],
-                        "lng": result["geometry"]["location"]["lng"]
-                    }
-                    return f"Location: {location_info['address']} (Lat: {location_info['lat']}, Lng: {location_info['lng']})"
-                else:
-                    return f"No location found for '{query}'"
-            else:
-                return "Could not search location"
-                
+            place = self.geocodes.resolve(query, lambda: self._fetch_location(query))
+            return f"Location: {place.address} (Lat: {place.lat}, Lng: {place.lng})"
+        except (APIUnavailable, QuotaExceeded) as e:
+            return str(e)
         except Exception as e:
             return f"Error searching location: {str(e)}"
 
+    def _fetch_location(self, query):
+        self.quota.acquire("google_maps")
+        # Use Google Maps Geocoding API (free tier)
+        url = self.endpoint("google_maps", "/maps/api/geocode/json")
+        params = {
+            "address": query,
+            "key": self.api_keys.get("google_maps", "YOUR_API_KEY_HERE")
+        }
+        
+        response = http_session.get(url, params=params, timeout=10)
+        if response.status_code != 200:
+            raise APIUnavailable("Could not search location")
+        data = response.json()
+        if not data["results"]:
+            raise APIUnavailable(f"No location found for '{query}'")
+        result = data["results"][0]
+        return {
+            "address": result["formatted_address"],
+            "lat": result["geometry"]["location"]["lat"],
+            "lng": result["geometry"]["location"]["lng"]
+        }
+
 # Task Automation & Workflows
 class WorkflowManager:
     def __init__(self):
         self.workflows = {}
-        self.scheduled_tasks = {}
         self.workflow_file = "workflows.json"
         self.load_workflows()
+        # Every run is appended here; workflows.json only holds definitions
+        self.journal = RunJournal()
+        # Fires scheduled runs on its own timer thread and worker pool
+        self.scheduler = WorkflowScheduler(lambda name: self.execute_workflow(name, trigger="schedule"))
+        self.scheduler.start()
         
     def load_workflows(self):
         """Load saved workflows from file"""
@@ -290,40 +503,71 @@ class WorkflowManager:
         with open(self.workflow_file, 'w') as f:
             json.dump(self.workflows, f, indent=2)
     
-    def create_workflow(self, name, commands):
-        """Create a new workflow"""
+    @traced()
+    def create_workflow(self, name, commands, max_parallel=None):
+        """Create a new workflow; commands are strings (run in order) or steps with dependencies"""
+        try:
+            steps = parse_steps(commands)
+        except (ValueError, KeyError) as e:
+            return f"Invalid workflow '{name}': {e}"
         self.workflows[name] = {
             "commands": commands,
-            "created_at": datetime.now().isoformat(),
-            "last_run": None,
-            "run_count": 0
+            "created_at": datetime.now().isoformat()
         }
+        if max_parallel:
+            self.workflows[name]["max_parallel"] = max_parallel
         self.save_workflows()
-        return f"Workflow '{name}' created with {len(commands)} commands."
+        if is_linear(commands):
+            return f"Workflow '{name}' created with {len(commands)} commands."
+        independent = sum(1 for step in steps if not step.after)
+        return f"Workflow '{name}' created with {len(commands)} steps ({independent} can start at once)."
     
-    def execute_workflow(self, name):
+    @traced()
+    def execute_workflow(self, name, trigger="manual"):
         """Execute a workflow"""
         if name not in self.workflows:
             return f"Workflow '{name}' not found."
         
         workflow = self.workflows[name]
-        results = []
+        try:
+            steps = parse_steps(workflow["commands"])
+        except (ValueError, KeyError) as e:
+            return f"Workflow '{name}' is invalid: {e}"
+        linear = is_linear(workflow["commands"])
         
         print(f"🔄 Executing workflow: {name}")
-        for i, command in enumerate(workflow["commands"], 1):
-            print(f"  Step {i}: {command}")
-            try:
-                result = handle_input(command, mode="text")
-                results.append(f"Step {i}: {result}")
-            except Exception as e:
-                results.append(f"Step {i}: Error - {str(e)}")
+        started_at = time.time()
+        start = time.perf_counter()
+        # Linear workflows run one step after another, even past a failed step
+        outcomes = run_steps(steps, self._run_step,
+                             max_parallel=1 if linear else workflow.get("max_parallel", DEFAULT_MAX_PARALLEL),
+                             stop_dependents=not linear)
         
-        # Update workflow stats
-        workflow["last_run"] = datetime.now().isoformat()
-        workflow["run_count"] += 1
-        self.save_workflows()
+        results = []
+        failed = 0
+        for step in steps:
+            outcome = outcomes[step.id]
+            if outcome.status == "ok":
+                results.append(f"Step {step.id}: {outcome.result}")
+                continue
+            failed += 1
+            label = {"failed": "Failed", "error": "Error", "skipped": "Skipped"}[outcome.status]
+            results.append(f"Step {step.id}: {label} - {outcome.result}")
         
-        return f"Workflow '{name}' completed. Results:\n" + "\n".join(results)
+        self.journal.append(name, "failed" if failed else "ok", started_at, time.perf_counter() - start,
+                            [RunJournal.step_record(outcomes[step.id]) for step in steps], trigger)
+        
+        summary = f"Workflow '{name}' completed"
+        if failed:
+            summary += f" with {failed} failed step(s)"
+        return summary + ". Results:\n" + "\n".join(results)
+    
+    def _run_step(self, step, command):
+        print(f"  Step {step.id}: {command}")
+        result = handle_input(command, mode="text")
+        if isinstance(result, CommandResult):
+            print(f"  Step {step.id} [{result.handler}, {result.status}]: {result.timing_summary()}")
+        return result
     
     def list_workflows(self):
         """List all workflows"""
@@ -332,51 +576,85 @@ class WorkflowManager:
         
         workflow_list = "Available workflows:\n"
         for name, workflow in self.workflows.items():
-            last_run = workflow.get("last_run", "Never")
-            run_count = workflow.get("run_count", 0)
+            stats = self.journal.stats(name)
+            # Definitions saved before the run journal carry their old counters
+            run_count = stats["run_count"] + workflow.get("run_count", 0)
+            if stats["last_run"]:
+                last_run = datetime.fromtimestamp(stats["last_run"]).isoformat(timespec="seconds")
+            else:
+                last_run = workflow.get("last_run") or "Never"
             workflow_list += f"- {name}: {len(workflow['commands'])} commands, run {run_count} times, last: {last_run}\n"
         
         return workflow_list
+
+    def workflow_history(self, name, limit=5):
+        """Recent runs of a workflow with per-step status and timings"""
+        runs = self.journal.runs(name, limit)
+        if not runs:
+            return f"Workflow '{name}' has not run yet."
+        
+        history = f"Recent runs of '{name}':\n"
+        for run in runs:
+            started = datetime.fromtimestamp(run["started_at"]).strftime("%Y-%m-%d %H:%M:%S")
+            history += f"- {started} ({run['trigger']}): {run['status']} in {run['elapsed']:.2f}s\n"
+            for step in run["steps"]:
+                history += f"    {step['id']}: {step['status']}, {step['elapsed']:.2f}s\n"
+        return history
     
     def delete_workflow(self, name):
         """Delete a workflow"""
         if name in self.workflows:
             del self.workflows[name]
             self.save_workflows()
+            self.scheduler.remove(name)
             return f"Workflow '{name}' deleted."
         else:
             return f"Workflow '{name}' not found."
     
-    def schedule_workflow(self, name, schedule_time):
-        """Schedule a workflow to run at specific time"""
+    @traced()
+    def schedule_workflow(self, name, schedule_time, misfire=None):
+        """Schedule a workflow once (HH:MM or a date and time), daily or with a cron expression"""
         try:
-            # Parse schedule time (format: "HH:MM" or "daily HH:MM")
-            if schedule_time.startswith("daily "):
-                time_str = schedule_time.replace("daily ", "")
-                schedule_type = "daily"
-            else:
-                time_str = schedule_time
-                schedule_type = "once"
-            
-            # Validate time format
-            hour, minute = map(int, time_str.split(":"))
-            if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                return "Invalid time format. Use HH:MM (e.g., 14:30)"
-            
             if name not in self.workflows:
                 return f"Workflow '{name}' not found."
             
-            self.scheduled_tasks[name] = {
-                "time": time_str,
-                "type": schedule_type,
-                "created_at": datetime.now().isoformat()
-            }
+            try:
+                schedule_type, spec = parse_schedule(schedule_time)
+            except ValueError:
+                return "Invalid schedule. Use HH:MM, daily HH:MM or cron <min> <hour> <day> <month> <weekday> (e.g., daily 14:30)"
             
-            return f"Workflow '{name}' scheduled to run {schedule_type} at {time_str}."
+            entry = self.scheduler.add(name, schedule_type, spec, misfire)
+            next_run = datetime.fromtimestamp(entry["next_run"]).strftime("%Y-%m-%d %H:%M")
+            if schedule_type == "once":
+                return f"Workflow '{name}' scheduled to run once at {next_run}."
+            if schedule_type == "daily":
+                return f"Workflow '{name}' scheduled to run daily at {spec} (next run {next_run})."
+            return f"Workflow '{name}' scheduled with cron '{spec}' (next run {next_run})."
             
         except Exception as e:
             return f"Error scheduling workflow: {str(e)}"
 
+    def unschedule_workflow(self, name):
+        """Cancel a workflow's schedule"""
+        if self.scheduler.remove(name):
+            return f"Schedule for workflow '{name}' removed."
+        return f"Workflow '{name}' is not scheduled."
+
+    def list_schedules(self):
+        """List scheduled workflows, soonest first"""
+        schedules = self.scheduler.list()
+        if not schedules:
+            return "No workflows scheduled."
+        
+        schedule_list = "Scheduled workflows:\n"
+        for name, entry in schedules:
+            next_run = datetime.fromtimestamp(entry["next_run"]).strftime("%Y-%m-%d %H:%M")
+            when = "once" if entry["kind"] == "once" else f"{entry['kind']} {entry['spec']}"
+            last = entry["last_result"] or "never run"
+            schedule_list += f"- {name}: {when}, next {next_run}, runs {entry['run_count']}, last: {last}\n"
+        
+        return schedule_list
+
 # Email & Communication Manager
 class EmailManager:
     def __init__(self):
@@ -432,8 +710,9 @@ class EmailManager:
         with open("whatsapp_config.json", 'w') as f:
             json.dump(self.whatsapp_config, f, indent=2)
     
-    def get_contact_number(self, contact_name):
-        """Get phone number for a contact name"""
+    @traced()
+    def get_contact_number(self, contact_name, use_default=True):
+        """Get phone number for a contact name; unknown names get the default contact's unless use_default is off"""
         contact_name_lower = contact_name.lower()
         
         # Check in contacts mapping
@@ -444,6 +723,9 @@ class EmailManager:
         if any(char.isdigit() for char in contact_name):
             return contact_name
         
+        if not use_default:
+            return ""
+        
         # Return default recipient
         default_contact = self.whatsapp_config.get("default_recipient", "mummy")
         return self.whatsapp_config.get("contacts", {}).get(default_contact, "")
@@ -490,6 +772,7 @@ class EmailManager:
         with open(self.email_file, 'w') as f:
             json.dump(data, f, indent=2)
     
+    @traced()
     def compose_email(self, subject, body, recipient="", template_name=""):
         """Compose and send email"""
         try:
@@ -525,6 +808,13 @@ class EmailManager:
         except Exception as e:
             return f"Error composing email: {str(e)}"
     
+    def compose_email_command(self, command):
+        """Compose an email from a 'send email to ... subject: ... body: ...' command"""
+        slots = parse_email_command(command)
+        if slots is None:
+            return "Could not understand the email command. Use: send email to [address] subject: [subject] body: [body]"
+        return self.compose_email(slots["subject"], slots["body"], recipient=slots["recipient"])
+    
     def create_email_template(self, name, subject, body, default_recipient=""):
         """Create email template"""
         self.email_templates[name] = {
@@ -563,6 +853,7 @@ class EmailManager:
         
         return history_text
     
+    @traced()
     def send_whatsapp_message(self, message, recipient="Mummy"):
         """Send WhatsApp message using WhatsApp Web"""
         try:
@@ -601,6 +892,7 @@ class EmailManager:
         except Exception as e:
             return f"Error opening WhatsApp Web: {str(e)}"
     
+    @traced()
     def send_whatsapp_direct(self, message, phone_number):
         """Send WhatsApp message directly to phone number"""
         try:
@@ -638,6 +930,7 @@ class EmailManager:
         except Exception as e:
             return f"Error opening WhatsApp Web: {str(e)}"
     
+    @traced()
     def send_telegram_message(self, message, recipient="default"):
         """Send Telegram message"""
         try:
@@ -659,13 +952,45 @@ class EmailManager:
         except Exception as e:
             return f"Error sending Telegram message: {str(e)}"
 
-# Initialize managers
-workflow_manager = WorkflowManager()
-email_manager = EmailManager()
-
-# Initialize managers
-voice_manager = VoiceRecognitionManager()
-api_manager = WebAPIManager()
+# Managers are created on first use so a text session only pays for what it touches
+_manager_factories = {
+    "workflow_manager": WorkflowManager,
+    "email_manager": EmailManager,
+    "voice_manager": VoiceRecognitionManager,
+    "api_manager": WebAPIManager
+}
+_managers = {}
+_managers_lock = threading.RLock()
+
+def get_manager(name):
+    """Return the shared manager instance, creating it on first use"""
+    with _managers_lock:
+        if name not in _managers:
+            _managers[name] = _manager_factories[name]()
+        return _managers[name]
+
+def get_workflow_manager():
+    return get_manager("workflow_manager")
+
+def start_workflow_scheduler():
+    """Load the workflow manager at startup when a schedule is waiting to fire"""
+    if WorkflowScheduler.has_schedules(SCHEDULES_FILE):
+        get_workflow_manager()
+
+def get_email_manager():
+    return get_manager("email_manager")
+
+def get_voice_manager():
+    return get_manager("voice_manager")
+
+def get_api_manager():
+    return get_manager("api_manager")
+
+def __getattr__(name):
+    # Keeps main.workflow_manager, main.api_manager, ... working for importers
+    if name in _manager_factories:
+        return get_manager(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 MEMORY_FILE = "memory.json"
 APP_CONFIG_FILE = "app_config.json"
@@ -713,11 +1038,16 @@ def save_app_config(config):
 
 memory = load_memory()
 app_config = load_app_config()
+prompt_builder = PromptBuilder()
+language_detector = LanguageDetector()
+translation_cache = TranslationCache()
 
-def search_duckduckgo(query):
-    url = "https://api.duckduckgo.com/"
+def fetch_instant_answer(query):
+    """First DuckDuckGo instant answer for query, or None"""
+    url = http_session.base_url("duckduckgo") + "/"
     params = {"q": query, "format": "json", "no_redirect": 1, "no_html": 1}
-    response = requests.get(url, params=params)
+    response = http_session.get(url, params=params, timeout=dependency_timeout("duckduckgo"))
+    response.raise_for_status()
     data = response.json()
     if data.get("AbstractText"):
         return data["AbstractText"]
@@ -725,9 +1055,16 @@ def search_duckduckgo(query):
         for topic in data["RelatedTopics"]:
             if isinstance(topic, dict) and "Text" in topic:
                 return topic["Text"]
-    return "Nothing found."
+    return None
+
+# Shared by every search; answers survive restarts in the API response store
+search_client = SearchClient(fetch_instant_answer, store=ResponseStore("api_cache.db"))
+
+def search_duckduckgo(query):
+    return search_client.lookup(query) or "Nothing found."
 
 def speak(text):
+    import pyttsx3
     engine = pyttsx3.init()
     engine.say(text)
     engine.runAndWait()
@@ -735,6 +1072,7 @@ def speak(text):
 def get_available_microphones():
     """Get list of available microphones"""
     try:
+        import speech_recognition as sr
         mic_list = sr.Microphone.list_microphone_names()
         return mic_list
     except Exception:
@@ -762,7 +1100,12 @@ def select_microphone():
         print("Invalid input, using default microphone.")
         return None
 
+@traced()
 def listen():
+    # Voice and speech-to-text stacks are heavy; load them only for voice input
+    import speech_recognition as sr
+    import whisper
+    voice_manager = get_voice_manager()
     recognizer = sr.Recognizer()
     
     # Let user select microphone if needed
@@ -810,12 +1153,13 @@ def listen():
             voice_manager.switch_language(detected_lang)
             print(f"🌍 Detected language: {detected_lang}")
         
-        model = whisper.load_model("base")
-        # Use absolute path for temp file
-        temp_file = os.path.join(os.getcwd(), "temp.wav")
-        with open(temp_file, "wb") as f:
-            f.write(audio.frame_data)  # type: ignore
-        result = model.transcribe(temp_file)
+        with span("whisper.transcribe"):
+            model = whisper.load_model("base")
+            # Use absolute path for temp file
+            temp_file = os.path.join(os.getcwd(), "temp.wav")
+            with open(temp_file, "wb") as f:
+                f.write(audio.frame_data)  # type: ignore
+            result = model.transcribe(temp_file)
         
         # Clean up temp file
         try:
@@ -835,26 +1179,48 @@ def listen():
     except Exception as e:
         return f"Error: {e}"
 
-def translate_text(text, target_lang='en'):
+def translate_text(text, target_lang='en', source_lang='auto'):
+    cached = translation_cache.get(source_lang, target_lang, text)
+    if cached is not None:
+        return cached
+
+    translated = translate_text_remote(text, target_lang, source_lang)
+    if not translated:
+        return text
+    translation_cache.put(source_lang, target_lang, text, translated)
+    return translated
+
+@guarded("libretranslate", fallback=None)
+def translate_text_remote(text, target_lang='en', source_lang='auto'):
     url = "https://libretranslate.com/translate"
-    payload = {"q": text, "source": "auto", "target": target_lang, "format": "text"}
-    response = requests.post(url, data=payload)
-    return response.json().get("translatedText", text)
+    payload = {"q": text, "source": source_lang, "target": target_lang, "format": "text"}
+    response = http_session.post(url, data=payload, timeout=dependency_timeout("libretranslate"))
+    return response.json().get("translatedText")
 
 def detect_language(text):
+    """Detect language locally, asking LibreTranslate only for ambiguous input"""
+    local = language_detector.detect(text)
+    if language_detector.is_confident(local):
+        return local.language
+    return detect_language_remote(text) or local.language
+
+@guarded("libretranslate", fallback=None)
+def detect_language_remote(text):
     url = "https://libretranslate.com/detect"
     payload = {"q": text}
-    response = requests.post(url, data=payload)
+    response = http_session.post(url, data=payload, timeout=dependency_timeout("libretranslate"))
     detections = response.json()
     if isinstance(detections, list) and detections and "language" in detections[0]:
         return detections[0]["language"]
     return "en"
 
 def short_answer(prompt):
-    return ask_deepseek(f"Reply in 5-100 words or less: {prompt}")
+    system_prompt, user_turn = prompt_builder.build(prompt, SHORT_ANSWER_HINT)
+    return ask_deepseek(user_turn, system_prompt=system_prompt)
 
 def full_response(prompt):
-    return ask_deepseek(prompt)
+    system_prompt, user_turn = prompt_builder.build(prompt)
+    return ask_deepseek(user_turn, system_prompt=system_prompt)
 
 def get_system_info():
     """Get current system information for better app detection"""
@@ -917,24 +1283,56 @@ def get_common_app_paths():
             "terminal": ["gnome-terminal", "/usr/bin/gnome-terminal", "xterm", "/usr/bin/xterm"]
         }
 
+def get_system_commands():
+    """Shell commands for generic app names on the current system"""
+    system_info = get_system_info()
+    return {
+        "notepad": "notepad" if system_info["is_windows"] else "gedit",
+        "calculator": "calc" if system_info["is_windows"] else "gnome-calculator",
+        "terminal": "cmd" if system_info["is_windows"] else "gnome-terminal",
+        "file manager": "explorer" if system_info["is_windows"] else "nautilus",
+        "browser": "start msedge" if system_info["is_windows"] else "firefox",
+        "task manager": "taskmgr" if system_info["is_windows"] else "gnome-system-monitor",
+        "control panel": "control" if system_info["is_windows"] else "gnome-control-center"
+    }
+
+WEB_APPS = {
+    "chrome": "https://www.google.com",
+    "gmail": "https://mail.google.com",
+    "youtube": "https://youtube.com",
+    "facebook": "https://facebook.com",
+    "instagram": "https://instagram.com",
+    "twitter": "https://twitter.com",
+    "linkedin": "https://linkedin.com",
+    "github": "https://github.com",
+    "whatsapp": "https://web.whatsapp.com",
+    "reddit": "https://reddit.com",
+    "stackoverflow": "https://stackoverflow.com",
+    "wikipedia": "https://wikipedia.org",
+    "google": "https://google.com",
+    "maps": "https://maps.google.com",
+    "drive": "https://drive.google.com",
+    "calendar": "https://calendar.google.com",
+    "meet": "https://meet.google.com",
+    "zoom": "https://zoom.us",
+    "netflix": "https://netflix.com",
+    "amazon": "https://amazon.com",
+    "telegram": "https://web.telegram.org"
+}
+
+def find_web_app(app_name):
+    """Return (name, url) of the first web app mentioned in app_name, or None"""
+    for web_app, url in WEB_APPS.items():
+        if web_app in app_name:
+            return web_app, url
+    return None
+
+def app_store_query(app_name):
+    return f"{app_name} download {get_system_info()['os']}"
+
 def search_app_store(app_name):
     """Search for apps using DuckDuckGo API to find download links"""
-    try:
-        search_query = f"{app_name} download {get_system_info()['os']}"
-        url = "https://api.duckduckgo.com/"
-        params = {"q": search_query, "format": "json", "no_redirect": 1, "no_html": 1}
-        response = requests.get(url, params=params)
-        data = response.json()
-        
-        if data.get("AbstractText"):
-            return data["AbstractText"]
-        elif data.get("RelatedTopics"):
-            for topic in data["RelatedTopics"]:
-                if isinstance(topic, dict) and "Text" in topic:
-                    return topic["Text"]
-    except Exception:
-        pass
-    return None
+    return search_client.lookup(app_store_query(app_name))
 
 def open_app(app_name):
     """Enhanced app opening function with cross-platform support and API integration"""
@@ -959,40 +1357,23 @@ def open_app(app_name):
             return f"Failed to open custom app '{app_name}': {str(e)}"
     
     # Handle web-based applications
-    web_apps = {
-        "youtube": "https://youtube.com",
-        "facebook": "https://facebook.com",
-        "instagram": "https://instagram.com",
-        "twitter": "https://twitter.com",
-        "linkedin": "https://linkedin.com",
-        "github": "https://github.com",
-        "gmail": "https://gmail.com",
-        "google": "https://google.com",
-        "maps": "https://maps.google.com",
-        "drive": "https://drive.google.com",
-        "calendar": "https://calendar.google.com",
-        "meet": "https://meet.google.com",
-        "zoom": "https://zoom.us",
-        "netflix": "https://netflix.com",
-        "amazon": "https://amazon.com",
-        "whatsapp": "https://web.whatsapp.com",
-        "telegram": "https://web.telegram.org",
-        "reddit": "https://reddit.com",
-        "stackoverflow": "https://stackoverflow.com",
-        "wikipedia": "https://wikipedia.org"
-    }
-    
-    # Check if it's a web app
-    for web_app, url in web_apps.items():
-        if web_app in app_name_lower:
-            try:
-                webbrowser.open(url)
-                return f"Opened {web_app} in your default browser."
-            except Exception as e:
-                return f"Failed to open {web_app}: {str(e)}"
+    web_app = find_web_app(app_name_lower)
+    if web_app:
+        web_app, url = web_app
+        try:
+            webbrowser.open(url)
+            return f"Opened {web_app} in your default browser."
+        except Exception as e:
+            return f"Failed to open {web_app}: {str(e)}"
     
     # Get common app paths for the current system
     common_paths = get_common_app_paths()
+    system_commands = get_system_commands()
+
+    # Names with no known local entry will likely end in the online search;
+    # start it now so it runs while the local lookups below are tried
+    if not any(key in app_name_lower for key in list(common_paths) + list(system_commands)):
+        search_client.search(app_store_query(app_name))
     
     # Try to find and open the app
     for app_key, paths in common_paths.items():
@@ -1018,16 +1399,6 @@ def open_app(app_name):
                     continue
     
     # Try using system commands
-    system_commands = {
-        "notepad": "notepad" if system_info["is_windows"] else "gedit",
-        "calculator": "calc" if system_info["is_windows"] else "gnome-calculator",
-        "terminal": "cmd" if system_info["is_windows"] else "gnome-terminal",
-        "file manager": "explorer" if system_info["is_windows"] else "nautilus",
-        "browser": "start msedge" if system_info["is_windows"] else "firefox",
-        "task manager": "taskmgr" if system_info["is_windows"] else "gnome-system-monitor",
-        "control panel": "control" if system_info["is_windows"] else "gnome-control-center"
-    }
-    
     for cmd_key, command in system_commands.items():
         if cmd_key in app_name_lower:
             try:
@@ -1047,7 +1418,7 @@ def open_app(app_name):
         except Exception as e:
             pass
     
-    # If all else fails, search for the app online
+    # If all else fails, search for the app online (usually already answered)
     search_result = search_app_store(app_name)
     if search_result:
         return f"I couldn't find '{app_name}' installed on your system. Here's what I found online: {search_result[:200]}... You can also add custom app paths to the 'app_config.json' file."
@@ -1072,24 +1443,39 @@ def simulate_email(subject, body, recipient="example@example.com"):
     print(f"[Email to {recipient}] Subject: {subject} | Body: {body}")
     return f"Email ready for {recipient}."
 
-def process_memory_command(user_input):
-    global memory
+def match_memory_command(user_input):
+    """Return (action, argument) if the input is a memory command, without side effects"""
     if "remember that" in user_input:
-        fact = user_input.replace("remember that", "").strip()
-        memory["reminders"].append(fact)
+        return ("remember", user_input.replace("remember that", "").strip())
+    elif "what did i ask you to remember" in user_input:
+        return ("recall", None)
+    elif "what's my name" in user_input or "what is my name" in user_input:
+        return ("name", None)
+    elif "forget" in user_input:
+        return ("forget", user_input.replace("forget", "").strip())
+    return None
+
+def apply_memory_command(match):
+    global memory
+    action, argument = match
+    if action == "remember":
+        memory["reminders"].append(argument)
         save_memory(memory)
         return "Got it."
-    elif "what did i ask you to remember" in user_input:
+    elif action == "recall":
         return "; ".join(memory["reminders"]) if memory["reminders"] else "No reminders."
-    elif "what's my name" in user_input or "what is my name" in user_input:
+    elif action == "name":
         return memory.get("name", "I don't know.")
-    elif "forget" in user_input:
-        keyword = user_input.replace("forget", "").strip()
-        memory["reminders"] = [r for r in memory["reminders"] if keyword not in r]
+    elif action == "forget":
+        memory["reminders"] = [r for r in memory["reminders"] if argument not in r]
         save_memory(memory)
-        return f"Forgot {keyword}."
+        return f"Forgot {argument}."
     return None
 
+def process_memory_command(user_input):
+    match = match_memory_command(user_input)
+    return apply_memory_command(match) if match else None
+
 def manage_app_config(command, app_name=None, app_path=None):
     """Manage custom app configurations"""
     global app_config
@@ -1126,126 +1512,104 @@ def manage_app_config(command, app_name=None, app_path=None):
     else:
         return "Usage:\n- 'list apps' to see custom apps\n- 'add app [name] [path]' to add custom app\n- 'remove app [name]' to remove custom app\n- 'add alias [alias] [app]' to add alias"
 
+def handle_email_command(text, route):
+    """Open a pre-filled mailto link for 'send email to ... subject: ... body: ...'"""
+    slots = parse_email_command(text) or {}
+    recipient = slots.get("recipient", "")
+    subject = slots.get("subject", "")
+    body = slots.get("body", "")
+    # Compose mailto link
+    mailto = f"mailto:{urllib.parse.quote(recipient)}"
+    params = []
+    if subject:
+        params.append(f"subject={urllib.parse.quote(subject)}")
+    if body:
+        params.append(f"body={urllib.parse.quote(body)}")
+    if params:
+        mailto += "?" + "&".join(params)
+    # Open Gmail in Chrome (or default browser)
+    webbrowser.open(mailto)
+    return f"Gmail opened in your browser with recipient, subject, and body pre-filled. Please review and send your email."
+
+def handle_whatsapp_command(text, route):
+    """Open WhatsApp Web for 'send whatsapp <message> to <recipient>'"""
+    slots = parse_whatsapp_command(text) or {}
+    message = slots.get("message", "")
+    recipient = slots.get("recipient", "")
+    phone = slots.get("phone", "")
+    if recipient and not phone:
+        # A contact name such as "mom": look it up in whatsapp_config.json
+        phone = get_email_manager().get_contact_number(recipient, use_default=False)
+        if not phone:
+            return f"I don't have a number for {recipient}. Use 'add contact {recipient} <number>' to add one."
+    # Format WhatsApp Web link
+    wa_url = f"https://wa.me/{phone}?text={urllib.parse.quote(message)}"
+    webbrowser.open(wa_url)
+    return f"WhatsApp Web opened in your browser with message ready to send to {recipient or 'your default contact'}. Click send to deliver the message."
+
+def handle_chrome_search_command(text, route):
+    """Search Google in the browser"""
+    search_query = route.argument
+    url = f"https://www.google.com/search?q={urllib.parse.quote(search_query)}"
+    webbrowser.open(url)
+    return f"Opened Chrome and searched for '{search_query}'."
+
+router = CommandRouter()
+router.register("email", handle_email_command, contains="send email to", priority=40)
+router.register("whatsapp", handle_whatsapp_command, contains="send whatsapp", priority=30)
+router.register("chrome_search", handle_chrome_search_command, contains="open chrome and search", priority=20)
+register_plugins(router, sys.modules[__name__])
+
+def classify_intent(text):
+    """Return the router match handle_input would dispatch text to, or None"""
+    return router.route(text)
+
+preprocessor = InputPreprocessor(
+    detector=language_detector,
+    remote_detect=detect_language_remote,
+    translate=translate_text,
+    classify=classify_intent,
+    match_memory=match_memory_command
+)
+
 def handle_input(user_input, mode="text"):
+    """Handle one command and return a CommandResult (usable as a plain string)"""
+    with span("handle_input", mode=mode) as current:
+        result = dispatch_input(user_input, mode)
+        current.set(handler=result.handler, status=result.status)
+        return result
+
+def dispatch_input(user_input, mode="text"):
     if user_input == "stop":
-        return "Session ended."
+        return CommandResult("Session ended.", handler="stop")
 
-    original_lang = detect_language(user_input)
-    translated_input = translate_text(user_input, "en") if original_lang != "en" else user_input
+    prepared = preprocessor.run(user_input)
+    translated_input = prepared.text
+    timer = StageTimer(prepared.timings)
 
-    memory_response = process_memory_command(translated_input)
-    if memory_response:
-        if mode == "voice":
-            speak(memory_response)
-        return memory_response
-
-    # --- SMART EMAIL ---
-    if "send email to" in translated_input:
-        import webbrowser, urllib.parse
-        # Parse recipient, subject, body
-        recipient = ""
-        subject = ""
-        body = ""
-        # Try to extract recipient, subject, body
-        try:
-            parts = translated_input.split("send email to", 1)[1].strip()
-            if "subject:" in parts:
-                recipient, rest = parts.split("subject:", 1)
-                recipient = recipient.strip()
-                if "body:" in rest:
-                    subject, body = rest.split("body:", 1)
-                    subject = subject.strip()
-                    body = body.strip()
-                else:
-                    subject = rest.strip()
-            else:
-                recipient = parts.strip()
-        except Exception:
-            recipient = parts.strip()
-        # Compose mailto link
-        mailto = f"mailto:{urllib.parse.quote(recipient)}"
-        params = []
-        if subject:
-            params.append(f"subject={urllib.parse.quote(subject)}")
-        if body:
-            params.append(f"body={urllib.parse.quote(body)}")
-        if params:
-            mailto += "?" + "&".join(params)
-        # Open Gmail in Chrome (or default browser)
-        webbrowser.open(mailto)
-        return f"Gmail opened in your browser with recipient, subject, and body pre-filled. Please review and send your email."
-
-    # --- SMART WHATSAPP ---
-    if "send whatsapp" in translated_input:
-        import webbrowser, urllib.parse
-        # Parse message and recipient
-        message = ""
-        recipient = ""
-        try:
-            parts = translated_input.split("send whatsapp", 1)[1].strip()
-            if "to" in parts:
-                message, recipient = parts.split("to", 1)
-                message = message.strip()
-                recipient = recipient.strip()
-            else:
-                message = parts.strip()
-        except Exception:
-            message = parts.strip()
-        # Format WhatsApp Web link
-        phone = recipient if recipient else ""
-        wa_url = f"https://wa.me/{phone}?text={urllib.parse.quote(message)}"
-        webbrowser.open(wa_url)
-        return f"WhatsApp Web opened in your browser with message ready to send to {recipient or 'your default contact'}. Click send to deliver the message."
-
-    # --- SMART CHROME SEARCH ---
-    if "open chrome and search" in translated_input:
-        import webbrowser, urllib.parse
-        search_query = translated_input.split("open chrome and search", 1)[1].strip()
-        url = f"https://www.google.com/search?q={urllib.parse.quote(search_query)}"
-        webbrowser.open(url)
-        return f"Opened Chrome and searched for '{search_query}'."
-
-    # --- SMART OPEN APP/SITE ---
-    if translated_input.startswith("open "):
-        app = translated_input.replace("open", "").strip()
-        # Try to open as web app first
-        web_apps = {
-            "chrome": "https://www.google.com",
-            "gmail": "https://mail.google.com",
-            "youtube": "https://youtube.com",
-            "facebook": "https://facebook.com",
-            "instagram": "https://instagram.com",
-            "twitter": "https://twitter.com",
-            "linkedin": "https://linkedin.com",
-            "github": "https://github.com",
-            "whatsapp": "https://web.whatsapp.com",
-            "reddit": "https://reddit.com",
-            "stackoverflow": "https://stackoverflow.com",
-            "wikipedia": "https://wikipedia.org"
-        }
-        for key, url in web_apps.items():
-            if key in app:
-                import webbrowser
-                webbrowser.open(url)
-                return f"Opened {key.title()} in your browser."
-        # Otherwise, try to open as a local app
-        return open_app(app)
-
-    # --- DEFAULT: fallback to previous logic ---
-    # (keep all other previous logic as before)
-    # ...
-    # (copy the rest of the original handle_input function here)
-    # ...
-    # For brevity, not repeating unchanged code here
-    return short_answer(translated_input)
-
-def create_file(file_name, content="", file_type="txt"):
+    if prepared.memory_match:
+        result = timer.run("memory", "handler", apply_memory_command, prepared.memory_match)
+        if result:
+            if mode == "voice":
+                speak(result)
+            return result
+
+    route = prepared.intent
+    if route:
+        return timer.run(route.name, "handler", route.handler, translated_input, route)
+
+    return timer.run("llm", "llm", short_answer, translated_input)
+
+def create_file(file_name, content="", file_type="txt", overwrite=False):
     """Create files with different types and content"""
     try:
         # Handle different file extensions
         if not file_name.endswith(f".{file_type}"):
             file_name = f"{file_name}.{file_type}"
         
+        if os.path.exists(file_name) and not overwrite:
+            return f"{file_name} already exists. Say 'overwrite file {file_name}' to replace it."
+        
         # Create directory if it doesn't exist
         directory = os.path.dirname(file_name)
         if directory and not os.path.exists(directory):
@@ -1510,6 +1874,8 @@ def check_python_version():
 def test_microphone():
     """Test microphone functionality"""
     try:
+        import speech_recognition as sr
+        import whisper
         print("\n🎤 Testing microphone...")
         
         # Show available microphones
@@ -1583,6 +1949,7 @@ def test_microphone():
 
 # Terminal loop
 if __name__ == "__main__":
+    start_workflow_scheduler()
     print("Buddy AI ready. Say or type something. Type 'stop' to exit.\n")
 
     while True:
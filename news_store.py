@@ -0,0 +1,147 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from urllib.parse import urlsplit
+
+STORE_FILE = "news_headlines.json"
+
+
+def headline_key(article) -> str:
+    """Identity of a story: its URL without query/fragment, else its normalized title"""
+    url = (article.get("url") or "").strip()
+    if url:
+        parts = urlsplit(url)
+        return f"url:{parts.netloc.lower()}{parts.path.rstrip('/')}"
+    return "title:" + title_key(article.get("title"))
+
+
+def title_key(title) -> str:
+    # Wire stories are often republished as "Title - Source"
+    title = re.sub(r"\s+[-|–]\s+[^-|–]+$", "", title or "")
+    return " ".join(re.sub(r"[^\w\s]", " ", title.lower()).split())
+
+
+def content_hash(body) -> str:
+    return hashlib.sha256(body if isinstance(body, bytes) else body.encode("utf-8")).hexdigest()
+
+
+class HeadlineStore:
+    """Headlines seen per news feed, with HTTP validators and a read marker.
+
+    Each feed (category and country) keeps the ETag / Last-Modified / body
+    hash of its last response, every distinct headline it has carried
+    (deduplicated by URL and by title), the order of the latest response and
+    the time the user last asked what was new.
+    """
+
+    def __init__(self, store_file=STORE_FILE, max_per_feed=200, clock=time.time):
+        self.store_file = store_file
+        self.max_per_feed = max_per_feed
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.feeds = self.load()
+
+    def load(self) -> dict:
+        try:
+            if os.path.exists(self.store_file):
+                with open(self.store_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Error loading news headlines: {e}")
+        return {}
+
+    def save(self):
+        try:
+            # Replace the file in one step so readers never see it half written
+            temp_file = f"{self.store_file}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.feeds, f, ensure_ascii=False)
+            os.replace(temp_file, self.store_file)
+        except Exception as e:
+            print(f"Error saving news headlines: {e}")
+
+    @staticmethod
+    def feed_key(category, country) -> str:
+        return f"{category}|{country}"
+
+    def _feed(self, feed):
+        return self.feeds.setdefault(feed, {"headlines": {}, "current": [], "seen_at": 0})
+
+    def request_headers(self, feed) -> dict:
+        """Conditional request headers for the feed's last response"""
+        with self.lock:
+            state = self.feeds.get(feed, {})
+            headers = {}
+            if state.get("etag"):
+                headers["If-None-Match"] = state["etag"]
+            if state.get("last_modified"):
+                headers["If-Modified-Since"] = state["last_modified"]
+            return headers
+
+    def unchanged(self, feed, body_hash) -> bool:
+        """True if a response body is identical to the last one stored"""
+        with self.lock:
+            return self.feeds.get(feed, {}).get("content_hash") == body_hash
+
+    def touch(self, feed):
+        """Record that the feed was checked and nothing changed"""
+        with self.lock:
+            self._feed(feed)["checked_at"] = self.clock()
+
+    def update(self, feed, articles, etag=None, last_modified=None, body_hash=None) -> list:
+        """Merge a fresh response; returns the headlines not stored before"""
+        now = self.clock()
+        added = []
+        with self.lock:
+            state = self._feed(feed)
+            headlines = state["headlines"]
+            titles = {title_key(h["title"]): key for key, h in headlines.items()}
+            current = []
+            for article in articles:
+                if not article.get("title"):
+                    continue
+                key = headline_key(article)
+                # The same story under another URL counts as seen
+                key = key if key in headlines else titles.get(title_key(article["title"]), key)
+                if key not in headlines:
+                    headlines[key] = {
+                        "title": article["title"],
+                        "url": article.get("url"),
+                        "source": (article.get("source") or {}).get("name"),
+                        "published_at": article.get("publishedAt"),
+                        "first_seen": now
+                    }
+                    titles[title_key(article["title"])] = key
+                    added.append(headlines[key])
+                if key not in current:
+                    current.append(key)
+            state["current"] = current
+            state.update(etag=etag, last_modified=last_modified, content_hash=body_hash, checked_at=now)
+            if len(headlines) > self.max_per_feed:
+                keep = set(current)
+                oldest = sorted((h["first_seen"], k) for k, h in headlines.items() if k not in keep)
+                for _, key in oldest[:len(headlines) - self.max_per_feed]:
+                    del headlines[key]
+            self.save()
+        return added
+
+    def current(self, feed) -> list:
+        """Headlines of the latest response, in feed order"""
+        with self.lock:
+            state = self.feeds.get(feed, {})
+            return [dict(state["headlines"][key]) for key in state.get("current", []) if key in state["headlines"]]
+
+    def unseen(self, feed, mark=True):
+        """Headlines first stored after the last call; returns (headlines, previous_seen_at)"""
+        with self.lock:
+            state = self._feed(feed)
+            seen_at = state.get("seen_at", 0)
+            new = [dict(h) for h in state["headlines"].values() if h["first_seen"] > seen_at]
+            if mark:
+                state["seen_at"] = self.clock()
+                self.save()
+        new.sort(key=lambda h: h.get("published_at") or "", reverse=True)
+        return new, seen_at
@@ -0,0 +1,115 @@
+import importlib
+import threading
+
+
+class PluginSpec:
+    """Trigger metadata for a command handler that lives in a plugin module.
+
+    The spec is all the router needs, so handlers can be registered at start
+    up while their modules (and whatever those import) load on first use.
+    """
+
+    def __init__(self, name, module, function="handle", prefixes=(), contains=(), patterns=(),
+                 priority=0, description=""):
+        self.name = name
+        self.module = module
+        self.function = function
+        self.prefixes = prefixes
+        self.contains = contains
+        self.patterns = patterns
+        self.priority = priority
+        self.description = description
+
+    def __repr__(self):
+        return f"PluginSpec({self.name!r}, module={self.module!r})"
+
+
+class LazyHandler:
+    """Router handler that imports its plugin module on the first call.
+
+    Plugin functions are called as function(app, text, route), where app is
+    the host module that owns the managers and helpers.
+    """
+
+    def __init__(self, spec, app):
+        self.spec = spec
+        self.app = app
+        self._function = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._function is not None
+
+    def load(self):
+        """Import the plugin module and resolve its handler function"""
+        if self._function is None:
+            with self._lock:
+                if self._function is None:
+                    module = importlib.import_module(self.spec.module)
+                    self._function = getattr(module, self.spec.function)
+        return self._function
+
+    def __call__(self, text, route):
+        return self.load()(self.app, text, route)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"LazyHandler({self.spec.name!r}, {state})"
+
+
+# Built-in command plugins; see plugins/ for the handlers
+PLUGINS = [
+    PluginSpec("weather", "plugins.weather",
+               # The place ends at punctuation or at words like "like"/"today"
+               patterns=r"\bweather (?:like )?(?:in|for|at) (?P<location>[^?!;,]+?(?:, ?[^?!;,]+?)?)(?=\s+(?:like|today|tonight|tomorrow|now|right now|this \w+|for|please|and)\b|\s*[?!;]|\.?\s*$)",
+               priority=25, description="weather in <city>"),
+    PluginSpec("briefing", "plugins.briefing",
+               patterns=r"^(?:(?:give|get|show) me )?(?:my |the |a )?(?:daily |morning )?briefing(?: (?:for|in) (?P<location>[^?.!]+))?[?.!]*$",
+               priority=26, description="[give me my] daily briefing [for <city>]"),
+    PluginSpec("news", "plugins.news",
+               patterns=r"^(?:(?:get|show|read|tell) (?:me )?)?(?:the )?(?:latest |today'?s )?(?:(?P<category>business|entertainment|general|health|science|sports|technology) )?(?:news|headlines)(?: today)?[?.!]*$",
+               priority=5, description="[show me the] [category] news"),
+    PluginSpec("news_updates", "plugins.news", function="handle_updates",
+               patterns=(r"^(?:what'?s|anything) new(?: in (?:the )?(?P<category>business|entertainment|general|health|science|sports|technology)(?: news)?)?(?: today)?[?.!]*$",
+                         r"^(?:(?:any|show me|get) )?(?:the )?new (?:(?P<category>business|entertainment|general|health|science|sports|technology) )?(?:headlines|news)[?.!]*$"),
+               priority=6, description="what's new [in <category>], new [category] headlines"),
+    PluginSpec("currency", "plugins.currency",
+               patterns=(r"\bconvert (?P<amount>\d[\d,]*(?:\.\d+)?) (?P<source>[a-z]{3}) (?:to|in|into) (?P<targets>[a-z]{3}(?:(?:,\s*|\s+and\s+)[a-z]{3})*)\b",
+                         r"\b(?:exchange )?rates? (?:of |for )?(?P<source>[a-z]{3}) (?:to|in) (?P<targets>[a-z]{3}(?:(?:,\s*|\s+and\s+)[a-z]{3})*)\b"),
+               priority=24, description="convert <amount> <from> to <to>[, <to>...], rate <from> to <to>"),
+    PluginSpec("status", "plugins.status",
+               contains=("api status", "api usage", "quota status"),
+               priority=45, description="api status"),
+    PluginSpec("workflows", "plugins.workflows",
+               prefixes=("create workflow ", "run workflow ", "list workflows", "delete workflow ", "schedule workflow ",
+                         "unschedule workflow ", "list schedules", "workflow history "),
+               priority=35, description="create/run/list/delete/schedule/unschedule workflow, list schedules, workflow history"),
+    PluginSpec("apps", "plugins.apps",
+               prefixes="open ", priority=10, description="open <app or website>"),
+    PluginSpec("app_config", "plugins.apps", function="handle_config",
+               prefixes=("list apps", "add app ", "remove app ", "add alias "),
+               priority=10, description="list apps, add/remove app, add alias"),
+    PluginSpec("files", "plugins.files",
+               # Whole-message commands only: these write to disk
+               patterns=r"^(?P<verb>create|overwrite) (?:an? |the )?(?:(?P<type>html|css|js|py|json|md|txt) )?file (?:called |named )?(?P<name>[\w./-]+?)[.!]*$",
+               priority=15, description="create [type] file <name>, overwrite file <name>"),
+    PluginSpec("terminal", "plugins.terminal",
+               # Whole-message commands only: these install packages, open shells or start updates
+               patterns=(r"^(?:pip )?install (?P<package>[\w.\-\[\]=<>]+?)[.!]*$",
+                         r"^(?:open (?:a |the )?)?(?:terminal|command prompt|cmd|powershell)[.!]*$",
+                         r"^update (?:the )?system[.!]*$",
+                         r"^check python(?: version)?[?.!]*$"),
+               priority=15, description="install <package>, open terminal/powershell, update system, check python"),
+]
+
+
+def register_plugins(router, app, specs=None) -> dict:
+    """Register plugin handlers on router without importing their modules"""
+    handlers = {}
+    for spec in PLUGINS if specs is None else specs:
+        handler = LazyHandler(spec, app)
+        router.register(spec.name, handler, prefixes=spec.prefixes, contains=spec.contains,
+                        patterns=spec.patterns, priority=spec.priority)
+        handlers[spec.name] = handler
+    return handlers
@@ -0,0 +1 @@
+"""Command handler plugins, loaded on first use by plugin_registry"""
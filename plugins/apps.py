@@ -0,0 +1,25 @@
+"""App launching and custom app configuration"""
+import webbrowser
+
+
+def handle(app, text, route):
+    """Open a website or a local application"""
+    name = route.argument
+    # Try to open as web app first
+    web_app = app.find_web_app(name)
+    if web_app:
+        key, url = web_app
+        webbrowser.open(url)
+        return f"Opened {key.title()} in your browser."
+    # Otherwise, try to open as a local app
+    return app.open_app(name)
+
+
+def handle_config(app, text, route):
+    """list apps, add app <name> <path>, remove app <name>, add alias <alias> <app>"""
+    command = route.rule.pattern.strip()
+    if command == "add alias":
+        # manage_app_config checks "add" before "alias"
+        command = "alias"
+    name, _, value = route.argument.partition(" ")
+    return app.manage_app_config(command, name or None, value.strip() or None)
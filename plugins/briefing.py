@@ -0,0 +1,8 @@
+"""Daily briefing: 'daily briefing [for <city>]'"""
+from briefing import daily_briefing
+
+
+def handle(app, text, route):
+    location = (route.groups.get("location") or "").strip(" ?.!") or None
+    settings = app.app_config.get("briefing", {})
+    return daily_briefing(app.get_api_manager(), settings, location)
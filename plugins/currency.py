@@ -0,0 +1,31 @@
+"""Currency commands.
+
+- convert 100 usd to eur
+- convert 100 usd to eur, gbp and pkr
+- rate usd to pkr
+"""
+import re
+
+from exchange_rates import format_amount
+
+
+def handle(app, text, route):
+    api = app.get_api_manager()
+    source = route.groups["source"].upper()
+    targets = [t.upper() for t in re.split(r",\s*|\s+and\s+", route.groups["targets"]) if t]
+    amount = route.groups.get("amount")
+    if not amount:
+        return "\n".join(api.get_currency_rate(source, target) for target in targets)
+
+    amount = float(amount.replace(",", ""))
+    try:
+        converted = api.convert_many([(amount, source, target) for target in targets])
+    except Exception as e:
+        return f"Error getting exchange rate: {str(e)}"
+    lines = []
+    for target, value in zip(targets, converted):
+        if value is None:
+            lines.append(f"{target}: not available")
+        else:
+            lines.append(f"{format_amount(amount)} {source} = {format_amount(value)} {target}")
+    return "\n".join(lines)
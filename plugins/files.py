@@ -0,0 +1,11 @@
+"""File creation: 'create [type] file <name>', 'overwrite file <name>'"""
+import os
+
+
+def handle(app, text, route):
+    name = route.groups.get("name", "").rstrip(".")
+    file_type = route.groups.get("type")
+    if not file_type:
+        extension = os.path.splitext(name)[1].lstrip(".")
+        file_type = extension or "txt"
+    return app.create_file(name, file_type=file_type, overwrite=route.groups.get("verb") == "overwrite")
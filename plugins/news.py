@@ -0,0 +1,11 @@
+"""News commands: '[category] news', 'headlines' and 'what's new [in <category>]'"""
+
+
+def handle(app, text, route):
+    category = route.groups.get("category") or "general"
+    return app.get_api_manager().get_news(category)
+
+
+def handle_updates(app, text, route):
+    category = route.groups.get("category") or "general"
+    return app.get_api_manager().get_news_updates(category)
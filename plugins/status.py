@@ -0,0 +1,11 @@
+"""Status command: 'api status' / 'api usage'"""
+
+
+def handle(app, text, route):
+    search = app.search_client.stats()
+    llm = app.get_cache_stats()
+    return (app.get_api_manager().usage_status() +
+            f"\nSearch: {search['entries']} cached, {search['hits']} hits, {search['negative_hits']} known misses, "
+            f"{search['fetches']} fetches, {search['timeouts']} timeouts" +
+            f"\nAI: {llm['requests']} requests, {llm['prompt_tokens']} prompt tokens "
+            f"({llm['cache_hit_ratio']:.0%} from the prefix cache), {llm['completion_tokens']} completion tokens")
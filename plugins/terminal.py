@@ -0,0 +1,8 @@
+"""Terminal commands: install <package>, open terminal, powershell, update system, check python"""
+
+
+def handle(app, text, route):
+    package = route.groups.get("package")
+    if package:
+        return app.install_package(package)
+    return app.handle_terminal_commands(text)
@@ -0,0 +1,8 @@
+"""Weather commands: 'weather in <city>'"""
+
+
+def handle(app, text, route):
+    location = (route.groups.get("location") or route.argument).strip(" ?.!")
+    if not location:
+        return "Please tell me which city, e.g. 'weather in London'."
+    return app.get_api_manager().get_weather(location)
@@ -0,0 +1,53 @@
+"""Workflow commands.
+
+- create workflow <name>: <command>; <command>; ...
+- create workflow <name> [max <n>]: <id> = <command>; <command> after <id>[, <id>]; ...
+  (steps with ids run in parallel unless they come 'after' others; '{<id>}'
+  in a command is replaced by that step's result)
+- run workflow <name>
+- list workflows
+- delete workflow <name>
+- schedule workflow <name> at [daily ]HH:MM | cron <min> <hour> <day> <month> <weekday>
+- unschedule workflow <name>
+- list schedules
+- workflow history <name>
+"""
+
+from workflow_dag import steps_from_text
+
+
+def handle(app, text, route):
+    manager = app.get_workflow_manager()
+    trigger = route.rule.pattern.strip()
+    argument = route.argument
+
+    if trigger == "list workflows":
+        return manager.list_workflows()
+    if trigger == "list schedules":
+        return manager.list_schedules()
+    if not argument:
+        return f"Usage: {trigger} <name>"
+
+    if trigger == "create workflow":
+        name, _, commands = argument.partition(":")
+        commands = steps_from_text([c for c in commands.split(";") if c.strip()])
+        if not commands:
+            return "Usage: create workflow <name>: <command>; <command>"
+        name, _, max_parallel = name.partition(" max ")
+        if max_parallel and not max_parallel.strip().isdigit():
+            return "Usage: create workflow <name> max <number>: <command>; <command>"
+        return manager.create_workflow(name.strip(), commands, int(max_parallel) if max_parallel else None)
+    if trigger == "run workflow":
+        return manager.execute_workflow(argument)
+    if trigger == "delete workflow":
+        return manager.delete_workflow(argument)
+    if trigger == "schedule workflow":
+        name, _, schedule_time = argument.rpartition(" at ")
+        if not name:
+            return "Usage: schedule workflow <name> at [daily ]HH:MM"
+        return manager.schedule_workflow(name.strip(), schedule_time.strip())
+    if trigger == "unschedule workflow":
+        return manager.unschedule_workflow(argument)
+    if trigger == "workflow history":
+        return manager.workflow_history(argument)
+    return f"Workflow command '{text}' not recognized."
@@ -0,0 +1,152 @@
+import os
+import json
+import time
+import threading
+
+from tracing import span
+
+
+class QueryStats:
+    """Exponentially decayed request counts per (kind, key), kept in a JSON file.
+
+    A query asked every day keeps a high score; one asked once last month
+    decays towards zero and is eventually forgotten.
+    """
+
+    def __init__(self, stats_file="prefetch_stats.json", half_life=3 * 86400, max_queries=200, clock=time.time):
+        self.stats_file = stats_file
+        self.half_life = half_life
+        self.max_queries = max_queries
+        self.clock = clock
+        self.queries = {}  # (kind, key) -> [score, last_seen]
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self.dirty = False
+        self.load()
+
+    def _decayed(self, score, last_seen, now) -> float:
+        return score * 0.5 ** (max(0.0, now - last_seen) / self.half_life)
+
+    def record(self, kind, key):
+        now = self.clock()
+        with self.lock:
+            entry = self.queries.get((kind, key))
+            score = self._decayed(entry[0], entry[1], now) if entry else 0.0
+            self.queries[(kind, key)] = [score + 1.0, now]
+            if len(self.queries) > self.max_queries:
+                coldest = min(self.queries, key=lambda q: self._decayed(*self.queries[q], now))
+                del self.queries[coldest]
+            self.dirty = True
+
+    def score(self, kind, key) -> float:
+        with self.lock:
+            entry = self.queries.get((kind, key))
+            return self._decayed(entry[0], entry[1], self.clock()) if entry else 0.0
+
+    def top(self, n, min_score=2.0) -> list:
+        """The n hottest queries scoring at least min_score, hottest first"""
+        now = self.clock()
+        with self.lock:
+            scored = [(self._decayed(score, last, now), query) for query, (score, last) in self.queries.items()]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [query for score, query in scored[:n] if score >= min_score]
+
+    def load(self):
+        if not os.path.exists(self.stats_file):
+            return
+        try:
+            with open(self.stats_file, "r") as f:
+                rows = json.load(f)
+            self.queries = {(kind, tuple(key)): [score, last] for kind, key, score, last in rows}
+        except Exception:
+            self.queries = {}
+
+    def save(self):
+        # One writer at a time, each writing the latest snapshot
+        with self.save_lock:
+            with self.lock:
+                if not self.dirty:
+                    return
+                rows = [[kind, list(key), score, last] for (kind, key), (score, last) in self.queries.items()]
+                self.dirty = False
+            try:
+                # Replace the file in one step so readers never see it half written
+                temp_file = f"{self.stats_file}.tmp"
+                with open(temp_file, "w") as f:
+                    json.dump(rows, f)
+                os.replace(temp_file, self.stats_file)
+            except Exception:
+                pass
+
+
+class Prefetcher:
+    """Keep the most requested WebAPIManager queries warm.
+
+    Every interval seconds the top_n queries from QueryStats whose cached
+    answer is missing or within lead (a fraction of its TTL) of expiring are
+    re-fetched on a daemon thread, at most max_per_cycle per cycle and
+    spacing seconds apart, so prefetching never competes with the user's own
+    requests for bandwidth or API quota.
+
+    api must provide refresh(kind, key) (which is not counted as a request),
+    cache_remaining(kind, key) and CACHE_TTLS.
+    """
+
+    def __init__(self, api, stats=None, top_n=10, interval=60, lead=0.2, max_per_cycle=5, spacing=1.0):
+        self.api = api
+        self.stats = stats if stats is not None else QueryStats()
+        self.top_n = top_n
+        self.interval = interval
+        self.lead = lead
+        self.max_per_cycle = max_per_cycle
+        self.spacing = spacing
+        self.prefetched = 0
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def due(self) -> list:
+        """Hot queries that are cold or about to expire"""
+        due = []
+        for kind, key in self.stats.top(self.top_n):
+            if kind not in self.api.CACHE_TTLS:
+                continue
+            remaining = self.api.cache_remaining(kind, key)
+            ttl = self.api.CACHE_TTLS[kind][0]
+            if remaining is None or remaining <= ttl * self.lead:
+                due.append((kind, key))
+        return due
+
+    def run_once(self) -> int:
+        """Refresh due queries; returns how many were fetched"""
+        fetched = 0
+        for kind, key in self.due()[:self.max_per_cycle]:
+            if self._stop.is_set():
+                break
+            if fetched and self.spacing:
+                self._stop.wait(self.spacing)
+            with span("prefetch", kind=kind, key="|".join(key)):
+                try:
+                    self.api.refresh(kind, key)
+                    self.prefetched += 1
+                except Exception:
+                    self.errors += 1
+            fetched += 1
+        self.stats.save()
+        return fetched
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:
+                pass
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="prefetch", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.stats.save()
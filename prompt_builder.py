@@ -0,0 +1,109 @@
+import json
+import os
+import hashlib
+from typing import Tuple
+
+PERSONA_FILE = "buddy_memory.json"
+
+# Keys in buddy_memory.json that change from turn to turn and must never be
+# part of the cached prefix.
+VOLATILE_PERSONA_KEYS = {"history"}
+
+SYSTEM_INSTRUCTIONS = (
+    "You are Buddy AI, a friendly desktop assistant. "
+    "Answer clearly and politely, keep answers practical, and never invent "
+    "results for actions you did not perform."
+)
+
+# Commands routed in main.py itself; plugin commands come from their PluginSpec
+BUILTIN_COMMANDS = [
+    "open chrome and search <query>",
+    "send email to <address> subject: <subject> body: <body>",
+    "send whatsapp <message> to <contact or number>",
+    "remember that <fact>",
+    "what did i ask you to remember",
+    "forget <keyword>",
+]
+
+
+def command_list(specs=None) -> list:
+    """Usage of every routable command, sorted so the prefix stays byte-stable"""
+    if specs is None:
+        from plugin_registry import PLUGINS
+        specs = PLUGINS
+    return sorted(set(BUILTIN_COMMANDS) | {spec.description for spec in specs if spec.description})
+
+SHORT_ANSWER_HINT = "Reply in 5-100 words or less."
+
+
+class PromptBuilder:
+    """Assemble chat prompts with a byte-identical static prefix.
+
+    Everything that does not change between turns (instructions, persona and
+    tool descriptions) goes into the system prompt, and only the user turn
+    varies, so the provider can serve the prefix from its context cache.
+    """
+
+    def __init__(self, persona_file=PERSONA_FILE, instructions=SYSTEM_INSTRUCTIONS, tools=None):
+        self.persona_file = persona_file
+        self.instructions = instructions
+        self.tools = list(tools if tools is not None else command_list())
+        self._prefix = None
+        self._persona_mtime = None
+
+    def load_persona(self) -> dict:
+        """Load the stable persona fields from the memory file"""
+        try:
+            if os.path.exists(self.persona_file):
+                with open(self.persona_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return {k: v for k, v in data.items() if k not in VOLATILE_PERSONA_KEYS}
+        except Exception as e:
+            print(f"Error loading persona: {e}")
+        return {}
+
+    def _current_mtime(self):
+        try:
+            return os.path.getmtime(self.persona_file)
+        except OSError:
+            return None
+
+    def system_prompt(self) -> str:
+        """Return the static prefix, rebuilding it only when the persona file changes"""
+        mtime = self._current_mtime()
+        if self._prefix is None or mtime != self._persona_mtime:
+            self._prefix = self._render_prefix(self.load_persona())
+            self._persona_mtime = mtime
+        return self._prefix
+
+    def _render_prefix(self, persona) -> str:
+        lines = [self.instructions, "", "## User profile"]
+        if persona:
+            # Sorted keys and fixed separators keep the bytes stable across runs
+            for key in sorted(persona):
+                value = persona[key]
+                if not isinstance(value, str):
+                    value = json.dumps(value, sort_keys=True, ensure_ascii=False)
+                lines.append(f"- {key}: {value}")
+        else:
+            lines.append("- (none)")
+        lines.append("")
+        lines.append("## Commands you can suggest")
+        for usage in self.tools:
+            lines.append(f"- {usage}")
+        return "\n".join(lines)
+
+    def user_turn(self, prompt, instruction="") -> str:
+        """Build the variable part of the request"""
+        if instruction:
+            return f"{prompt}\n\n{instruction}"
+        return prompt
+
+    def build(self, prompt, instruction="") -> Tuple[str, str]:
+        """Return (system_prompt, user_turn) for a request"""
+        return self.system_prompt(), self.user_turn(prompt, instruction)
+
+    def prefix_hash(self) -> str:
+        """Short fingerprint of the static prefix, useful when checking cache behaviour"""
+        return hashlib.sha256(self.system_prompt().encode('utf-8')).hexdigest()[:12]
@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import date
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+USAGE_FILE = "api_usage.json"
+
+# Requests per second, burst size and calls per day for each API key.
+# Override per provider with a "quotas" section in app_config.json.
+DEFAULT_LIMITS = {
+    "openweathermap": {"rate": 1.0, "burst": 10, "daily": 1000},
+    "news_api": {"rate": 0.5, "burst": 5, "daily": 100},
+    "currency_api": {"rate": 0.5, "burst": 5, "daily": 300},
+    "google_maps": {"rate": 5.0, "burst": 20, "daily": 1000},
+}
+
+# Share of the daily quota after which cached answers are preferred
+RESERVE_RATIO = 0.9
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on path across processes"""
+    with open(path, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class QuotaExceeded(Exception):
+    """A provider's rate limit or daily quota does not allow another call"""
+
+
+class TokenBucket:
+    """Allow rate calls per second on average with bursts of up to capacity"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class QuotaTracker:
+    """Client-side rate limiting and persisted daily usage per API provider"""
+
+    def __init__(self, usage_file=USAGE_FILE, limits=None, max_wait=2.0, clock=time.monotonic,
+                 today=date.today, sleep=time.sleep):
+        self.usage_file = usage_file
+        self.limits = {name: dict(settings) for name, settings in DEFAULT_LIMITS.items()}
+        for name, settings in (limits or {}).items():
+            self.limits.setdefault(name, {}).update(settings)
+        self.max_wait = max_wait
+        self.today = today
+        self.sleep = sleep
+        self.buckets = {name: TokenBucket(s.get("rate", 1.0), s.get("burst", 5), clock)
+                        for name, s in self.limits.items()}
+        self.lock = threading.Lock()
+        self.usage = self.load()
+
+    def load(self) -> dict:
+        """Usage counters as {"YYYY-MM-DD": {provider: calls}}"""
+        try:
+            if os.path.exists(self.usage_file):
+                with open(self.usage_file, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Error loading API usage: {e}")
+        return {}
+
+    def save(self):
+        try:
+            # Replace the file in one step so readers never see it half written
+            temp_file = f"{self.usage_file}.tmp"
+            with open(temp_file, 'w') as f:
+                json.dump(self.usage, f, indent=2)
+            os.replace(temp_file, self.usage_file)
+        except Exception as e:
+            print(f"Error saving API usage: {e}")
+
+    def used_today(self, provider) -> int:
+        return self.usage.get(self.today().isoformat(), {}).get(provider, 0)
+
+    def daily_limit(self, provider):
+        return self.limits.get(provider, {}).get("daily")
+
+    def near_exhaustion(self, provider) -> bool:
+        """True once a provider has used RESERVE_RATIO of its daily quota"""
+        limit = self.daily_limit(provider)
+        return bool(limit) and self.used_today(provider) >= limit * RESERVE_RATIO
+
+    def acquire(self, provider):
+        """Wait briefly for a rate-limit token and count the call; raise QuotaExceeded if not allowed"""
+        limit = self.daily_limit(provider)
+        if limit and self.used_today(provider) >= limit:
+            raise QuotaExceeded(f"Daily {provider} quota of {limit} calls is used up. Try again tomorrow.")
+        bucket = self.buckets.get(provider)
+        if bucket is not None:
+            deadline = self.max_wait
+            wait = bucket.try_acquire()
+            while wait:
+                if wait > deadline:
+                    raise QuotaExceeded(f"Too many {provider} requests right now. Try again in a moment.")
+                self.sleep(wait)
+                deadline -= wait
+                wait = bucket.try_acquire()
+        # The lock file makes reading, counting and saving one step for every
+        # Buddy process sharing these keys, so no process loses another's calls
+        with self.lock, file_lock(f"{self.usage_file}.lock"):
+            day = self.today().isoformat()
+            self.usage = self.load() or self.usage
+            # Only today's counters matter; drop older days
+            if day not in self.usage:
+                self.usage = {day: {}}
+            used = self.usage[day].get(provider, 0)
+            if limit and used >= limit:
+                raise QuotaExceeded(f"Daily {provider} quota of {limit} calls is used up. Try again tomorrow.")
+            self.usage[day][provider] = used + 1
+            self.save()
+
+    def status(self) -> list:
+        rows = []
+        for provider in self.limits:
+            limit = self.daily_limit(provider)
+            used = self.used_today(provider)
+            rows.append({
+                "provider": provider,
+                "used_today": used,
+                "daily_limit": limit,
+                "remaining": max(0, limit - used) if limit else None,
+                "saving": self.near_exhaustion(provider)
+            })
+        return rows
+
+    def status_report(self) -> str:
+        """Human readable usage, one provider per line"""
+        lines = ["API usage today:"]
+        for row in self.status():
+            limit = row["daily_limit"] or "∞"
+            note = " (near limit: serving cached data)" if row["saving"] else ""
+            lines.append(f"- {row['provider']}: {row['used_today']}/{limit}{note}")
+        return "\n".join(lines)
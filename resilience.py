@@ -0,0 +1,139 @@
+import time
+import threading
+import functools
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Per-dependency deadlines (seconds) and breaker settings
+DEPENDENCIES = {
+    "duckduckgo": {"timeout": 3.0, "failure_threshold": 3, "reset_timeout": 60.0},
+    "libretranslate": {"timeout": 4.0, "failure_threshold": 3, "reset_timeout": 60.0},
+    "deepseek": {"timeout": 30.0, "failure_threshold": 3, "reset_timeout": 30.0},
+}
+DEFAULT_SETTINGS = {"timeout": 5.0, "failure_threshold": 3, "reset_timeout": 30.0}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the breaker is open"""
+
+
+class CircuitBreaker:
+    """Fail fast on a dependency after consecutive failures.
+
+    After failure_threshold consecutive failures the breaker opens and calls
+    are rejected immediately. Once reset_timeout has passed a single probe
+    call is let through (half-open); its outcome closes or re-opens the
+    breaker.
+    """
+
+    def __init__(self, name, timeout=5.0, failure_threshold=3, reset_timeout=30.0, clock=time.monotonic):
+        self.name = name
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.lock = threading.Lock()
+        self.stats = {"calls": 0, "failures": 0, "rejected": 0, "fallbacks": 0}
+
+    def allow_request(self) -> bool:
+        """Return True if a call may go to the dependency now"""
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self.probe_in_flight = False
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            self.stats["rejected"] += 1
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.stats["failures"] += 1
+            self.probe_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = self.clock()
+
+    def call(self, func, *args, **kwargs):
+        """Call func through the breaker, raising CircuitOpenError when open"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name} is unavailable")
+        self.stats["calls"] += 1
+        start = self.clock()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        if self.clock() - start > self.timeout:
+            # Answered, but too slowly to count as healthy
+            self.record_failure()
+        else:
+            self.record_success()
+        return result
+
+    def status(self) -> dict:
+        with self.lock:
+            return dict(self.stats, name=self.name, state=self.state, consecutive_failures=self.failures)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name) -> CircuitBreaker:
+    """Return the shared breaker for a dependency"""
+    with _breakers_lock:
+        if name not in _breakers:
+            settings = dict(DEFAULT_SETTINGS, **DEPENDENCIES.get(name, {}))
+            _breakers[name] = CircuitBreaker(name, **settings)
+        return _breakers[name]
+
+
+def dependency_timeout(name) -> float:
+    """Deadline in seconds to pass to network calls for a dependency"""
+    return get_breaker(name).timeout
+
+
+def guarded(name, fallback=None):
+    """Decorator running a function through the named breaker.
+
+    On failure or while the breaker is open the fallback is returned
+    instead; a callable fallback receives the original arguments.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            breaker = get_breaker(name)
+            try:
+                return breaker.call(func, *args, **kwargs)
+            except Exception as e:
+                breaker.stats["fallbacks"] += 1
+                if not isinstance(e, CircuitOpenError):
+                    print(f"{name} call failed: {e}")
+                return fallback(*args, **kwargs) if callable(fallback) else fallback
+        return wrapper
+    return decorator
+
+
+def breaker_status() -> list:
+    """Status of every breaker created so far"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.status() for breaker in breakers]
@@ -0,0 +1,139 @@
+import json
+import time
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    stale_until REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_stale_until ON responses (stale_until);
+CREATE INDEX IF NOT EXISTS responses_fetched_at ON responses (fetched_at);
+"""
+
+
+class StoredResponse:
+    """A cached API payload and when it was fetched (wall-clock seconds)"""
+
+    __slots__ = ("key", "payload", "fetched_at", "expires_at", "stale_until")
+
+    def __init__(self, key, payload, fetched_at, expires_at, stale_until):
+        self.key = key
+        self.payload = payload
+        self.fetched_at = fetched_at
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+    def age(self, now=None) -> float:
+        return max(0.0, (now or time.time()) - self.fetched_at)
+
+    def is_fresh(self, now=None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+
+class ResponseStore:
+    """API responses persisted in SQLite so restarts do not start cold.
+
+    The database runs in WAL mode, so the GUI and a terminal or batch
+    process can read and write it at the same time. Each thread gets its own
+    connection. Storage errors are swallowed: the store only ever makes
+    lookups faster, it never makes them fail.
+    """
+
+    def __init__(self, db_file="api_cache.db", max_entries=10000, compact_every=500, clock=time.time):
+        self.db_file = db_file
+        self.max_entries = max_entries
+        self.compact_every = compact_every
+        self.clock = clock
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(kind, parts) -> str:
+        """Normalized key, e.g. ('weather', ('  London',)) -> 'weather:london'"""
+        return kind + ":" + "|".join(" ".join(str(p).lower().split()) for p in parts)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """Return the StoredResponse for key unless it is past its stale window"""
+        try:
+            row = self._connection().execute(
+                "SELECT payload, fetched_at, expires_at, stale_until FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None or row[3] <= self.clock():
+            return None
+        return StoredResponse(key, json.loads(row[0]), row[1], row[2], row[3])
+
+    def put(self, key, kind, payload, ttl, stale_ttl=0) -> bool:
+        now = self.clock()
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO responses (key, kind, payload, fetched_at, expires_at, stale_until) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, json.dumps(payload, ensure_ascii=False), now, now + ttl, now + ttl + stale_ttl)
+            )
+        except (sqlite3.Error, TypeError, ValueError):
+            return False
+        with self._lock:
+            self._writes += 1
+            due = self.compact_every and self._writes % self.compact_every == 0
+        if due:
+            self.compact()
+        return True
+
+    def delete(self, key):
+        try:
+            self._connection().execute("DELETE FROM responses WHERE key = ?", (key,))
+        except sqlite3.Error:
+            pass
+
+    def compact(self, vacuum=False) -> int:
+        """Drop dead entries, enforce max_entries (oldest first) and checkpoint the WAL"""
+        try:
+            conn = self._connection()
+            removed = conn.execute("DELETE FROM responses WHERE stale_until <= ?", (self.clock(),)).rowcount
+            count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                removed += conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY fetched_at LIMIT ?)", (count - self.max_entries,)
+                ).rowcount
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            if vacuum:
+                conn.execute("VACUUM")
+            return removed
+        except sqlite3.Error:
+            return 0
+
+    def stats(self) -> dict:
+        try:
+            conn = self._connection()
+            count, fresh = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(expires_at > ?), 0) FROM responses", (self.clock(),)
+            ).fetchone()
+        except sqlite3.Error:
+            return {"entries": 0, "fresh": 0}
+        return {"entries": count, "fresh": fresh}
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,167 @@
+import re
+from typing import Optional
+
+SLOT_RE = re.compile(r"\{(\w+)(\+)?(?::(\w+))?\}")
+
+
+def normalize_phone(value) -> str:
+    """Keep digits and a leading '+' from a phone number"""
+    value = value.strip()
+    digits = "".join(c for c in value if c.isdigit())
+    return f"+{digits}" if value.startswith("+") and digits else digits
+
+
+def looks_like_phone(value) -> bool:
+    return sum(c.isdigit() for c in value) >= 5
+
+
+SLOT_TYPES = {
+    "text": lambda v: v.strip(),
+    "email": lambda v: v.strip().strip("<>").rstrip(".,;"),
+    "phone": normalize_phone,
+    "contact": lambda v: v.strip().rstrip(".,;!"),
+}
+
+
+class Slot:
+    def __init__(self, name, kind="text", greedy=False, separator=None, optional=False):
+        self.name = name
+        self.kind = kind
+        self.greedy = greedy
+        self.separator = separator  # compiled regex of the literal before this slot
+        self.optional = optional
+        self.literal = ""
+
+
+class SlotTemplate:
+    """A command template such as 'send email to {recipient:email}[ subject: {subject}]'.
+
+    Slots are written {name} or {name:type}; {name+} makes a slot greedy so
+    it extends to the *last* occurrence of the following separator instead
+    of the first. Square brackets mark optional sections. Parsing is a
+    single left-to-right pass over the input, and slot values are sliced
+    out once at the end, so long dictated text is never copied repeatedly.
+    """
+
+    def __init__(self, template):
+        self.template = template
+        self.trigger, self.slots = self._compile(template)
+
+    @staticmethod
+    def _separator(literal):
+        words = literal.strip()
+        pattern = r"\s+".join(re.escape(part) for part in words.split())
+        # Word separators must not match inside other words ("to" in "tomorrow")
+        if words[:1].isalnum():
+            pattern = r"\b" + pattern
+        if words[-1:].isalnum():
+            pattern = pattern + r"\b"
+        return re.compile(pattern, re.IGNORECASE)
+
+    def _compile(self, template):
+        trigger_end = template.index("{") if "{" in template else len(template)
+        if "[" in template[:trigger_end]:
+            trigger_end = template.index("[")
+        trigger = template[:trigger_end].strip()
+        slots = []
+        pos = trigger_end
+        while pos < len(template):
+            optional = template[pos] == "["
+            if optional:
+                close = template.index("]", pos)
+                section = template[pos + 1:close]
+                pos = close + 1
+            else:
+                next_open = template.find("[", pos)
+                section = template[pos:] if next_open == -1 else template[pos:next_open]
+                pos = len(template) if next_open == -1 else next_open
+            last = 0
+            for m in SLOT_RE.finditer(section):
+                literal = section[last:m.start()]
+                slot = Slot(m.group(1), m.group(3) or "text", bool(m.group(2)),
+                            self._separator(literal) if literal.strip() else None, optional)
+                slot.literal = literal
+                slots.append(slot)
+                last = m.end()
+        return trigger, slots
+
+    def parse(self, text) -> Optional[dict]:
+        """Extract typed slot values from text, or None if the trigger is absent"""
+        start = text.lower().find(self.trigger.lower())
+        if start == -1:
+            return None
+        pos = start + len(self.trigger)
+
+        # (slot, value_start) for every slot found, in order
+        found = []
+        for index, slot in enumerate(self.slots):
+            if slot.separator is not None:
+                m = slot.separator.search(text, pos)
+                if m is None:
+                    if slot.optional:
+                        continue
+                    break
+                pos = m.end()
+                if found:
+                    found[-1] = (found[-1][0], found[-1][1], m.start())
+            found.append((slot, pos, None))
+            greedy_end = self._greedy_end(slot, text, pos, index)
+            if greedy_end is not None:
+                found[-1] = (slot, pos, greedy_end)
+                pos = greedy_end
+
+        values = {slot.name: "" for slot in self.slots}
+        for slot, begin, end in found:
+            raw = text[begin:end] if end is not None else text[begin:]
+            values[slot.name] = SLOT_TYPES.get(slot.kind, SLOT_TYPES["text"])(raw)
+        return values
+
+    def _greedy_end(self, slot, text, pos, index):
+        """For greedy slots, end at the last match of the next separator"""
+        if not slot.greedy or index + 1 >= len(self.slots):
+            return None
+        separator = self.slots[index + 1].separator
+        if separator is None:
+            return None
+        last = None
+        for m in separator.finditer(text, pos):
+            last = m
+        return last.start() if last else None
+
+    def format(self, **values) -> str:
+        """Render the template back into a command string"""
+        parts = [self.trigger]
+        for slot in self.slots:
+            value = str(values.get(slot.name, "") or "").strip()
+            if not value and slot.optional:
+                continue
+            literal = slot.literal if slot.literal.strip() else " "
+            parts.append(f"{literal}{value}")
+        return "".join(parts)
+
+
+EMAIL_COMMAND = SlotTemplate("send email to {recipient:email}[ subject: {subject}][ body: {body}]")
+WHATSAPP_COMMAND = SlotTemplate("send whatsapp {message+}[ to {recipient:contact}]")
+
+
+def parse_email_command(text) -> Optional[dict]:
+    """Parse 'send email to <recipient> subject: <subject> body: <body>'"""
+    return EMAIL_COMMAND.parse(text)
+
+
+def parse_whatsapp_command(text) -> Optional[dict]:
+    """Parse 'send whatsapp <message> to <recipient>' into message, recipient and phone"""
+    values = WHATSAPP_COMMAND.parse(text)
+    if values is None:
+        return None
+    recipient = values["recipient"]
+    values["phone"] = normalize_phone(recipient) if looks_like_phone(recipient) else ""
+    return values
+
+
+def format_email_command(recipient, subject="", body="") -> str:
+    return EMAIL_COMMAND.format(recipient=recipient, subject=subject, body=body)
+
+
+def format_whatsapp_command(message, recipient="") -> str:
+    return WHATSAPP_COMMAND.format(message=message, recipient=recipient)
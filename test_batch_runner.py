@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch command runner.
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from batch_runner import read_commands, run_batch, run_file
+
+def slow_handler(command, mode="text"):
+    time.sleep(0.05)
+    if command == "boom":
+        raise RuntimeError("boom")
+    return f"echo {command}"
+
+def write_file(text, suffix):
+    f = tempfile.NamedTemporaryFile("w", suffix=suffix, delete=False, encoding="utf-8")
+    f.write(text)
+    f.close()
+    return f.name
+
+def test_reads_text_and_jsonl():
+    """Plain text and JSONL inputs are both accepted."""
+    path = write_file("# comment\nopen youtube\n\nweather in paris\n", ".txt")
+    assert [c for _, c, _ in read_commands(path)] == ["open youtube", "weather in paris"]
+    path = write_file('{"command": "open youtube", "group": "a"}\n{"text": "news"}\n', ".jsonl")
+    assert list(read_commands(path)) == [(1, "open youtube", "a"), (2, "news", None)]
+    print("✓ Text and JSONL inputs read")
+
+def test_parallel_and_ordered():
+    """Commands run concurrently but results come back in input order."""
+    commands = [(i, f"cmd {i}", None) for i in range(20)]
+    start = time.perf_counter()
+    results = list(run_batch(commands, slow_handler, workers=10))
+    assert time.perf_counter() - start < 0.5
+    assert [r["line"] for r in results] == list(range(20))
+    assert results[3]["reply"] == "echo cmd 3" and results[3]["status"] == "ok"
+    print("✓ Parallel execution keeps order")
+
+def test_groups_run_in_order():
+    """Commands sharing a group never overlap."""
+    log = []
+    def handler(command, mode="text"):
+        log.append(("start", command))
+        time.sleep(0.02)
+        log.append(("end", command))
+        return command
+    commands = [(1, "remember that a", "memory"), (2, "other", None), (3, "what do you remember", "memory")]
+    list(run_batch(commands, handler, workers=4))
+    assert log.index(("end", "remember that a")) < log.index(("start", "what do you remember"))
+    print("✓ Grouped commands run sequentially")
+
+def test_run_file_writes_jsonl():
+    """Errors are recorded per line and a summary is returned."""
+    path = write_file("hello\nboom\n", ".txt")
+    out = io.StringIO()
+    summary = run_file(path, slow_handler, out, workers=2)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert records[0]["reply"] == "echo hello"
+    assert records[1]["status"] == "error" and records[1]["error"] == "boom"
+    assert "2 commands, 1 errors" in summary
+    print("✓ Results written as JSONL")
+
+if __name__ == "__main__":
+    test_reads_text_and_jsonl()
+    test_parallel_and_ordered()
+    test_groups_run_in_order()
+    test_run_file_writes_jsonl()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent daily briefing.
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from briefing import daily_briefing
+
+class SlowAPI:
+    def get_weather(self, location):
+        time.sleep(0.1)
+        return f"Weather in {location}: 20°C"
+
+    def get_news(self, category="general", country="us"):
+        time.sleep(0.1)
+        if category == "sports":
+            raise RuntimeError("offline")
+        return f"Top {category} news:\n1. Headline\n"
+
+    def get_currency_rate(self, from_currency, to_currency):
+        time.sleep(1.0 if to_currency == "PKR" else 0.1)
+        return f"1 {from_currency} = 2 {to_currency}"
+
+SETTINGS = {
+    "news_categories": ["general", "technology", "sports"],
+    "currencies": [["USD", "EUR"], ["USD", "PKR"]],
+    "deadline": 0.4
+}
+
+def test_calls_run_concurrently():
+    """Six 100ms calls finish in about the time of one."""
+    start = time.perf_counter()
+    reply = daily_briefing(SlowAPI(), dict(SETTINGS, currencies=[["USD", "EUR"]]), location="Paris")
+    assert time.perf_counter() - start < 0.35
+    assert reply.index("Weather in Paris") < reply.index("Top general news") < reply.index("Top technology news")
+    assert "1 USD = 2 EUR" in reply
+    print("✓ Briefing calls run concurrently")
+
+def test_deadline_returns_partial_results():
+    """Slow or failing calls are reported instead of delaying the reply."""
+    start = time.perf_counter()
+    reply = daily_briefing(SlowAPI(), SETTINGS)
+    assert time.perf_counter() - start < 0.6
+    assert "Weather in London" in reply and "1 USD = 2 EUR" in reply
+    assert "PKR =" not in reply
+    assert "Not ready in 0.4s: news sports, rate USD/PKR" in reply
+    print("✓ Deadline returns partial results")
+
+if __name__ == "__main__":
+    test_calls_run_concurrently()
+    test_deadline_returns_partial_results()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for structured command results and stage timing.
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from command_result import CommandResult, StageTimer
+
+def test_result_is_a_string():
+    """Existing callers can keep treating results as text."""
+    result = CommandResult("Opened Youtube in your browser.", handler="open", timings={"route": 0.02})
+    assert result == "Opened Youtube in your browser."
+    assert result.startswith("Opened") and "Youtube" in result
+    assert json.loads(json.dumps({"text": result}))["text"] == result
+    assert result.ok and result.handler == "open"
+    print("✓ Results behave like strings")
+
+def test_status_and_timings():
+    """The timer records stages and failures are reported as errors."""
+    timer = StageTimer({"detect": 0.5, "route": 0.1})
+    result = timer.run("weather", "handler", lambda: "Weather in Paris: 20°C")
+    assert result.ok and set(result.timings) == {"detect", "route", "handler"}
+    assert "handler" in result.timing_summary()
+
+    def broken():
+        raise RuntimeError("boom")
+
+    result = StageTimer().run("weather", "handler", broken)
+    assert result.status == "error" and result.error == "boom"
+    assert result.startswith("Error: boom")
+
+    assert CommandResult("Could not fetch news").status == "error"
+    assert CommandResult("Could not fetch news").to_dict()["status"] == "error"
+    print("✓ Status and timings recorded")
+
+def test_llm_status():
+    """LLM answers are not judged by their first word; the offline fallback is an error."""
+    import deepseek_api
+    result = StageTimer().run("llm", "llm", lambda: "Error handling in Python uses try and except.")
+    assert result.ok
+    result = StageTimer().run("llm", "llm", deepseek_api.fallback_reply, "hello")
+    assert result == deepseek_api.FALLBACK_REPLY
+    assert result.status == "error" and result.handler == "llm"
+    print("✓ LLM status reported")
+
+if __name__ == "__main__":
+    test_result_is_a_string()
+    test_status_and_timings()
+    test_llm_status()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled command router.
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from command_router import CommandRouter
+
+def make_router():
+    router = CommandRouter()
+    router.register("email", "email", contains="send email to", priority=40)
+    router.register("whatsapp", "whatsapp", contains="send whatsapp", priority=30)
+    router.register("chrome_search", "search", contains="open chrome and search", priority=20)
+    router.register("open", "open", prefixes="open ", priority=10)
+    router.register("weather", "weather", patterns=r"weather (?:in|for) (?P<city>[a-z ]+)", priority=5)
+    return router
+
+def test_priorities():
+    """Higher-priority rules win regardless of trigger type."""
+    router = make_router()
+    route = router.route("open chrome and search python tutorials")
+    assert route.name == "chrome_search" and route.argument == "python tutorials"
+    route = router.route("open youtube")
+    assert route.name == "open" and route.argument == "youtube"
+    route = router.route("please send email to bob@example.com subject: hi")
+    assert route.name == "email" and route.argument == "bob@example.com subject: hi"
+    assert router.route("tell me a joke") is None
+    print("✓ Priorities respected")
+
+def test_regex_groups():
+    """Named groups from regex rules are reported without clashing."""
+    router = make_router()
+    router.register("forecast", "forecast", patterns=r"forecast for (?P<city>[a-z ]+)", priority=6)
+    route = router.route("weather in new york")
+    assert route.name == "weather" and route.groups == {"city": "new york"}
+    route = router.route("forecast for paris")
+    assert route.name == "forecast" and route.groups == {"city": "paris"}
+    print("✓ Regex groups reported")
+
+def test_many_rules_stay_fast():
+    """Routing cost stays in microseconds with hundreds of rules."""
+    router = make_router()
+    for i in range(300):
+        router.register(f"cmd{i}", None, prefixes=f"command number {i} ", contains=f"keyword{i}x")
+    router.route("warm up")
+    start = time.perf_counter()
+    for _ in range(1000):
+        router.route("what is the weather going to be like tomorrow afternoon")
+    per_call = (time.perf_counter() - start) / 1000
+    assert per_call < 0.001, f"{per_call * 1e6:.0f}us per route"
+    assert router.route("command number 42 now").name == "cmd42"
+    print(f"✓ Routing takes {per_call * 1e6:.1f}us with {len(router.rules)} rules")
+
+if __name__ == "__main__":
+    test_priorities()
+    test_regex_groups()
+    test_many_rules_stay_fast()
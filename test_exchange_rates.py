@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for pivot-table exchange rates.
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from exchange_rates import RateTable, format_amount
+from command_router import CommandRouter
+from plugin_registry import register_plugins
+from types import SimpleNamespace
+
+USD_RATES = {"EUR": 0.9, "GBP": 0.8, "PKR": 280.0, "JPY": 150.0}
+
+def test_cross_rates():
+    """Any pair is derived from the one pivot table."""
+    table = RateTable("usd", USD_RATES)
+    assert table.rate("USD", "EUR") == 0.9
+    assert abs(table.rate("eur", "gbp") - 0.8 / 0.9) < 1e-12
+    assert abs(table.convert(100, "GBP", "PKR") - 35000.0) < 1e-9
+    assert table.rate("EUR", "EUR") == 1.0
+    try:
+        table.rate("USD", "XYZ")
+        assert False, "expected KeyError"
+    except KeyError:
+        pass
+    print("✓ Cross rates computed locally")
+
+def test_bulk_conversion():
+    """Bulk conversion handles many pairs quickly and marks unknown ones."""
+    table = RateTable("USD", USD_RATES)
+    results = table.convert_many([(10, "usd", "eur"), (5, "eur", "jpy"), (1, "usd", "xyz")])
+    assert results[0] == 9.0 and abs(results[1] - 5 * 150 / 0.9) < 1e-9 and results[2] is None
+
+    conversions = [(i, "EUR", "PKR") for i in range(100000)]
+    start = time.perf_counter()
+    table.convert_many(conversions)
+    assert time.perf_counter() - start < 0.5
+    assert format_amount(0.9) == "0.9" and format_amount(35000) == "35,000.00"
+    print("✓ Bulk conversion works")
+
+def test_currency_command():
+    """'convert 100 usd to eur and gbp' uses the bulk API."""
+    table = RateTable("USD", USD_RATES)
+    api = SimpleNamespace(convert_many=table.convert_many)
+    router = CommandRouter()
+    register_plugins(router, SimpleNamespace(get_api_manager=lambda: api))
+    route = router.route("convert 100 usd to eur and gbp")
+    assert route.handler("", route) == "100.00 USD = 90 EUR\n100.00 USD = 80 GBP"
+    print("✓ Currency command converts to several targets")
+
+if __name__ == "__main__":
+    test_cross_rates()
+    test_bulk_conversion()
+    test_currency_command()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the recorded-fixture API server and the base-URL override.
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import http_session
+from fixture_server import FixtureServer
+
+def test_replays_recorded_responses():
+    """Each provider's endpoint answers from the fixtures, with the configured delay."""
+    with FixtureServer(latency={"news_api": 0.05}) as server:
+        weather = http_session.get(f"{server.url}/data/2.5/weather", params={"q": "London, UK"}).json()
+        assert weather["name"] == "London"
+        nearby = http_session.get(f"{server.url}/data/2.5/weather", params={"lat": "24.86", "lon": "67.01"}).json()
+        assert nearby["name"] == "Karachi"
+        missing = http_session.get(f"{server.url}/data/2.5/weather", params={"q": "atlantis"})
+        assert missing.status_code == 404
+
+        start = time.perf_counter()
+        news = http_session.get(f"{server.url}/v2/top-headlines", params={"category": "technology"}).json()
+        assert time.perf_counter() - start >= 0.05 and len(news["articles"]) == 5
+
+        eur = http_session.get(f"{server.url}/v4/latest/EUR").json()
+        assert eur["base"] == "EUR" and abs(eur["rates"]["USD"] - 1 / 0.9213) < 1e-4
+        geo = http_session.get(f"{server.url}/maps/api/geocode/json", params={"address": "New York, NY"}).json()
+        assert geo["results"][0]["formatted_address"] == "New York, NY, USA"
+        assert "Python" in http_session.get(f"{server.url}/", params={"q": "python"}).json()["AbstractText"]
+        assert server.requests == {"openweathermap": 3, "news_api": 1, "exchangerate_api": 1,
+                                   "google_maps": 1, "duckduckgo": 1}
+    print("✓ Fixtures replayed")
+
+def test_manager_uses_base_url_override():
+    """WebAPIManager runs offline against the fixture server and caches its answers."""
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        with open("api_keys.json", "w") as f:
+            json.dump({"openweathermap": "fixture", "news_api": "fixture"}, f)
+        import main
+        with FixtureServer() as server:
+            api = main.WebAPIManager(base_urls={p: server.url for p in http_session.API_BASE_URLS})
+            assert api.get_weather("Paris").startswith("Weather in Paris: 14.9°C, overcast clouds")
+            assert api.get_weather("paris") == api.get_weather("Paris")
+            assert api.get_currency_rate("usd", "pkr") == "1 USD = 278.45 PKR"
+            assert "Top technology news" in api.get_news("technology")
+            assert server.requests == {"openweathermap": 1, "exchangerate_api": 1, "news_api": 1}
+            api.prefetcher.stop()
+    finally:
+        os.chdir(cwd)
+    print("✓ Manager runs against the fixture server")
+
+if __name__ == "__main__":
+    test_replays_recorded_responses()
+    test_manager_uses_base_url_override()
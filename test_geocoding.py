@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the normalized geocoding cache.
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from geocoding import GeocodeCache
+
+NEW_YORK = {"address": "New York, NY, USA", "lat": 40.7127753, "lng": -74.0059728}
+
+def cache_file():
+    return os.path.join(tempfile.mkdtemp(), "geocode_cache.json")
+
+def test_spellings_share_one_lookup():
+    """'New York', 'new york, ny' and 'NEW YORK' resolve with one API call."""
+    cache = GeocodeCache(cache_file())
+    calls = []
+    fetch = lambda: calls.append(1) or NEW_YORK
+    place = cache.resolve("New York", fetch)
+    assert place.coords_key == "@40.7128,-74.0060"
+    assert cache.resolve("new york, ny", fetch) is place
+    assert cache.resolve("  NEW   YORK ", fetch) is place
+    assert cache.resolve("New York, NY, USA", fetch) is place
+    assert cache.resolve("NYC", fetch) is place
+    assert len(calls) == 1
+    assert GeocodeCache.normalize("St. Louis,  MO") == "saint louis mo"
+    assert GeocodeCache.normalize("São Paulo") == "sao paulo"
+    print("✓ Spellings share one geocode")
+
+def test_ambiguous_short_names_keep_first_place():
+    """A later 'Paris, TX' does not take over the plain 'paris' alias."""
+    cache = GeocodeCache(cache_file())
+    cache.add("paris", "Paris, France", 48.8566, 2.3522)
+    cache.add("paris tx", "Paris, TX, USA", 33.6609, -95.5555)
+    assert cache.lookup("Paris").address == "Paris, France"
+    assert cache.lookup("Paris, TX").address == "Paris, TX, USA"
+    print("✓ Ambiguous names keep their first place")
+
+def test_specific_queries_do_not_claim_bare_names():
+    """Resolving 'Paris, TX' or 'London, ON' first leaves 'paris' and 'london' unanswered."""
+    cache = GeocodeCache(cache_file())
+    cache.add("Paris, TX", "Paris, TX, USA", 33.6609, -95.5555)
+    cache.add("london ontario", "London, ON, Canada", 42.9849, -81.2453)
+    assert cache.lookup("paris") is None and cache.lookup("London") is None
+    assert cache.lookup("paris, tx, usa").address == "Paris, TX, USA"
+    assert cache.lookup("London, ON").address == "London, ON, Canada"
+    cache.add("paris", "Paris, France", 48.8566, 2.3522)
+    assert cache.lookup("Paris").address == "Paris, France"
+    assert cache.lookup("Paris, TX").address == "Paris, TX, USA"
+    print("✓ Specific queries leave bare names alone")
+
+def test_bounded_expiring_and_persistent():
+    """Old places expire, the LRU place is evicted, and entries survive restarts."""
+    now = [1_700_000_000.0]
+    path = cache_file()
+    cache = GeocodeCache(path, max_entries=2, ttl=100, clock=lambda: now[0])
+    cache.add("london", "London, UK", 51.5072, -0.1276)
+    cache.add("oslo", "Oslo, Norway", 59.9139, 10.7522)
+    cache.lookup("london")
+    cache.add("rome", "Rome, Italy", 41.9028, 12.4964)
+    assert cache.lookup("oslo") is None and cache.lookup("london") is not None
+
+    reloaded = GeocodeCache(path, max_entries=2, ttl=100, clock=lambda: now[0])
+    assert reloaded.lookup("rome").lat == 41.9028
+    now[0] += 101
+    assert reloaded.lookup("rome") is None
+    print("✓ Geocodes bounded, expiring and persisted")
+
+def weather_manager(server, keys):
+    with open("api_keys.json", "w") as f:
+        json.dump({key: "fixture" for key in keys}, f)
+    import main
+    import http_session
+    api = main.WebAPIManager(base_urls={p: server.url for p in http_session.API_BASE_URLS})
+    api.prefetcher.stop()
+    return api
+
+def test_weather_spellings_share_one_fetch():
+    """'New York' then 'new york, ny' fetch the weather once, with or without a geocoding key."""
+    from fixture_server import FixtureServer
+    cwd = os.getcwd()
+    try:
+        os.chdir(tempfile.mkdtemp())
+        with FixtureServer() as server:
+            api = weather_manager(server, ["openweathermap", "google_maps"])
+            first = api.get_weather("New York")
+            assert first.startswith("Weather in New York")
+            assert api.get_weather("new york, ny") == first
+            assert api.get_weather("NYC") == first
+            assert server.requests == {"google_maps": 1, "openweathermap": 1}
+
+        os.chdir(tempfile.mkdtemp())
+        with FixtureServer() as server:
+            # The weather API's own answer files the place under its coordinates
+            api = weather_manager(server, ["openweathermap"])
+            first = api.get_weather("New York")
+            assert api.get_weather("new york, us") == first
+            assert server.requests == {"openweathermap": 1}
+    finally:
+        os.chdir(cwd)
+    print("✓ Weather spellings share one fetch")
+
+if __name__ == "__main__":
+    test_spellings_share_one_lookup()
+    test_ambiguous_short_names_keep_first_place()
+    test_specific_queries_do_not_claim_bare_names()
+    test_bounded_expiring_and_persistent()
+    test_weather_spellings_share_one_fetch()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled HTTP session.
+"""
+
+import sys
+import os
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from http_session import HTTPClient
+
+class GzipJSONHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode()
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GzipJSONHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_connections_are_reused():
+    """Repeated calls to one host share a warm keep-alive connection."""
+    server = start_server()
+    client = HTTPClient(timeout=5)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}"
+        for i in range(5):
+            response = client.get(f"{url}/weather", params={"q": i})
+            assert response.json() == {"path": f"/weather?q={i}"}
+        assert response.headers["Content-Encoding"] == "gzip"
+        stats = client.pool_stats()[f"127.0.0.1:{server.server_port}"]
+        assert stats["requests"] == 5 and stats["connections_opened"] == 1 and stats["reused"] == 4
+        print("✓ Connections reused and gzip decoded")
+    finally:
+        client.close()
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_connections_are_reused()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent input pre-processing stage.
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from input_pipeline import InputPreprocessor
+from language_detector import LanguageDetector
+
+DELAY = 0.2
+
+def slow_detect(text):
+    time.sleep(DELAY)
+    return "fr"
+
+def slow_translate(text, target="en", source="auto"):
+    time.sleep(DELAY)
+    return "open the news"
+
+def classify(text):
+    return "open" if text.startswith("open ") else None
+
+def no_memory(text):
+    return None
+
+def make_preprocessor():
+    return InputPreprocessor(LanguageDetector(), slow_detect, slow_translate, classify, no_memory)
+
+def test_english_skips_network():
+    """Confident English input never touches the remote services."""
+    pre = make_preprocessor()
+    start = time.perf_counter()
+    result = pre.run("open youtube")
+    assert time.perf_counter() - start < DELAY / 2
+    assert result.language == "en" and result.intent == "open" and result.path == "local-en"
+    print("✓ English input handled locally")
+
+def test_ambiguous_runs_concurrently():
+    """Remote detection and translation overlap instead of adding up."""
+    pre = make_preprocessor()
+    start = time.perf_counter()
+    result = pre.run("café")
+    elapsed = time.perf_counter() - start
+    assert elapsed < DELAY * 1.8, f"took {elapsed:.2f}s"
+    assert result.language == "fr" and result.text == "open the news"
+    assert result.intent == "open" and result.path == "remote-translate"
+    print("✓ Ambiguous input pre-processed concurrently")
+
+def test_local_intent_cancels_speculation():
+    """A raw English command wins without waiting for remote detection."""
+    pre = make_preprocessor()
+    start = time.perf_counter()
+    result = pre.run("open résumé.pdf")
+    assert time.perf_counter() - start < DELAY / 2
+    assert result.path == "speculative-en" and result.intent == "open"
+    print("✓ Speculative work cancelled")
+
+if __name__ == "__main__":
+    test_english_skips_network()
+    test_ambiguous_runs_concurrently()
+    test_local_intent_cancels_speculation()
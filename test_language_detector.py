@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline language detector.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from language_detector import LanguageDetector
+
+def test_english_commands_are_local():
+    """Plain English commands never need the remote service."""
+    detector = LanguageDetector()
+    for text in ["open chrome", "weather in london", "youtube", "send whatsapp hello to mom", "42"]:
+        detection = detector.detect(text)
+        assert detection.language == "en", f"{text!r} detected as {detection.language}"
+        assert detector.is_confident(detection), f"{text!r} was not confident"
+    print("✓ English commands detected locally")
+
+def test_scripts():
+    """Non-Latin scripts are identified from the characters alone."""
+    detector = LanguageDetector()
+    cases = {
+        "मौसम कैसा है": "hi",
+        "آج موسم کیسا ہے": "ur",
+        "ما هي الأخبار اليوم": "ar",
+        "привет как дела": "ru",
+        "今日の天気は": "ja",
+        "今天天气怎么样": "zh",
+    }
+    for text, expected in cases.items():
+        detection = detector.detect(text)
+        assert detection.language == expected, f"{text!r} detected as {detection.language}"
+        assert detector.is_confident(detection)
+    print("✓ Scripts identified")
+
+def test_latin_languages():
+    """Latin-script languages are separated by n-gram profiles."""
+    detector = LanguageDetector()
+    cases = {
+        "¿cómo estás? abre el navegador": "es",
+        "ouvre le navigateur s'il te plaît": "fr",
+        "öffne den Browser bitte": "de",
+        "apri il browser per favore": "it",
+        "abra o navegador por favor": "pt",
+    }
+    for text, expected in cases.items():
+        assert detector.detect(text).language == expected, text
+    print("✓ Latin-script languages identified")
+
+def test_ambiguous_input_escalates():
+    """Short accented words and ASCII without English words are left to the remote detector."""
+    detector = LanguageDetector()
+    assert not detector.is_confident(detector.detect("café"))
+    for text in ["gracias amigo", "merci beaucoup", "guten morgen", "aaj mausam kaisa hai", "kya haal hai"]:
+        assert not detector.is_confident(detector.detect(text)), text
+    print("✓ Ambiguous input escalates")
+
+if __name__ == "__main__":
+    test_english_commands_are_local()
+    test_scripts()
+    test_latin_languages()
+    test_ambiguous_input_escalates()
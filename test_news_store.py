@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the headline store and conditional news fetching.
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import http_session
+from fixture_server import FixtureServer
+from news_store import HeadlineStore, headline_key, title_key
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def article(title, url=None, published="2026-10-19T08:00:00Z"):
+    return {"title": title, "url": url, "publishedAt": published, "source": {"name": "Wire"}}
+
+def test_headlines_deduplicated_by_url_and_title():
+    """Query strings and republished titles do not count as new stories."""
+    assert headline_key(article("A", "https://News.example.com/story/1/?utm=x")) == "url:news.example.com/story/1"
+    assert title_key("Rates Rise Again - Reuters") == title_key("rates rise again!")
+
+    store = HeadlineStore(os.path.join(tempfile.mkdtemp(), "headlines.json"), clock=FakeClock())
+    added = store.update("general|us", [article("Rates rise again", "https://a.example/1"),
+                                        article("Storm hits coast", "https://a.example/2")])
+    assert len(added) == 2
+    added = store.update("general|us", [article("Rates rise again", "https://a.example/1?ref=home"),
+                                        article("Rates Rise Again - Reuters", "https://b.example/9"),
+                                        article("Markets calm", "https://a.example/3")])
+    assert [h["title"] for h in added] == ["Markets calm"]
+    assert [h["title"] for h in store.current("general|us")] == ["Rates rise again", "Markets calm"]
+    print("✓ Headlines deduplicated")
+
+def test_unseen_since_last_check():
+    """Each check returns only headlines stored after the previous one, and the state persists."""
+    path = os.path.join(tempfile.mkdtemp(), "headlines.json")
+    clock = FakeClock()
+    store = HeadlineStore(path, clock=clock)
+    store.update("tech|us", [article("One", "https://x/1"), article("Two", "https://x/2")], etag='"v1"')
+    fresh, seen_at = store.unseen("tech|us")
+    assert len(fresh) == 2 and seen_at == 0
+
+    clock.now += 60
+    store.update("tech|us", [article("Two", "https://x/2"), article("Three", "https://x/3")])
+    reloaded = HeadlineStore(path, clock=clock)
+    fresh, seen_at = reloaded.unseen("tech|us")
+    assert [h["title"] for h in fresh] == ["Three"] and seen_at == 1000.0
+    assert reloaded.unseen("tech|us")[0] == []
+    print("✓ Only unseen headlines returned")
+
+def test_manager_fetches_conditionally():
+    """A refetch of an unchanged feed gets an empty 304 and reuses the stored headlines."""
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    statuses = []
+    original_get = http_session.get
+
+    def recording_get(url, **kwargs):
+        response = original_get(url, **kwargs)
+        statuses.append(response.status_code)
+        return response
+
+    try:
+        with open("api_keys.json", "w") as f:
+            json.dump({"news_api": "fixture"}, f)
+        import main
+        with FixtureServer() as server:
+            api = main.WebAPIManager(base_urls={p: server.url for p in http_session.API_BASE_URLS})
+            api.prefetcher.stop()
+            http_session.get = recording_get
+            summary = api.get_news("technology")
+            assert summary.startswith("Top technology news:\n1. ")
+            assert api.get_news_updates("technology").startswith("New technology headlines:\n")
+
+            api._fetch_news("technology", "us")
+            assert statuses == [200, 304]
+            assert api.get_news("technology") == summary
+            assert api.get_news_updates("technology").startswith("No new technology headlines since ")
+    finally:
+        http_session.get = original_get
+        os.chdir(cwd)
+    print("✓ Unchanged feeds are not downloaded again")
+
+if __name__ == "__main__":
+    test_headlines_deduplicated_by_url_and_title()
+    test_unseen_since_last_check()
+    test_manager_fetches_conditionally()
+    print("\nAll news store tests passed!")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for lazily loaded command plugins.
+"""
+
+import sys
+import os
+import ast
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from command_router import CommandRouter
+from plugin_registry import register_plugins
+
+class FakeAPI:
+    def get_weather(self, location):
+        return f"Weather in {location}: 20°C"
+
+    def get_news(self, category="general", country="us"):
+        return f"Top {category} news"
+
+    def get_news_updates(self, category="general", country="us"):
+        return f"New {category} headlines"
+
+def make_app():
+    api = FakeAPI()
+    return SimpleNamespace(
+        get_api_manager=lambda: api,
+        find_web_app=lambda name: ("youtube", "https://youtube.com") if name == "youtube" else None,
+        open_app=lambda name: f"Opened {name}.",
+        handle_terminal_commands=lambda command: f"terminal: {command}",
+        install_package=lambda package: f"installed {package}",
+        create_file=lambda name, file_type="txt", overwrite=False: f"{'overwrote' if overwrite else 'created'} {name}",
+    )
+
+def test_plugins_load_on_first_use():
+    """Registering plugins does not import them; routing to one does."""
+    for name in list(sys.modules):
+        if name.startswith("plugins"):
+            del sys.modules[name]
+    router = CommandRouter()
+    handlers = register_plugins(router, make_app())
+    assert "plugins.weather" not in sys.modules and not handlers["weather"].loaded
+
+    route = router.route("weather in paris")
+    assert route.name == "weather"
+    assert route.handler(route.argument, route) == "Weather in paris: 20°C"
+    assert "plugins.weather" in sys.modules and handlers["weather"].loaded
+    assert "plugins.terminal" not in sys.modules
+    print("✓ Plugins are imported on first use")
+
+def test_plugin_routing():
+    """Plugin triggers route to the right handlers."""
+    router = CommandRouter()
+    register_plugins(router, make_app())
+
+    route = router.route("sports news")
+    assert route.handler("sports news", route) == "Top sports news"
+    route = router.route("what's new in technology news")
+    assert route.handler("what's new in technology news", route) == "New technology headlines"
+    assert router.route("any new headlines").name == "news_updates"
+    assert router.route("what's new?").name == "news_updates"
+    route = router.route("open youtube")
+    assert route.handler("open youtube", route) == "Opened Youtube in your browser."
+    route = router.route("open terminal")
+    assert route.name == "terminal"
+    route = router.route("pip install requests==2.31")
+    assert route.handler("pip install requests==2.31", route) == "installed requests==2.31"
+    route = router.route("overwrite file main.py")
+    assert route.handler("overwrite file main.py", route) == "overwrote main.py"
+    route = router.route("what is the weather in london like for a picnic?")
+    assert route.groups["location"] == "london"
+    assert router.route("weather in new york, ny today").groups["location"] == "new york, ny"
+    assert router.route("update system").name == "terminal"
+    assert router.route("show me the technology news").groups == {"category": "technology"}
+    assert router.route("create html file index").groups == {"verb": "create", "type": "html", "name": "index"}
+    assert router.route("run workflow morning").name == "workflows"
+    route = router.route("daily briefing for paris")
+    assert route.name == "briefing" and route.groups["location"] == "paris"
+    assert router.route("give me my morning briefing").name == "briefing"
+    print("✓ Plugin commands routed")
+
+def test_questions_are_not_commands():
+    """Chat that merely mentions a command word is left for the LLM."""
+    router = CommandRouter()
+    register_plugins(router, make_app())
+    for text in ("what is a briefing?", "write a briefing on climate", "tell me some good news", "explain the headlines format in css",
+                 "how do i update system drivers in powershell", "is the command prompt safe to use",
+                 "what's new in python 3.12", "any new ideas for dinner", "anything new about the new headlines api?",
+                 "how do i create a file in python", "can you explain how to create an html file for my site",
+                 "install the latest version of node on ubuntu", "install instructions for docker please"):
+        assert router.route(text) is None, text
+    print("✓ Questions not routed to commands")
+
+def test_create_file_keeps_existing_files():
+    """create_file refuses to replace a file unless asked to overwrite it."""
+    import tempfile
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        import main
+        assert main.create_file("notes", "first") == "Created notes.txt successfully."
+        assert "already exists" in main.create_file("notes", "second")
+        with open("notes.txt", encoding="utf-8") as f:
+            assert f.read() == "first"
+        assert main.create_file("notes", "second", overwrite=True) == "Created notes.txt successfully."
+    finally:
+        os.chdir(cwd)
+    print("✓ Existing files kept")
+
+def test_main_has_no_heavy_top_level_imports():
+    """Voice and ML stacks are imported inside the functions that need them."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    top_level = set()
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            top_level.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            top_level.add(node.module)
+    assert not top_level & {"whisper", "pyttsx3", "speech_recognition", "numpy"}
+    print("✓ main.py defers heavy imports")
+
+if __name__ == "__main__":
+    test_plugins_load_on_first_use()
+    test_plugin_routing()
+    test_questions_are_not_commands()
+    test_create_file_keeps_existing_files()
+    test_main_has_no_heavy_top_level_imports()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the background prefetch scheduler.
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from prefetch import QueryStats, Prefetcher
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+class FakeAPI:
+    CACHE_TTLS = {"weather": (300, 900), "news": (600, 1800)}
+
+    def __init__(self):
+        self.remaining = {}
+        self.refreshed = []
+
+    def cache_remaining(self, kind, key):
+        return self.remaining.get((kind, key))
+
+    def refresh(self, kind, key):
+        self.refreshed.append((kind, key))
+        self.remaining[(kind, key)] = self.CACHE_TTLS[kind][0]
+
+def stats_file():
+    return os.path.join(tempfile.mkdtemp(), "prefetch_stats.json")
+
+def test_hot_queries_ranked_and_decay():
+    """Frequent recent queries rank first; old ones fade out."""
+    clock = FakeClock()
+    stats = QueryStats(stats_file(), half_life=86400, clock=clock)
+    for _ in range(5):
+        stats.record("weather", ("london",))
+    for _ in range(3):
+        stats.record("news", ("technology", "us"))
+    stats.record("weather", ("oslo",))
+    assert stats.top(10) == [("weather", ("london",)), ("news", ("technology", "us"))]
+
+    clock.now += 2 * 86400  # two half-lives: london 1.25, news 0.75
+    for _ in range(3):
+        stats.record("news", ("technology", "us"))
+    assert stats.top(10) == [("news", ("technology", "us"))]
+    print("✓ Hot queries ranked with decay")
+
+def test_prefetches_only_hot_expiring_queries():
+    """Cold or nearly expired hot queries are refreshed, within the cycle limit."""
+    stats = QueryStats(stats_file(), clock=FakeClock())
+    for query in [("weather", ("london",)), ("weather", ("paris",)), ("news", ("general", "us"))]:
+        for _ in range(3):
+            stats.record(*query)
+    api = FakeAPI()
+    api.remaining[("weather", ("london",))] = 250   # fresh for a while
+    api.remaining[("weather", ("paris",))] = 30     # within 20% of its TTL
+    prefetcher = Prefetcher(api, stats, max_per_cycle=5, spacing=0)
+    assert prefetcher.run_once() == 2
+    assert sorted(api.refreshed) == [("news", ("general", "us")), ("weather", ("paris",))]
+    assert prefetcher.run_once() == 0
+
+    limited = Prefetcher(FakeAPI(), stats, max_per_cycle=1, spacing=0)
+    assert limited.run_once() == 1
+    print("✓ Only hot, expiring queries prefetched")
+
+def test_stats_persist():
+    """Learned queries survive a restart."""
+    path, clock = stats_file(), FakeClock()
+    stats = QueryStats(path, clock=clock)
+    for _ in range(4):
+        stats.record("weather", ("karachi",))
+    stats.save()
+    assert QueryStats(path, clock=clock).top(5) == [("weather", ("karachi",))]
+    print("✓ Query stats persisted")
+
+def test_restarted_manager_uses_stored_answers():
+    """After a restart, fresh answers in the response store are not prefetched again."""
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        with open("api_keys.json", "w") as f:
+            json.dump({"news_api": "fixture"}, f)
+        import main
+        import http_session
+        from fixture_server import FixtureServer
+        with FixtureServer() as server:
+            base_urls = {p: server.url for p in http_session.API_BASE_URLS}
+            api = main.WebAPIManager(base_urls=base_urls)
+            api.prefetcher.stop()
+            for _ in range(3):
+                api.get_news("technology")
+            api.prefetcher.stats.save()
+
+            restarted = main.WebAPIManager(base_urls=base_urls)
+            restarted.prefetcher.stop()
+            assert restarted.cache_remaining("news", ("technology", "us")) > 500
+            assert restarted.prefetcher.due() == []
+            assert restarted.refresh("news", ("technology", "us"))[0]["title"]
+            assert server.requests == {"news_api": 1}
+    finally:
+        os.chdir(cwd)
+    print("✓ Stored answers keep a restart warm")
+
+if __name__ == "__main__":
+    test_hot_queries_ranked_and_decay()
+    test_prefetches_only_hot_expiring_queries()
+    test_stats_persist()
+    test_restarted_manager_uses_stored_answers()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the prompt assembly layer and prefix-cache accounting.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from prompt_builder import PromptBuilder, SHORT_ANSWER_HINT, command_list
+from plugin_registry import PLUGINS
+import deepseek_api
+
+def test_prefix_is_stable():
+    """The system prompt must be byte-identical across turns."""
+    with tempfile.TemporaryDirectory() as tmp:
+        persona_file = os.path.join(tmp, "buddy_memory.json")
+        with open(persona_file, "w") as f:
+            json.dump({"name": "Qavi", "history": [{"input": "hi"}]}, f)
+
+        builder = PromptBuilder(persona_file=persona_file)
+        system_a, user_a = builder.build("what is ai", SHORT_ANSWER_HINT)
+        system_b, user_b = builder.build("tell me a joke")
+
+        assert system_a == system_b, "Prefix changed between turns"
+        assert "Qavi" in system_a, "Persona missing from prefix"
+        assert "- history:" not in system_a, "Volatile history leaked into prefix"
+        assert user_a.startswith("what is ai") and user_a.endswith(SHORT_ANSWER_HINT)
+        assert user_b == "tell me a joke"
+    print("✓ Static prefix is stable and variable content comes last")
+
+def test_cache_usage_recorded():
+    """Cache-hit tokens are read from both response formats."""
+    usage = deepseek_api.record_usage({"prompt_tokens": 120, "prompt_cache_hit_tokens": 100, "prompt_cache_miss_tokens": 20})
+    assert usage["cache_hit_tokens"] == 100 and usage["cache_miss_tokens"] == 20
+
+    usage = deepseek_api.record_usage({"prompt_tokens": 50, "prompt_tokens_details": {"cached_tokens": 32}})
+    assert usage["cache_hit_tokens"] == 32 and usage["cache_miss_tokens"] == 18
+
+    stats = deepseek_api.get_cache_stats()
+    assert stats["cache_hit_tokens"] >= 132
+    assert 0 < stats["cache_hit_ratio"] <= 1
+    print("✓ Cache-hit tokens recorded")
+
+def test_commands_match_plugins():
+    """The prefix lists every plugin command, in a stable order."""
+    builder = PromptBuilder(persona_file=os.path.join(tempfile.mkdtemp(), "none.json"))
+    prefix = builder.system_prompt()
+    for spec in PLUGINS:
+        assert f"- {spec.description}\n" in prefix + "\n", spec.name
+    assert "- send whatsapp <message> to <contact or number>" in prefix
+    assert command_list() == sorted(command_list())
+    assert PromptBuilder(persona_file=builder.persona_file).system_prompt() == prefix
+    print("✓ Commands listed from the plugins")
+
+def test_usage_counted_across_threads():
+    """Concurrent calls do not lose token counts, and api status shows them."""
+    before = deepseek_api.get_cache_stats()
+    def record():
+        for _ in range(500):
+            deepseek_api.record_usage({"prompt_tokens": 10, "prompt_cache_hit_tokens": 4, "completion_tokens": 1})
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    after = deepseek_api.get_cache_stats()
+    assert after["requests"] - before["requests"] == 2000
+    assert after["prompt_tokens"] - before["prompt_tokens"] == 20000
+
+    from plugins import status
+    app = SimpleNamespace(
+        search_client=SimpleNamespace(stats=lambda: {"entries": 0, "hits": 0, "negative_hits": 0, "fetches": 0, "timeouts": 0}),
+        get_api_manager=lambda: SimpleNamespace(usage_status=lambda: "API usage today:"),
+        get_cache_stats=deepseek_api.get_cache_stats,
+    )
+    assert f"AI: {after['requests']} requests" in status.handle(app, "api status", None)
+    print("✓ Usage counted across threads")
+
+if __name__ == "__main__":
+    test_prefix_is_stable()
+    test_cache_usage_recorded()
+    test_commands_match_plugins()
+    test_usage_counted_across_threads()
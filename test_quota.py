@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for API quota tracking and rate limiting.
+"""
+
+import sys
+import os
+import tempfile
+import multiprocessing
+from datetime import date
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from quota import QuotaTracker, QuotaExceeded, TokenBucket
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+def usage_file():
+    return os.path.join(tempfile.mkdtemp(), "api_usage.json")
+
+def test_token_bucket():
+    """A burst is allowed, then calls are spaced at the refill rate."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=clock)
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == 0.5
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0.0
+    print("✓ Token bucket limits bursts")
+
+def test_rate_limit_waits_then_refuses():
+    """Short waits are absorbed; long ones raise instead of blocking."""
+    clock = FakeClock()
+    limits = {"news_api": {"rate": 1.0, "burst": 2, "daily": 100}}
+    tracker = QuotaTracker(usage_file(), limits, max_wait=1.5, clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        tracker.acquire("news_api")
+    assert clock.now == 1.0
+    slow = QuotaTracker(usage_file(), {"news_api": {"rate": 0.1, "burst": 1}}, max_wait=1.0,
+                        clock=clock, sleep=clock.sleep)
+    slow.acquire("news_api")
+    try:
+        slow.acquire("news_api")
+        assert False, "expected QuotaExceeded"
+    except QuotaExceeded:
+        pass
+    print("✓ Rate limiter waits briefly, then refuses")
+
+def test_daily_quota_persisted():
+    """Daily counts survive restarts, reset the next day and flag near exhaustion."""
+    path, clock = usage_file(), FakeClock()
+    day = [date(2026, 10, 19)]
+    limits = {"news_api": {"rate": 100.0, "burst": 100, "daily": 10}}
+    tracker = QuotaTracker(path, limits, clock=clock, today=lambda: day[0], sleep=clock.sleep)
+    for _ in range(9):
+        tracker.acquire("news_api")
+    assert tracker.near_exhaustion("news_api")
+
+    restarted = QuotaTracker(path, limits, clock=clock, today=lambda: day[0], sleep=clock.sleep)
+    assert restarted.used_today("news_api") == 9
+    restarted.acquire("news_api")
+    try:
+        restarted.acquire("news_api")
+        assert False, "expected QuotaExceeded"
+    except QuotaExceeded as e:
+        assert "quota of 10 calls" in str(e)
+    assert "news_api: 10/10 (near limit" in restarted.status_report()
+
+    day[0] = date(2026, 10, 20)
+    assert restarted.used_today("news_api") == 0 and not restarted.near_exhaustion("news_api")
+    restarted.acquire("news_api")
+    print("✓ Daily quota persisted and reset")
+
+def count_calls(path, calls):
+    tracker = QuotaTracker(path, {"news_api": {"rate": 1000.0, "burst": 1000, "daily": 1000}})
+    for _ in range(calls):
+        tracker.acquire("news_api")
+
+def test_processes_share_one_count():
+    """Buddy processes sharing a usage file never lose each other's calls."""
+    path = usage_file()
+    workers = [multiprocessing.Process(target=count_calls, args=(path, 25)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert QuotaTracker(path).used_today("news_api") == 100
+    assert not os.path.exists(f"{path}.tmp")
+    print("✓ Processes share one usage count")
+
+def test_keyless_rates_use_no_quota():
+    """The free exchange-rate fallback does not count against the currency_api quota."""
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        import main
+        import http_session
+        from fixture_server import FixtureServer
+        with FixtureServer() as server:
+            api = main.WebAPIManager(base_urls={p: server.url for p in http_session.API_BASE_URLS})
+            api.prefetcher.stop()
+            assert "1 USD" in api.get_currency_rate("USD", "EUR")
+            assert server.requests == {"exchangerate_api": 1}
+            assert api.quota.used_today("currency_api") == 0
+    finally:
+        os.chdir(cwd)
+    print("✓ Keyless rates use no quota")
+
+if __name__ == "__main__":
+    test_token_bucket()
+    test_rate_limit_waits_then_refuses()
+    test_daily_quota_persisted()
+    test_processes_share_one_count()
+    test_keyless_rates_use_no_quota()
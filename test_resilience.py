@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the circuit breakers guarding external services.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from resilience import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN, guarded, get_breaker
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def failing():
+    raise ConnectionError("service down")
+
+def test_breaker_opens_and_recovers():
+    """Consecutive failures open the breaker; a successful probe closes it."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10, clock=clock)
+    for _ in range(2):
+        try:
+            breaker.call(failing)
+        except ConnectionError:
+            pass
+    assert breaker.state == OPEN
+
+    try:
+        breaker.call(lambda: "ok")
+        assert False, "call should have been rejected"
+    except CircuitOpenError:
+        pass
+
+    clock.now = 11
+    assert breaker.allow_request() and breaker.state == HALF_OPEN
+    assert not breaker.allow_request(), "only one probe may run at a time"
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    print("✓ Breaker opens and recovers")
+
+def test_failed_probe_reopens():
+    """A failing half-open probe re-opens the breaker."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=5, clock=clock)
+    try:
+        breaker.call(failing)
+    except ConnectionError:
+        pass
+    clock.now = 6
+    try:
+        breaker.call(failing)
+    except ConnectionError:
+        pass
+    assert breaker.state == OPEN and breaker.opened_at == 6
+    print("✓ Failed probe re-opens breaker")
+
+def test_guarded_fallback():
+    """Guarded functions return their fallback instead of raising."""
+    calls = []
+
+    @guarded("test-guarded", fallback=lambda text: text)
+    def translate(text):
+        calls.append(text)
+        raise TimeoutError("slow")
+
+    for _ in range(5):
+        assert translate("hola") == "hola"
+    threshold = get_breaker("test-guarded").failure_threshold
+    assert len(calls) == threshold, "open breaker should skip the dependency"
+    print("✓ Guarded fallback served")
+
+if __name__ == "__main__":
+    test_breaker_opens_and_recovers()
+    test_failed_probe_reopens()
+    test_guarded_fallback()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent SQLite API response store.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import subprocess
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from response_store import ResponseStore
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+def temp_db():
+    return os.path.join(tempfile.mkdtemp(), "api_cache.db")
+
+def test_round_trip_and_expiry():
+    """Payloads survive a new store instance and expire after the stale window."""
+    path, clock = temp_db(), FakeClock()
+    key = ResponseStore.make_key("weather", ("  New   York",))
+    assert key == "weather:new york"
+    ResponseStore(path, clock=clock).put(key, "weather", {"temperature": "20°C"}, ttl=300, stale_ttl=600)
+
+    store = ResponseStore(path, clock=clock)
+    stored = store.get(key)
+    assert stored.payload == {"temperature": "20°C"} and stored.is_fresh(clock())
+    clock.now += 400
+    assert not store.get(key).is_fresh(clock()) and store.get(key).age(clock()) == 400
+    clock.now += 600
+    assert store.get(key) is None
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    print("✓ Responses persisted and expired")
+
+def test_compaction_caps_size():
+    """Compaction drops dead entries and then the oldest ones."""
+    clock = FakeClock()
+    store = ResponseStore(temp_db(), max_entries=3, compact_every=0, clock=clock)
+    store.put("dead", "news", [], ttl=1)
+    for i in range(5):
+        clock.now += 10
+        store.put(f"news:{i}", "news", [i], ttl=600)
+    assert store.compact() == 3
+    assert store.stats()["entries"] == 3
+    assert store.get("news:0") is None and store.get("news:4").payload == [4]
+    print("✓ Compaction enforces the size cap")
+
+def test_concurrent_writers():
+    """Threads and a second process can write the same database."""
+    path = temp_db()
+    store = ResponseStore(path)
+    store.put("warm", "news", [], ttl=60)
+    code = (f"import sys; sys.path.insert(0, {os.path.dirname(os.path.abspath(__file__))!r}); "
+            f"from response_store import ResponseStore; s = ResponseStore({path!r}); "
+            f"[s.put(f'proc:{{i}}', 'news', [i], ttl=60) for i in range(200)]")
+    process = subprocess.Popen([sys.executable, "-c", code])
+
+    def write(prefix):
+        for i in range(200):
+            assert store.put(f"{prefix}:{i}", "weather", {"i": i}, ttl=60)
+    threads = [threading.Thread(target=write, args=(f"t{n}",)) for n in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert process.wait(timeout=30) == 0
+    assert store.stats()["entries"] == 801
+    print("✓ Concurrent writers share the store")
+
+if __name__ == "__main__":
+    test_round_trip_and_expiry()
+    test_compaction_caps_size()
+    test_concurrent_writers()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the email and WhatsApp command slot parser.
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from slot_parser import (parse_email_command, parse_whatsapp_command,
+                         format_email_command, format_whatsapp_command)
+
+def test_email_slots():
+    """Recipient, subject and body are extracted; missing sections are empty."""
+    slots = parse_email_command("send email to bob@example.com subject: Meeting body: see you at 5")
+    assert slots == {"recipient": "bob@example.com", "subject": "Meeting", "body": "see you at 5"}
+    assert parse_email_command("send email to bob@example.com body: hi")["body"] == "hi"
+    assert parse_email_command("send email to bob@example.com")["subject"] == ""
+    assert parse_email_command("open youtube") is None
+    print("✓ Email slots parsed")
+
+def test_whatsapp_recipient_is_last_to():
+    """Words like 'tomorrow' or an earlier 'to' do not split the message."""
+    slots = parse_whatsapp_command("send whatsapp see you tomorrow to mom")
+    assert slots["message"] == "see you tomorrow" and slots["recipient"] == "mom"
+    assert slots["phone"] == ""
+
+    slots = parse_whatsapp_command("send whatsapp I want to go to +1 (234) 567-8901")
+    assert slots["message"] == "I want to go"
+    assert slots["phone"] == "+12345678901"
+
+    slots = parse_whatsapp_command("send whatsapp tomorrow works")
+    assert slots["message"] == "tomorrow works" and slots["recipient"] == ""
+    print("✓ WhatsApp slots parsed")
+
+def test_round_trip():
+    """Commands built by the GUI parse back to the same fields."""
+    command = format_email_command("a@b.com", "Hello", "Long body text")
+    assert parse_email_command(command) == {"recipient": "a@b.com", "subject": "Hello", "body": "Long body text"}
+    command = format_whatsapp_command("hello", "+1234567890")
+    assert parse_whatsapp_command(command)["phone"] == "+1234567890"
+    print("✓ Round trip works")
+
+def test_long_body_is_linear():
+    """A very long dictated body parses quickly."""
+    body = "word " * 200000
+    start = time.perf_counter()
+    slots = parse_email_command("send email to a@b.com subject: s body: " + body)
+    assert time.perf_counter() - start < 0.5
+    assert len(slots["body"]) == len(body.strip())
+    print("✓ Long bodies parsed in linear time")
+
+def test_unknown_whatsapp_contact_is_refused():
+    """A name missing from the contacts never falls back to the default contact."""
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        import main
+        opened = []
+        real_open, main.webbrowser.open = main.webbrowser.open, opened.append
+        try:
+            reply = main.handle_whatsapp_command("send whatsapp see you at 5 to bob", None)
+            assert reply == "I don't have a number for bob. Use 'add contact bob <number>' to add one."
+            assert opened == []
+            main.handle_whatsapp_command("send whatsapp see you at 5 to dad", None)
+            assert opened[0].startswith("https://wa.me/+1234567891?")
+        finally:
+            main.webbrowser.open = real_open
+    finally:
+        os.chdir(cwd)
+    print("✓ Unknown WhatsApp contacts refused")
+
+if __name__ == "__main__":
+    test_email_slots()
+    test_whatsapp_recipient_is_last_to()
+    test_round_trip()
+    test_long_body_is_linear()
+    test_unknown_whatsapp_contact_is_refused()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for tracing spans and the Chrome trace exporter.
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import tracing
+from tracing import span, traced, propagate
+from command_result import StageTimer
+
+@traced()
+def fetch(city):
+    time.sleep(0.001)
+    return city.upper()
+
+def test_disabled_records_nothing():
+    """With tracing off, spans and decorators are pass-through."""
+    tracing.disable()
+    tracing.clear()
+    with span("handle_input") as s:
+        s.set(handler="weather")
+        assert fetch("paris") == "PARIS"
+    assert tracing.finished_spans() == []
+    print("✓ Disabled tracing records nothing")
+
+def test_nested_spans_and_threads():
+    """Spans nest through calls, stage timers and worker threads."""
+    tracing.enable()
+    tracing.clear()
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with span("handle_input", mode="text") as root:
+                StageTimer().run("weather", "handler", fetch, "paris")
+                executor.submit(propagate(fetch), "rome").result()
+                root.set(handler="weather")
+    finally:
+        tracing.disable()
+    spans = {s.name: s for s in tracing.finished_spans()}
+    root = spans["handle_input"]
+    assert root.parent_id is None and root.attributes == {"mode": "text", "handler": "weather"}
+    assert spans["handler"].parent_id == root.span_id
+    fetches = [s for s in tracing.finished_spans() if s.name == "fetch"]
+    assert {s.parent_id for s in fetches} == {spans["handler"].span_id, root.span_id}
+    print("✓ Spans nest across stages and threads")
+
+def test_chrome_trace_export():
+    """The exporter writes complete events a trace viewer can load."""
+    tracing.enable()
+    tracing.clear()
+    try:
+        with span("handle_input"):
+            try:
+                with span("translate", target="en"):
+                    raise ValueError("offline")
+            except ValueError:
+                pass
+    finally:
+        tracing.disable()
+    path = os.path.join(tempfile.mkdtemp(), "trace.json")
+    assert tracing.export_chrome_trace(path) == 2
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    assert [e["name"] for e in events] == ["handle_input", "translate"]
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    assert events[1]["args"]["error"] == "ValueError: offline"
+    print("✓ Chrome trace exported")
+
+if __name__ == "__main__":
+    test_disabled_records_nothing()
+    test_nested_spans_and_threads()
+    test_chrome_trace_export()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the persisted translation cache.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from translation_cache import TranslationCache
+
+def test_entries_persist_in_batches():
+    """Entries are written in batches and survive a restart."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, "translation_cache.json")
+        cache = TranslationCache(cache_file=cache_file, flush_every=2)
+        assert cache.get("ur", "en", "موسم کیسا ہے") is None
+        cache.put("ur", "en", "موسم کیسا ہے", "how is the weather")
+        assert cache.get("ur", "en", "  موسم   کیسا ہے ") == "how is the weather"
+        assert not os.path.exists(cache_file)
+        cache.put("ur", "en", "شکریہ", "thank you")
+        assert os.path.exists(cache_file) and not os.path.exists(cache_file + ".tmp")
+
+        cache.put("ur", "en", "سلام", "hello")
+        cache.flush()
+        restarted = TranslationCache(cache_file=cache_file)
+        assert restarted.get("ur", "en", "موسم کیسا ہے") == "how is the weather"
+        assert restarted.get("ur", "en", "سلام") == "hello"
+        stats = restarted.stats()
+        assert stats["hits"] == 2 and stats["hit_rate"] == 1.0 and stats["entries"] == 3
+    print("✓ Entries persisted in batches")
+
+def test_size_limit():
+    """The least recently used entries are evicted."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TranslationCache(cache_file=os.path.join(tmp, "cache.json"), max_entries=3)
+        for i in range(5):
+            cache.put("hi", "en", f"text {i}", f"translation {i}")
+        assert len(cache.entries) == 3
+        assert cache.get("hi", "en", "text 0") is None
+        assert cache.get("hi", "en", "text 4") == "translation 4"
+        cache.flush()
+    print("✓ Size limit enforced")
+
+if __name__ == "__main__":
+    test_entries_persist_in_batches()
+    test_size_limit()
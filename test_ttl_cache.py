@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the TTL cache used by WebAPIManager.
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ttl_cache import TTLCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+def test_fresh_hits_and_expiry():
+    """Fresh entries are served from memory; entries a day old are not."""
+    clock = FakeClock()
+    cache = TTLCache(clock=clock)
+    calls = []
+    loader = lambda: calls.append(1) or len(calls)
+    assert cache.get_or_load("weather", loader, ttl=300) == 1
+    assert cache.get_or_load("weather", loader, ttl=300) == 1
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        cache.get_or_load("weather", loader, ttl=300)
+    assert (time.perf_counter() - start) / 1000 < 0.0001
+
+    # One day and one second later: timedelta.seconds would have said 1s old
+    clock.now += 86401
+    assert cache.get_or_load("weather", loader, ttl=300) == 2
+    print("✓ Fresh hits served, old entries reloaded")
+
+def test_stale_while_revalidate():
+    """A stale entry is returned at once and refreshed in the background."""
+    clock = FakeClock()
+    cache = TTLCache(clock=clock)
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(2)
+        return f"v{len(calls)}"
+
+    cache.get_or_load("news", loader, ttl=10, stale_ttl=100)
+    clock.now += 20
+    assert cache.get_or_load("news", loader, ttl=10, stale_ttl=100) == "v1"
+    assert cache.get_or_load("news", loader, ttl=10, stale_ttl=100) == "v1"
+    release.set()
+    assert wait_for(lambda: cache.get("news") == "v2")
+    assert len(calls) == 2 and cache.stats()["stale_hits"] == 2
+    print("✓ Stale entries served while refreshing once")
+
+def test_errors_not_cached_and_lru():
+    """Failed loads propagate; the least recently used entry is evicted."""
+    cache = TTLCache(max_entries=2, clock=FakeClock())
+
+    def broken():
+        raise ConnectionError("offline")
+    try:
+        cache.get_or_load("a", broken, ttl=10)
+        assert False, "expected ConnectionError"
+    except ConnectionError:
+        pass
+    assert cache.get("a") is None
+
+    cache.put("a", 1, ttl=10)
+    cache.put("b", 2, ttl=10)
+    cache.get("a")
+    cache.put("c", 3, ttl=10)
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+    print("✓ Errors not cached, LRU eviction works")
+
+def test_concurrent_misses_share_one_load():
+    """Simultaneous misses for one key call the loader once."""
+    cache = TTLCache()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return "paris"
+
+    threads = [threading.Thread(target=cache.get_or_load, args=("geo", loader, 60)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    print("✓ Concurrent misses coalesced")
+
+if __name__ == "__main__":
+    test_fresh_hits_and_expiry()
+    test_stale_while_revalidate()
+    test_errors_not_cached_and_lru()
+    test_concurrent_misses_share_one_load()
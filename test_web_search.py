@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached, time-bounded web search client.
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from response_store import ResponseStore
+from web_search import SearchClient
+
+class FakeSearch:
+    def __init__(self, answers, delay=0.0):
+        self.answers = answers
+        self.delay = delay
+        self.queries = []
+        self.lock = threading.Lock()
+
+    def __call__(self, query):
+        with self.lock:
+            self.queries.append(query)
+        time.sleep(self.delay)
+        if query == "boom":
+            raise ValueError("bad response")
+        return self.answers.get(query.lower())
+
+def test_normalized_and_negative_caching():
+    """Spellings share an entry, 'nothing found' is cached, failures are not."""
+    fetch = FakeSearch({"python": "Python is a language."})
+    client = SearchClient(fetch, breaker="test-search-cache")
+    assert client.lookup("Python") == "Python is a language."
+    assert client.lookup("  python!! ") == "Python is a language."
+    assert client.lookup("no such app") is None
+    assert client.lookup("No Such App") is None
+    assert client.lookup("boom") is None and client.lookup("boom") is None
+    assert fetch.queries == ["Python", "no such app", "boom", "boom"]
+    stats = client.stats()
+    assert stats["hits"] == 1 and stats["negative_hits"] == 1 and stats["errors"] == 2
+    print("✓ Searches cached, including misses")
+
+def test_deadline_and_speculative_search():
+    """A slow search returns None at the deadline but still fills the cache; overlapping lookups share it."""
+    fetch = FakeSearch({"slow": "Eventually.", "spotify download": "Spotify is a music app."}, delay=0.2)
+    client = SearchClient(fetch, deadline=0.05, breaker="test-search-deadline")
+    start = time.perf_counter()
+    assert client.lookup("slow") is None
+    assert time.perf_counter() - start < 0.15
+    time.sleep(0.25)
+    assert client.lookup("slow") == "Eventually."
+
+    client.search("spotify download")
+    time.sleep(0.1)
+    # Joins the request already in flight instead of starting another
+    assert client.lookup("Spotify download", deadline=1.0) == "Spotify is a music app."
+    assert fetch.queries == ["slow", "spotify download"]
+    print("✓ Deadline enforced, speculative search reused")
+
+def test_answers_persist_in_store():
+    """A new client starts from the answers an earlier one stored."""
+    store = ResponseStore(os.path.join(tempfile.mkdtemp(), "api_cache.db"))
+    fetch = FakeSearch({"python": "Python is a language."})
+    SearchClient(fetch, store=store, breaker="test-search-store").lookup("python")
+    SearchClient(fetch, store=store, breaker="test-search-store").lookup("unknown thing")
+    restarted = SearchClient(fetch, store=store, breaker="test-search-store")
+    assert restarted.lookup("PYTHON") == "Python is a language."
+    assert restarted.lookup("unknown thing") is None
+    assert fetch.queries == ["python", "unknown thing"]
+    print("✓ Search answers persisted")
+
+if __name__ == "__main__":
+    test_normalized_and_negative_caching()
+    test_deadline_and_speculative_search()
+    test_answers_persist_in_store()
+    print("\nAll web search tests passed!")
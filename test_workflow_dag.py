@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for workflows with step dependencies run in parallel.
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from workflow_dag import parse_steps, run_steps, steps_from_text, Step
+
+class SlowRunner:
+    """Runs 'sleep <seconds> <reply>' commands and tracks concurrency"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.order = []
+        self.lock = threading.Lock()
+
+    def __call__(self, step, command):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.order.append(step.id)
+        try:
+            _, seconds, reply = command.split(" ", 2)
+            time.sleep(float(seconds))
+            if reply == "boom":
+                raise RuntimeError("step blew up")
+            return reply
+        finally:
+            with self.lock:
+                self.active -= 1
+
+def test_parse_and_validate():
+    """Linear lists chain their steps; bad dependency graphs are rejected."""
+    steps = parse_steps(["a", "b", "c"])
+    assert [(s.id, s.after) for s in steps] == [("1", ()), ("2", ("1",)), ("3", ("2",))]
+    steps = parse_steps([{"id": "w", "command": "weather"}, "news", {"command": "x", "after": "w"}])
+    assert [(s.id, s.after) for s in steps] == [("w", ()), ("step2", ()), ("step3", ("w",))]
+    for bad in ([{"id": "a", "command": "x", "after": ["b"]}, {"id": "b", "command": "y", "after": ["a"]}],
+                [{"id": "a", "command": "x", "after": ["nope"]}],
+                [{"id": "a", "command": "x"}, {"id": "a", "command": "y"}]):
+        try:
+            parse_steps(bad)
+            assert False, bad
+        except ValueError:
+            pass
+
+    assert steps_from_text(["open youtube", " weather in paris "]) == ["open youtube", "weather in paris"]
+    assert steps_from_text(["w = weather in paris", "n = tech news", "remind me after lunch",
+                            "s = email me {w} {n} after w, n"]) == [
+        {"id": "w", "command": "weather in paris"},
+        {"id": "n", "command": "tech news"},
+        {"id": "step3", "command": "remind me after lunch"},
+        {"id": "s", "command": "email me {w} {n}", "after": ["w", "n"]},
+    ]
+    print("✓ Workflow steps parsed")
+
+def test_independent_steps_run_concurrently():
+    """Independent steps overlap, dependents get their results, and the cap is respected."""
+    steps = parse_steps([{"id": "a", "command": "sleep 0.2 sunny"},
+                         {"id": "b", "command": "sleep 0.2 headlines"},
+                         {"id": "c", "command": "sleep 0.2 opened"},
+                         {"id": "d", "command": "sleep 0 {a}+{b}", "after": ["a", "b"]}])
+    runner = SlowRunner()
+    start = time.perf_counter()
+    outcomes = run_steps(steps, runner, max_parallel=4)
+    assert time.perf_counter() - start < 0.35
+    assert runner.peak == 3 and runner.order[-1] == "d"
+    assert outcomes["d"].result == "sunny+headlines" and outcomes["d"].command == "sleep 0 sunny+headlines"
+
+    runner = SlowRunner()
+    start = time.perf_counter()
+    run_steps(steps, runner, max_parallel=2)
+    assert runner.peak == 2 and time.perf_counter() - start >= 0.4
+    print("✓ Independent steps run in parallel")
+
+def test_failures_skip_dependents_only_in_dags():
+    """A failed step skips its dependents; linear workflows carry on like before."""
+    steps = parse_steps([{"id": "a", "command": "sleep 0 boom"},
+                         {"id": "b", "command": "sleep 0 fine"},
+                         {"id": "c", "command": "sleep 0 never", "after": ["a"]},
+                         {"id": "d", "command": "sleep 0 never", "after": ["c"]}])
+    outcomes = run_steps(steps, SlowRunner())
+    assert {sid: o.status for sid, o in outcomes.items()} == {"a": "error", "b": "ok", "c": "skipped", "d": "skipped"}
+    assert outcomes["c"].result == "needs a"
+
+    runner = SlowRunner()
+    outcomes = run_steps(parse_steps(["sleep 0 boom", "sleep 0 next"]), runner, max_parallel=1, stop_dependents=False)
+    assert [outcomes[i].status for i in ("1", "2")] == ["error", "ok"] and runner.order == ["1", "2"]
+    print("✓ Failures handled")
+
+def test_manager_runs_dag_workflow():
+    """WorkflowManager runs declared steps concurrently and reports them in definition order."""
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        import main
+        original = main.handle_input
+        runner = SlowRunner()
+        main.handle_input = lambda command, mode="text": runner(Step("x", command), command)
+        try:
+            manager = main.WorkflowManager()
+            reply = manager.create_workflow("morning", steps_from_text(
+                ["w = sleep 0.2 sunny", "n = sleep 0.2 news", "s = sleep 0 {w} and {n} after w, n"]), max_parallel=3)
+            assert reply == "Workflow 'morning' created with 3 steps (2 can start at once)."
+            start = time.perf_counter()
+            reply = manager.execute_workflow("morning")
+            assert time.perf_counter() - start < 0.35
+            assert reply.endswith("Step w: sunny\nStep n: news\nStep s: sunny and news"), reply
+            assert manager.create_workflow("loop", [{"id": "a", "command": "x", "after": ["a"]}]).startswith("Invalid")
+            manager.scheduler.stop()
+        finally:
+            main.handle_input = original
+    finally:
+        os.chdir(cwd)
+    print("✓ Manager runs DAG workflows")
+
+if __name__ == "__main__":
+    test_parse_and_validate()
+    test_independent_steps_run_concurrently()
+    test_failures_skip_dependents_only_in_dags()
+    test_manager_runs_dag_workflow()
+    print("\nAll workflow DAG tests passed!")
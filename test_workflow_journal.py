@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only workflow run journal.
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from workflow_journal import RunJournal
+
+def step(step_id, status="ok", elapsed=0.1):
+    return {"id": step_id, "command": "list apps", "status": status, "result": "done",
+            "started_at": 1000.0, "elapsed": elapsed}
+
+def test_stats_folded_incrementally():
+    """Stats come from the log, and later calls only read what was appended since."""
+    path = os.path.join(tempfile.mkdtemp(), "workflow_runs.jsonl")
+    journal = RunJournal(path)
+    assert journal.stats("morning")["run_count"] == 0
+    journal.append("morning", "ok", 1000.0, 1.0, [step("1")])
+    journal.append("morning", "failed", 2000.0, 3.0, [step("1", "error")], trigger="schedule")
+    journal.append("backup", "ok", 1500.0, 0.5, [])
+    stats = journal.stats("morning")
+    assert stats == {"run_count": 2, "failed_runs": 1, "last_run": 2000.0, "last_status": "failed", "avg_elapsed": 2.0}
+    offset = journal._offset
+
+    # Another process appends; a half-written line waits for its newline
+    other = RunJournal(path)
+    other.append("morning", "ok", 3000.0, 2.0, [step("1")])
+    with open(path, "a") as f:
+        f.write('{"workflow": "morn')
+    assert journal.stats("morning")["run_count"] == 3
+    assert journal._offset > offset and journal._offset < os.path.getsize(path)
+    runs = journal.runs("morning")
+    assert [r["started_at"] for r in runs] == [3000.0, 2000.0, 1000.0] and runs[1]["trigger"] == "schedule"
+    print("✓ Journal stats derived lazily")
+
+def test_manager_appends_instead_of_rewriting():
+    """Running a workflow appends one journal line and leaves workflows.json alone."""
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        import main
+        manager = main.WorkflowManager()
+        manager.create_workflow("tidy", ["list apps", "list schedules"])
+        with open("workflows.json") as f:
+            definitions = f.read()
+        manager.execute_workflow("tidy")
+        manager.execute_workflow("tidy")
+        with open("workflows.json") as f:
+            assert f.read() == definitions
+        assert "last_run" not in json.loads(definitions)["tidy"]
+        with open("workflow_runs.jsonl") as f:
+            records = [json.loads(line) for line in f]
+        assert len(records) == 2 and records[0]["status"] == "ok"
+        assert [s["id"] for s in records[0]["steps"]] == ["1", "2"]
+        assert "run 2 times" in manager.list_workflows()
+        assert manager.workflow_history("tidy").startswith("Recent runs of 'tidy':\n- ")
+        manager.scheduler.stop()
+    finally:
+        os.chdir(cwd)
+    print("✓ Runs appended to the journal")
+
+if __name__ == "__main__":
+    test_stats_folded_incrementally()
+    test_manager_appends_instead_of_rewriting()
+    print("\nAll workflow journal tests passed!")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the workflow scheduler: cron parsing, the timer heap and missed runs.
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+import threading
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from workflow_scheduler import CronSpec, WorkflowScheduler, parse_schedule, next_fire
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_cron_and_schedule_parsing():
+    """Cron fields, day matching and the schedule formats parse as cron does."""
+    weekdays = CronSpec("*/15 9-17 * * 1-5")
+    assert weekdays.next_after(datetime(2026, 10, 16, 17, 50)) == datetime(2026, 10, 19, 9, 0)
+    assert weekdays.next_after(datetime(2026, 10, 19, 9, 0)) == datetime(2026, 10, 19, 9, 15)
+    # Both day fields restricted: the 1st of the month or any Friday
+    either = CronSpec("0 8 1 * 5")
+    assert either.next_after(datetime(2026, 10, 16, 9, 0)) == datetime(2026, 10, 23, 8, 0)
+    assert either.next_after(datetime(2026, 10, 30, 9, 0)) == datetime(2026, 11, 1, 8, 0)
+    assert CronSpec("30 6 * * 7").next_after(datetime(2026, 10, 19)) == datetime(2026, 10, 25, 6, 30)
+    for bad in ("* * *", "61 * * * *", "*/0 * * * *"):
+        try:
+            CronSpec(bad)
+            assert False, bad
+        except ValueError:
+            pass
+
+    now = datetime(2026, 10, 19, 8, 0)
+    assert parse_schedule("07:30", now) == ("once", "2026-10-20T07:30:00")
+    assert parse_schedule("daily 7:05", now) == ("daily", "07:05")
+    assert parse_schedule("cron 0  9 * * 1-5", now) == ("cron", "0 9 * * 1-5")
+    assert parse_schedule("2026-12-24 18:00", now) == ("once", "2026-12-24T18:00:00")
+    assert next_fire("daily", "07:05", now.timestamp()) == datetime(2026, 10, 20, 7, 5).timestamp()
+    print("✓ Schedules parsed")
+
+def test_timer_fires_on_worker_pool():
+    """Due schedules fire without polling, and a long run does not hold up the next one."""
+    path = os.path.join(tempfile.mkdtemp(), "schedules.json")
+    fired = []
+    release = threading.Event()
+
+    def run(name):
+        fired.append((name, time.time()))
+        if name == "slow":
+            release.wait(2)
+        return f"Workflow '{name}' completed. Results:\n..."
+
+    scheduler = WorkflowScheduler(run, store_file=path).start()
+    start = time.time()
+    scheduler.add("slow", "once", (datetime.now() + timedelta(seconds=0.1)).isoformat())
+    scheduler.add("quick", "once", (datetime.now() + timedelta(seconds=0.3)).isoformat())
+    scheduler.add("morning", "daily", "07:00")
+    assert wait_for(lambda: len(fired) == 2)
+    assert [name for name, _ in fired] == ["slow", "quick"]
+    assert 0.25 < fired[1][1] - start < 1.0
+    release.set()
+
+    # One-shot schedules are gone once fired; the daily one persists
+    assert [name for name, _ in scheduler.list()] == ["morning"]
+    with open(path) as f:
+        assert list(json.load(f)) == ["morning"]
+    assert scheduler.remove("morning") and not scheduler.remove("morning")
+    scheduler.stop()
+    print("✓ Timer fires schedules concurrently")
+
+def test_missed_runs_follow_policy():
+    """Occurrences missed while not running are skipped, caught up once, or replayed."""
+    due = (datetime.now() - timedelta(days=2, hours=12)).replace(second=0, microsecond=0)
+    for policy, expected_runs in (("skip", 0), ("once", 1), ("all", 3)):
+        path = os.path.join(tempfile.mkdtemp(), "schedules.json")
+        with open(path, "w") as f:
+            json.dump({"backup": {"kind": "daily", "spec": due.strftime("%H:%M"), "misfire": policy,
+                                  "next_run": due.timestamp(), "created_at": None, "last_run": None,
+                                  "last_result": None, "run_count": 0, "missed": 0}}, f)
+        runs = []
+        scheduler = WorkflowScheduler(lambda name: runs.append(name) or "done", store_file=path).start()
+        assert wait_for(lambda: scheduler.get("backup")["next_run"] > time.time())
+        if expected_runs:
+            assert wait_for(lambda: scheduler.get("backup")["run_count"] == expected_runs)
+        entry = scheduler.get("backup")
+        assert len(runs) == expected_runs and entry["missed"] == 3 - expected_runs, (policy, runs, entry)
+        assert entry["next_run"] - time.time() < 86400
+        scheduler.stop()
+    print("✓ Missed runs handled per policy")
+
+if __name__ == "__main__":
+    test_cron_and_schedule_parsing()
+    test_timer_fires_on_worker_pool()
+    test_missed_runs_follow_policy()
+    print("\nAll workflow scheduler tests passed!")
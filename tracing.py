@@ -0,0 +1,184 @@
+import os
+import json
+import time
+import atexit
+import threading
+import functools
+import contextvars
+from collections import deque
+
+# Set BUDDY_TRACE=trace.json to record spans and write them on exit
+TRACE_ENV = "BUDDY_TRACE"
+MAX_SPANS = 100000
+
+_current = contextvars.ContextVar("buddy_span", default=None)
+
+
+class _State:
+    enabled = False
+
+
+_state = _State()
+_spans = deque(maxlen=MAX_SPANS)
+_ids = iter(range(1, 1 << 62))
+_ids_lock = threading.Lock()
+
+
+class Span:
+    """A timed operation with attributes, nested under the span active when it started"""
+
+    __slots__ = ("name", "attributes", "span_id", "parent_id", "thread_id", "start_ns", "end_ns", "_token")
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        with _ids_lock:
+            self.span_id = next(_ids)
+        parent = _current.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.thread_id = threading.get_ident()
+        self.start_ns = 0
+        self.end_ns = 0
+        self._token = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attributes["error"] = f"{exc_type.__name__}: {exc}"
+        _current.reset(self._token)
+        _spans.append(self)
+        return False
+
+    def __repr__(self):
+        return f"Span({self.name!r}, {self.duration_ms:.3f}ms)"
+
+
+class _NoopSpan:
+    """Returned while tracing is disabled; every operation is a no-op"""
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def enable():
+    _state.enabled = True
+
+
+def disable():
+    _state.enabled = False
+
+
+def is_enabled() -> bool:
+    return _state.enabled
+
+
+def span(name, **attributes):
+    """Context manager timing a block: `with span("translate", target="en") as s:`"""
+    if not _state.enabled:
+        return _NOOP
+    return Span(name, attributes)
+
+
+def current_span():
+    """The innermost active span, or a no-op span"""
+    return _current.get() or _NOOP
+
+
+def traced(name=None):
+    """Decorator recording a span around each call of the function"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            with Span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def propagate(func):
+    """Bind func to the caller's span context, for work handed to another thread"""
+    if not _state.enabled:
+        return func
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return context.run(func, *args, **kwargs)
+    return wrapper
+
+
+def finished_spans() -> list:
+    return list(_spans)
+
+
+def clear():
+    _spans.clear()
+
+
+def _json_safe(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def chrome_trace_events(spans=None) -> list:
+    """Convert spans to Chrome trace-event "complete" (ph=X) events"""
+    pid = os.getpid()
+    events = []
+    for s in finished_spans() if spans is None else spans:
+        args = {k: _json_safe(v) for k, v in s.attributes.items()}
+        args["span_id"] = s.span_id
+        if s.parent_id is not None:
+            args["parent_id"] = s.parent_id
+        events.append({
+            "name": s.name,
+            "cat": s.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": s.start_ns / 1000,
+            "dur": (s.end_ns - s.start_ns) / 1000,
+            "pid": pid,
+            "tid": s.thread_id,
+            "args": args
+        })
+    events.sort(key=lambda e: e["ts"])
+    return events
+
+
+def export_chrome_trace(path, spans=None) -> int:
+    """Write spans as Chrome trace JSON (chrome://tracing, Perfetto); returns the event count"""
+    events = chrome_trace_events(spans)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return len(events)
+
+
+if os.environ.get(TRACE_ENV):
+    enable()
+    atexit.register(export_chrome_trace, os.environ[TRACE_ENV])
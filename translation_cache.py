@@ -0,0 +1,107 @@
+import os
+import json
+import atexit
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+CACHE_FILE = "translation_cache.json"
+
+
+class TranslationCache:
+    """LRU cache for translations, persisted to a JSON file.
+
+    Entries are keyed by (source, target, normalized text) and bounded in
+    number. New entries are written to the file in batches of flush_every
+    and at exit, through a temporary file, so a crash mid-write never
+    corrupts the stored cache.
+    """
+
+    def __init__(self, cache_file=CACHE_FILE, max_entries=5000, flush_every=20):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self.lock = threading.Lock()
+        self.entries = self.load()
+        self.unsaved = 0
+        self.hits = 0
+        self.misses = 0
+        atexit.register(self.flush)
+
+    def load(self) -> OrderedDict:
+        """Load the persisted entries, least recently used first"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return OrderedDict(data)
+        except Exception as e:
+            print(f"Error loading translation cache: {e}")
+        return OrderedDict()
+
+    def flush(self):
+        """Write unsaved entries to disk"""
+        with self.lock:
+            if not self.unsaved:
+                return
+            try:
+                temp_file = f"{self.cache_file}.tmp"
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f, ensure_ascii=False)
+                os.replace(temp_file, self.cache_file)
+                self.unsaved = 0
+            except Exception as e:
+                print(f"Error saving translation cache: {e}")
+
+    @staticmethod
+    def normalize(text) -> str:
+        """Normalize text so trivially different inputs share an entry"""
+        text = unicodedata.normalize("NFC", text or "")
+        return " ".join(text.casefold().split())
+
+    def make_key(self, source, target, text) -> str:
+        return f"{source}|{target}|{self.normalize(text)}"
+
+    def get(self, source, target, text) -> Optional[str]:
+        """Return a cached translation or None"""
+        key = self.make_key(source, target, text)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, source, target, text, translation):
+        """Store a translation; it reaches the file with the next batch"""
+        key = self.make_key(source, target, text)
+        with self.lock:
+            self.entries[key] = translation
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.unsaved += 1
+            due = self.unsaved >= self.flush_every
+        if due:
+            self.flush()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and sizes"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "unsaved": self.unsaved
+        }
+
+    def clear(self):
+        """Drop every cached translation"""
+        with self.lock:
+            self.entries.clear()
+            self.unsaved += 1
+        self.flush()
@@ -0,0 +1,154 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class CacheEntry:
+    __slots__ = ("value", "stored_at", "ttl", "stale_ttl")
+
+    def __init__(self, value, stored_at, ttl, stale_ttl):
+        self.value = value
+        self.stored_at = stored_at
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+    def age(self, now) -> float:
+        return now - self.stored_at
+
+    def is_fresh(self, now) -> bool:
+        return self.age(now) < self.ttl
+
+    def is_usable(self, now) -> bool:
+        return self.age(now) < self.ttl + self.stale_ttl
+
+
+class TTLCache:
+    """Bounded LRU cache with per-entry TTLs and stale-while-revalidate.
+
+    get_or_load() returns a fresh entry directly. An entry past its TTL but
+    within its stale window is returned immediately too, while a single
+    background refresh replaces it. Misses load in the caller's thread, and
+    concurrent misses for the same key share one load. Loader exceptions
+    propagate and are never cached.
+    """
+
+    def __init__(self, max_entries=256, clock=time.monotonic, refresh_workers=2):
+        self.max_entries = max_entries
+        self.clock = clock
+        self.refresh_workers = refresh_workers
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_errors = 0
+
+    def get(self, key, default=None):
+        """Return a fresh or stale value without loading"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.is_usable(self.clock()):
+                return default
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def remaining(self, key):
+        """Seconds until key stops being fresh (negative when stale), or None if absent"""
+        with self._lock:
+            entry = self._entries.get(key)
+            now = self.clock()
+            if entry is None or not entry.is_usable(now):
+                return None
+            return entry.ttl - entry.age(now)
+
+    def put(self, key, value, ttl, stale_ttl=0, age=0):
+        """Store value; age backdates it, e.g. for entries restored from disk"""
+        with self._lock:
+            self._store(key, value, ttl, stale_ttl, age)
+
+    def _store(self, key, value, ttl, stale_ttl, age=0):
+        self._entries[key] = CacheEntry(value, self.clock() - age, ttl, stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_or_load(self, key, loader, ttl, stale_ttl=0):
+        """Return the cached value for key, calling loader() on a miss"""
+        with self._lock:
+            now = self.clock()
+            entry = self._entries.get(key)
+            if entry is not None and entry.is_fresh(now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            if entry is not None and entry.is_usable(now):
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self._refresh_executor().submit(self._refresh, key, loader, ttl, stale_ttl)
+                return entry.value
+            future = self._loading.get(key)
+            owner = future is None
+            if owner:
+                future = self._loading[key] = Future()
+                self.misses += 1
+
+        if not owner:
+            return future.result()
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._store(key, value, ttl, stale_ttl)
+            del self._loading[key]
+        future.set_result(value)
+        return value
+
+    def _refresh_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.refresh_workers, thread_name_prefix="cache-refresh")
+        return self._executor
+
+    def _refresh(self, key, loader, ttl, stale_ttl):
+        try:
+            value = loader()
+        except Exception:
+            # Keep serving the stale value until it ages out
+            with self._lock:
+                self.refresh_errors += 1
+                self._refreshing.discard(key)
+            return
+        with self._lock:
+            self._store(key, value, ttl, stale_ttl)
+            self._refreshing.discard(key)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refresh_errors": self.refresh_errors,
+                "refreshing": len(self._refreshing)
+            }
@@ -0,0 +1,103 @@
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from ttl_cache import TTLCache
+from response_store import ResponseStore
+from resilience import get_breaker, CircuitOpenError
+from tracing import propagate
+
+# Cached in place of an answer when a search found nothing
+NOT_FOUND = ""
+
+
+class SearchClient:
+    """Instant-answer lookups shared by every caller, cached and time-bounded.
+
+    fetch(query) returns an answer or None. Results are cached under the
+    normalized query: answers for ttl seconds, "nothing found" for
+    negative_ttl. Failed searches are not cached. lookup() waits at most
+    deadline seconds; a search still running then finishes in the background
+    and fills the cache for the next caller. search() starts a lookup without
+    waiting so it can overlap other work, and concurrent lookups of one query
+    share a single request.
+    """
+
+    def __init__(self, fetch, ttl=86400, negative_ttl=3600, deadline=1.5, store=None,
+                 breaker="duckduckgo", max_entries=512, workers=4):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.deadline = deadline
+        self.store = store
+        self.breaker = breaker
+        self.cache = TTLCache(max_entries=max_entries)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="web-search")
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.counts = {"hits": 0, "negative_hits": 0, "fetches": 0, "errors": 0, "timeouts": 0}
+
+    @staticmethod
+    def normalize(query) -> str:
+        """'  Spotify  Download!' -> 'spotify download'"""
+        return " ".join(re.sub(r"[^\w\s]", " ", (query or "").casefold()).split())
+
+    def _count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def _cached(self, key):
+        answer = self.cache.get(key)
+        if answer is None and self.store is not None:
+            stored = self.store.get(ResponseStore.make_key("search", (key,)))
+            if stored is not None:
+                answer = stored.payload
+                ttl = self.ttl if answer else self.negative_ttl
+                self.cache.put(key, answer, ttl, age=stored.age(self.store.clock()))
+        return answer
+
+    def search(self, query) -> Future:
+        """Start a lookup and return a Future of the answer (None if nothing was found)"""
+        key = self.normalize(query)
+        answer = self._cached(key)
+        if answer is not None:
+            self._count("hits" if answer else "negative_hits")
+            future = Future()
+            future.set_result(answer or None)
+            return future
+        with self.lock:
+            future = self.pending.get(key)
+            if future is None:
+                self.counts["fetches"] += 1
+                future = self.pending[key] = self.executor.submit(propagate(self._fetch), key, query)
+            return future
+
+    def _fetch(self, key, query):
+        try:
+            answer = get_breaker(self.breaker).call(self.fetch, query.strip()) or NOT_FOUND
+            ttl = self.ttl if answer else self.negative_ttl
+            # Cache before leaving pending so no caller sees neither
+            self.cache.put(key, answer, ttl)
+            if self.store is not None:
+                self.store.put(ResponseStore.make_key("search", (key,)), "search", answer, ttl)
+            return answer or None
+        except Exception as e:
+            self._count("errors")
+            if not isinstance(e, CircuitOpenError):
+                print(f"Search for {query!r} failed: {e}")
+            return None
+        finally:
+            with self.lock:
+                self.pending.pop(key, None)
+
+    def lookup(self, query, deadline=None):
+        """Answer for query, or None if nothing was found or it took longer than deadline"""
+        try:
+            return self.search(query).result(timeout=self.deadline if deadline is None else deadline)
+        except FutureTimeout:
+            self._count("timeouts")
+            return None
+
+    def stats(self) -> dict:
+        with self.lock:
+            return dict(self.counts, entries=len(self.cache), in_flight=len(self.pending))
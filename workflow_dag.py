@@ -0,0 +1,177 @@
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from tracing import propagate
+
+# Steps of one workflow run at once unless the workflow sets max_parallel
+DEFAULT_MAX_PARALLEL = 4
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="workflow-step")
+
+# "{weather}" in a step's command is replaced by the result of its dependency "weather"
+PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+STEP_TEXT = re.compile(r"^(?:(?P<id>\w+)\s*=\s*)?(?P<command>.+?)(?:\s+after\s+(?P<after>\w+(?:\s*,\s*\w+)*))?$")
+
+
+class Step:
+    __slots__ = ("id", "command", "after")
+
+    def __init__(self, id, command, after=()):
+        self.id = str(id)
+        self.command = command
+        self.after = tuple(str(a) for a in after)
+
+    def __repr__(self):
+        return f"Step({self.id!r}, {self.command!r}, after={self.after})"
+
+
+class StepOutcome:
+    """How one step went: status is ok, failed, error or skipped"""
+
+    __slots__ = ("step", "command", "status", "result", "started_at", "elapsed")
+
+    def __init__(self, step, command, status, result, started_at=None, elapsed=0.0):
+        self.step = step
+        self.command = command
+        self.status = status
+        self.result = result
+        self.started_at = started_at
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+def is_linear(commands) -> bool:
+    return all(isinstance(c, str) for c in commands)
+
+
+def parse_steps(commands) -> list:
+    """Steps of a workflow definition.
+
+    A list of command strings is a linear workflow: step i runs after step
+    i-1. Otherwise each entry is a string or {"id", "command", "after"};
+    entries without "after" have no dependencies and may run at once.
+    Raises ValueError for duplicate ids, unknown dependencies or cycles.
+    """
+    if is_linear(commands):
+        steps = [Step(i, command, [i - 1] if i > 1 else []) for i, command in enumerate(commands, 1)]
+    else:
+        steps = []
+        for i, entry in enumerate(commands, 1):
+            if isinstance(entry, str):
+                steps.append(Step(f"step{i}", entry))
+            else:
+                after = entry.get("after") or []
+                steps.append(Step(entry.get("id") or f"step{i}", entry["command"], [after] if isinstance(after, str) else after))
+    validate(steps)
+    return steps
+
+
+def validate(steps):
+    ids = [step.id for step in steps]
+    if len(set(ids)) != len(ids):
+        raise ValueError("step ids must be unique")
+    known = set(ids)
+    for step in steps:
+        unknown = [a for a in step.after if a not in known]
+        if unknown:
+            raise ValueError(f"step '{step.id}' depends on unknown step(s) {', '.join(unknown)}")
+    remaining = {step.id: set(step.after) for step in steps}
+    while remaining:
+        ready = [sid for sid, after in remaining.items() if not after]
+        if not ready:
+            raise ValueError(f"steps {', '.join(sorted(remaining))} depend on each other")
+        for sid in ready:
+            del remaining[sid]
+        for after in remaining.values():
+            after.difference_update(ready)
+
+
+def steps_from_text(parts) -> list:
+    """Workflow commands from chat text such as ['w = weather in london', 'news', 'x = ... after w'].
+
+    Without any 'id = ' prefix the commands stay a plain linear list. 'after'
+    only declares dependencies when every name after it is a step id.
+    """
+    matches = [STEP_TEXT.match(part.strip()) for part in parts]
+    if not any(m.group("id") for m in matches):
+        return [part.strip() for part in parts]
+    ids = {m.group("id") for m in matches if m.group("id")}
+    commands = []
+    for i, m in enumerate(matches, 1):
+        command = m.group("command")
+        after = [a.strip() for a in m.group("after").split(",")] if m.group("after") else []
+        if after and not all(a in ids for a in after):
+            command, after = f"{command} after {m.group('after')}", []
+        step = {"id": m.group("id") or f"step{i}", "command": command}
+        if after:
+            step["after"] = after
+        commands.append(step)
+    return commands
+
+
+def resolve(step, outcomes) -> str:
+    """The step's command with {dependency} placeholders filled in"""
+    def fill(match):
+        outcome = outcomes.get(match.group(1)) if match.group(1) in step.after else None
+        return str(outcome.result) if outcome is not None else match.group(0)
+    return PLACEHOLDER.sub(fill, step.command)
+
+
+def _run_one(step, command, run) -> StepOutcome:
+    started_at = time.time()
+    start = time.perf_counter()
+    try:
+        result = run(step, command)
+        status = "ok" if getattr(result, "ok", True) else "failed"
+    except Exception as e:
+        result, status = str(e), "error"
+    return StepOutcome(step, command, status, result, started_at, time.perf_counter() - start)
+
+
+def run_steps(steps, run, max_parallel=DEFAULT_MAX_PARALLEL, stop_dependents=True, executor=None) -> dict:
+    """Run steps in dependency order, at most max_parallel at a time; returns {step id: StepOutcome}.
+
+    run(step, command) executes one step. When stop_dependents is set, steps
+    whose dependencies did not succeed are skipped. With max_parallel 1 every
+    step runs in the calling thread.
+    """
+    executor = executor or _executor
+    waiting = {step.id: set(step.after) for step in steps}
+    dependents = {step.id: [] for step in steps}
+    for step in steps:
+        for after in step.after:
+            dependents[after].append(step)
+    ready = [step for step in steps if not step.after]
+    running = {}
+    outcomes = {}
+
+    def finish(outcome):
+        outcomes[outcome.step.id] = outcome
+        for dependent in dependents[outcome.step.id]:
+            waiting[dependent.id].discard(outcome.step.id)
+            if not waiting[dependent.id]:
+                ready.append(dependent)
+
+    while ready or running:
+        while ready and len(running) < max(1, max_parallel):
+            step = ready.pop(0)
+            failed = [a for a in step.after if not outcomes[a].ok]
+            if failed and stop_dependents:
+                finish(StepOutcome(step, step.command, "skipped", f"needs {', '.join(failed)}"))
+                continue
+            command = resolve(step, outcomes)
+            if max_parallel <= 1:
+                finish(_run_one(step, command, run))
+            else:
+                running[executor.submit(propagate(_run_one), step, command, run)] = step
+        if running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                del running[future]
+                finish(future.result())
+    return outcomes
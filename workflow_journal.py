@@ -0,0 +1,105 @@
+import json
+import uuid
+import threading
+from collections import deque
+
+JOURNAL_FILE = "workflow_runs.jsonl"
+
+# Step results longer than this are cut in the journal
+MAX_RESULT_CHARS = 1000
+
+
+class RunJournal:
+    """Append-only log of workflow runs, one JSON record per line.
+
+    Recording a run appends a single line, however many workflows or past
+    runs exist. Per-workflow stats are folded from the log on demand and
+    kept; later calls only read the lines appended since, including runs
+    recorded by other Buddy processes.
+    """
+
+    def __init__(self, journal_file=JOURNAL_FILE, recent=20):
+        self.journal_file = journal_file
+        self.recent = recent
+        self.lock = threading.Lock()
+        self._offset = 0
+        self._stats = {}
+        self._runs = {}
+
+    @staticmethod
+    def step_record(outcome) -> dict:
+        result = str(outcome.result)
+        return {
+            "id": outcome.step.id,
+            "command": outcome.command,
+            "status": outcome.status,
+            "result": result[:MAX_RESULT_CHARS],
+            "started_at": outcome.started_at,
+            "elapsed": round(outcome.elapsed, 4)
+        }
+
+    def append(self, workflow, status, started_at, elapsed, steps, trigger="manual") -> dict:
+        """Record a finished run; steps are step records in definition order"""
+        record = {
+            "run_id": uuid.uuid4().hex[:12],
+            "workflow": workflow,
+            "trigger": trigger,
+            "status": status,
+            "started_at": started_at,
+            "elapsed": round(elapsed, 4),
+            "steps": steps
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self.lock:
+            try:
+                with open(self.journal_file, 'a', encoding='utf-8') as f:
+                    f.write(line)
+            except Exception as e:
+                print(f"Error writing workflow journal: {e}")
+        return record
+
+    def _refresh(self):
+        """Fold lines appended since the last call into the stats"""
+        try:
+            with open(self.journal_file, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        # A line still being written by another process is read next time
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            self._fold(record)
+        self._offset += end
+
+    def _fold(self, record):
+        stats = self._stats.setdefault(record["workflow"], {
+            "run_count": 0, "failed_runs": 0, "last_run": None, "last_status": None, "total_elapsed": 0.0
+        })
+        stats["run_count"] += 1
+        stats["failed_runs"] += record["status"] != "ok"
+        stats["total_elapsed"] += record["elapsed"]
+        if stats["last_run"] is None or record["started_at"] >= stats["last_run"]:
+            stats["last_run"] = record["started_at"]
+            stats["last_status"] = record["status"]
+        self._runs.setdefault(record["workflow"], deque(maxlen=self.recent)).append(record)
+
+    def stats(self, workflow) -> dict:
+        """run_count, failed_runs, last_run (epoch seconds), last_status and avg_elapsed"""
+        with self.lock:
+            self._refresh()
+            stats = dict(self._stats.get(workflow) or {
+                "run_count": 0, "failed_runs": 0, "last_run": None, "last_status": None, "total_elapsed": 0.0
+            })
+        stats["avg_elapsed"] = stats.pop("total_elapsed") / stats["run_count"] if stats["run_count"] else None
+        return stats
+
+    def runs(self, workflow, limit=5) -> list:
+        """The workflow's most recent run records, newest first"""
+        with self.lock:
+            self._refresh()
+            return list(self._runs.get(workflow, ()))[::-1][:limit]
@@ -0,0 +1,314 @@
+import os
+import json
+import time
+import heapq
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from tracing import span
+
+SCHEDULES_FILE = "schedules.json"
+
+# What to do with occurrences that were due while Buddy was not running
+MISFIRE_POLICIES = ("skip", "once", "all")
+DEFAULT_MISFIRE = {"once": "once", "daily": "once", "cron": "skip"}
+# Most missed occurrences replayed by the "all" policy
+MAX_CATCH_UP = 10
+# The timer re-checks at least this often (seconds) in case the wall clock
+# jumps or the machine was asleep
+MAX_SLEEP = 3600
+
+
+def parse_hhmm(text):
+    hour, minute = map(int, text.strip().split(":"))
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        raise ValueError("Invalid time format. Use HH:MM (e.g., 14:30)")
+    return hour, minute
+
+
+class CronSpec:
+    """Standard 5-field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields accept *, numbers, ranges (1-5), lists (1,15) and steps (*/15,
+    9-17/2). Day of week runs 0-6 from Sunday (7 is Sunday too). As in cron,
+    when both day fields are restricted a day matching either one fires.
+    """
+
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError("A cron schedule needs 5 fields: minute hour day month weekday")
+        self.expression = " ".join(parts)
+        self.minutes = self._parse(parts[0], 0, 59)
+        self.hours = self._parse(parts[1], 0, 23)
+        self.days = self._parse(parts[2], 1, 31)
+        self.months = self._parse(parts[3], 1, 12)
+        self.weekdays = {d % 7 for d in self._parse(parts[4], 0, 7)}
+        self.day_restricted = parts[2] != "*"
+        self.weekday_restricted = parts[4] != "*"
+
+    @staticmethod
+    def _parse(field, low, high) -> set:
+        values = set()
+        for part in field.split(","):
+            part, _, step = part.partition("/")
+            step = int(step) if step else 1
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = map(int, part.split("-"))
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            if step < 1 or not low <= start <= end <= high:
+                raise ValueError(f"Invalid cron field '{field}'")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, dt) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, dt) -> datetime:
+        """First matching minute strictly after dt"""
+        dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=5 * 366)
+        while dt < limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        raise ValueError(f"Cron schedule '{self.expression}' never fires")
+
+
+def parse_schedule(text, now=None):
+    """'14:30', 'daily 14:30', 'cron */15 9-17 * * 1-5' or '2026-05-01 09:00' -> (kind, spec)"""
+    text = " ".join(text.split())
+    if text.startswith("daily "):
+        hour, minute = parse_hhmm(text[6:])
+        return "daily", f"{hour:02d}:{minute:02d}"
+    if text.startswith("cron "):
+        return "cron", CronSpec(text[5:]).expression
+    if "-" in text:
+        return "once", datetime.fromisoformat(text).isoformat(timespec="seconds")
+    hour, minute = parse_hhmm(text)
+    now = now or datetime.now()
+    at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if at <= now:
+        at += timedelta(days=1)
+    return "once", at.isoformat(timespec="seconds")
+
+
+def next_fire(kind, spec, after):
+    """Epoch seconds of the first occurrence strictly after after, or None"""
+    if kind == "once":
+        at = datetime.fromisoformat(spec).timestamp()
+        return at if at > after else None
+    after_dt = datetime.fromtimestamp(after)
+    if kind == "daily":
+        hour, minute = parse_hhmm(spec)
+        at = after_dt.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if at.timestamp() <= after:
+            at += timedelta(days=1)
+        return at.timestamp()
+    if kind == "cron":
+        return CronSpec(spec).next_after(after_dt).timestamp()
+    raise ValueError(f"Unknown schedule kind '{kind}'")
+
+
+class WorkflowScheduler:
+    """Runs workflows on their schedules from one timer thread.
+
+    Schedules live in a JSON file and their next fire times in a min-heap.
+    The timer thread sleeps until the earliest one is due (or a schedule
+    changes) and hands the run to a worker pool, so a long workflow never
+    delays another schedule; a schedule whose previous run is still going
+    skips that occurrence. An occurrence found more than grace seconds late,
+    e.g. after a restart, follows the schedule's misfire policy: "skip"
+    waits for the next one, "once" runs once to catch up and "all" replays
+    every missed occurrence (at most MAX_CATCH_UP).
+    """
+
+    def __init__(self, run, store_file=SCHEDULES_FILE, workers=2, grace=60, clock=time.time):
+        self.run = run
+        self.store_file = store_file
+        self.grace = grace
+        self.clock = clock
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="workflow-run")
+        self.lock = threading.RLock()
+        self.cond = threading.Condition(self.lock)
+        self.heap = []          # (next_run, seq, name)
+        self.current = {}       # name -> seq of its live heap item
+        self.running = set()
+        self.seq = 0
+        self.thread = None
+        self.stopped = False
+        self.schedules = self.load()
+
+    @staticmethod
+    def has_schedules(store_file=SCHEDULES_FILE) -> bool:
+        try:
+            with open(store_file, 'r') as f:
+                return bool(json.load(f))
+        except Exception:
+            return False
+
+    def load(self) -> dict:
+        try:
+            if os.path.exists(self.store_file):
+                with open(self.store_file, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Error loading schedules: {e}")
+        return {}
+
+    def save(self):
+        with self.lock:
+            try:
+                # Replace the file in one step so readers never see it half written
+                temp_file = f"{self.store_file}.tmp"
+                with open(temp_file, 'w') as f:
+                    json.dump(self.schedules, f, indent=2)
+                os.replace(temp_file, self.store_file)
+            except Exception as e:
+                print(f"Error saving schedules: {e}")
+
+    def add(self, name, kind, spec, misfire=None) -> dict:
+        """Schedule workflow name, replacing any schedule it had"""
+        misfire = misfire or DEFAULT_MISFIRE[kind]
+        if misfire not in MISFIRE_POLICIES:
+            raise ValueError(f"Unknown misfire policy '{misfire}'")
+        next_run = next_fire(kind, spec, self.clock())
+        if next_run is None:
+            raise ValueError(f"{spec} is in the past")
+        with self.cond:
+            self.schedules[name] = {
+                "kind": kind,
+                "spec": spec,
+                "misfire": misfire,
+                "next_run": next_run,
+                "created_at": datetime.now().isoformat(),
+                "last_run": None,
+                "last_result": None,
+                "run_count": 0,
+                "missed": 0
+            }
+            self._push(name)
+            entry = dict(self.schedules[name])
+        self.save()
+        return entry
+
+    def remove(self, name) -> bool:
+        with self.cond:
+            if self.schedules.pop(name, None) is None:
+                return False
+            self.current.pop(name, None)
+            self.cond.notify()
+        self.save()
+        return True
+
+    def get(self, name):
+        with self.lock:
+            entry = self.schedules.get(name)
+            return dict(entry) if entry else None
+
+    def list(self) -> list:
+        """(name, schedule) pairs, soonest first"""
+        with self.lock:
+            return sorted(((name, dict(entry)) for name, entry in self.schedules.items()),
+                          key=lambda item: item[1]["next_run"])
+
+    def _push(self, name):
+        self.seq += 1
+        self.current[name] = self.seq
+        heapq.heappush(self.heap, (self.schedules[name]["next_run"], self.seq, name))
+        self.cond.notify()
+
+    def start(self):
+        if self.thread is None:
+            with self.cond:
+                for name in self.schedules:
+                    self._push(name)
+            self.thread = threading.Thread(target=self._loop, name="workflow-scheduler", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify()
+        self.executor.shutdown(wait=False)
+
+    def _loop(self):
+        with self.cond:
+            while not self.stopped:
+                if not self.heap:
+                    self.cond.wait()
+                    continue
+                when, seq, name = self.heap[0]
+                delay = when - self.clock()
+                if delay > 0:
+                    self.cond.wait(min(delay, MAX_SLEEP))
+                    continue
+                heapq.heappop(self.heap)
+                # Removed or rescheduled since this item was pushed
+                if self.current.get(name) == seq:
+                    self._fire(name, when)
+
+    def _fire(self, name, when):
+        entry = self.schedules[name]
+        now = self.clock()
+        runs = 1
+        after = when
+        if now - when > self.grace:
+            missed = 0
+            at = when
+            while at is not None and at <= now and missed < 1000:
+                missed += 1
+                at = next_fire(entry["kind"], entry["spec"], at)
+            runs = {"skip": 0, "once": 1, "all": min(missed, MAX_CATCH_UP)}[entry["misfire"]]
+            entry["missed"] += missed - runs
+            after = now
+        if runs:
+            if name in self.running:
+                entry["missed"] += runs
+            else:
+                self.running.add(name)
+                self.executor.submit(self._execute, name, runs)
+        next_run = next_fire(entry["kind"], entry["spec"], after)
+        if next_run is None:
+            del self.schedules[name]
+            self.current.pop(name, None)
+        else:
+            entry["next_run"] = next_run
+            self._push(name)
+        self.save()
+
+    def _execute(self, name, runs):
+        try:
+            for _ in range(runs):
+                with span("workflow.scheduled", workflow=name):
+                    try:
+                        result = str(self.run(name)).split("\n")[0]
+                    except Exception as e:
+                        result = f"Error: {e}"
+                with self.lock:
+                    entry = self.schedules.get(name)
+                    if entry is not None:
+                        entry["last_run"] = datetime.now().isoformat()
+                        entry["last_result"] = result
+                        entry["run_count"] += 1
+                self.save()
+        finally:
+            with self.lock:
+                self.running.discard(name)